@@ -0,0 +1,4 @@
+"""Benchmarks of the code assist tools on synthetic trees and repositories.
+
+Run with `python -m benchmarks --help` from the repository root.
+"""
@@ -0,0 +1,46 @@
+import json
+import sys
+from pathlib import Path
+
+import click
+
+from benchmarks.fixtures import LAYOUTS
+from benchmarks.runner import DEFAULT_LARGE_FILE_BYTES, DEFAULT_REPEAT, DEFAULT_SIZES, run
+from mcp_server_code_assist.executors import shutdown_executors
+from mcp_server_code_assist.tools.repo_pool import close_repo_pool
+
+
+def _sizes(ctx: click.Context, param: click.Parameter, value: str) -> tuple[int, ...]:
+    try:
+        sizes = tuple(int(size) for size in value.split(","))
+    except ValueError:
+        raise click.BadParameter("expected comma-separated file counts, e.g. 1000,10000") from None
+    if any(size < 1 for size in sizes):
+        raise click.BadParameter("file counts must be positive")
+    return sizes
+
+
+@click.command()
+@click.option("--sizes", default=",".join(map(str, DEFAULT_SIZES)), show_default=True, callback=_sizes, help="Comma-separated file counts, e.g. 1000,10000,100000")
+@click.option("--layout", "layouts", type=click.Choice(LAYOUTS), multiple=True, default=LAYOUTS, show_default=True, help="Tree layouts to run; repeat for several")
+@click.option("--git/--no-git", default=True, show_default=True, help="Also run each case as a git repository")
+@click.option("--large-file-bytes", type=click.IntRange(min=0), default=DEFAULT_LARGE_FILE_BYTES, show_default=True, help="Size of the large single file case, 0 to skip it")
+@click.option("--repeat", type=click.IntRange(min=0), default=DEFAULT_REPEAT, show_default=True, help="Warm calls per operation after the cold one")
+@click.option("--workdir", type=Path, default=None, help="Directory for the synthetic trees [default: system temp dir]")
+@click.option("--output", "-o", type=click.Path(dir_okay=False, writable=True), default="-", help="JSON output file [default: stdout]")
+def main(sizes: tuple[int, ...], layouts: tuple[str, ...], git: bool, large_file_bytes: int, repeat: int, workdir: Path | None, output: str) -> None:
+    """Benchmark the code assist tools on synthetic trees and repositories."""
+    try:
+        report = run(sizes=sizes, layouts=layouts, git=git, large_file_bytes=large_file_bytes, repeat=repeat, workdir=workdir)
+    finally:
+        shutdown_executors()
+        close_repo_pool()
+    text = json.dumps(report, indent=2)
+    if output == "-":
+        sys.stdout.write(text + "\n")
+    else:
+        Path(output).write_text(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
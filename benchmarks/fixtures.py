@@ -0,0 +1,117 @@
+"""Synthetic trees and git repositories of configurable size and shape."""
+
+import math
+import random
+import subprocess
+from pathlib import Path
+
+LAYOUTS = ("wide", "deep")
+# Files per directory in the wide layout, and per level in the deep layout
+WIDE_FILES_PER_DIR = 100
+DEEP_FILES_PER_LEVEL = 20
+DEEP_MAX_DEPTH = 32
+GIT_ENV_CONFIG = ["-c", "user.name=bench", "-c", "user.email=bench@example.invalid", "-c", "commit.gpgsign=false"]
+
+MODULE_TEMPLATE = '''"""Generated module {index}."""
+
+import os
+
+CONSTANT_{index} = {value}
+
+
+class Widget{index}:
+    """Widget number {index}."""
+
+    def __init__(self, size: int = {value}):
+        self.size = size
+
+    def scaled(self, factor: int) -> int:
+        return self.size * factor
+
+
+def helper_{index}(path: str) -> str:
+    return os.path.join(path, "widget_{index}")
+'''
+
+
+def module_source(index: int, rng: random.Random) -> str:
+    """Generate a small Python module with a class, methods and functions."""
+    return MODULE_TEMPLATE.format(index=index, value=rng.randrange(1_000_000))
+
+
+def file_paths(file_count: int, layout: str) -> list[str]:
+    """Lay out file_count '/'-separated relative paths.
+
+    Args:
+        file_count: Number of files
+        layout: "wide" spreads files over many shallow directories; "deep" puts
+            them along chains of DEEP_MAX_DEPTH nested directories
+
+    Returns:
+        Relative file paths
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"Invalid layout: {layout}, expected one of {', '.join(LAYOUTS)}")
+    paths = []
+    if layout == "wide":
+        for i in range(file_count):
+            paths.append(f"pkg{i // WIDE_FILES_PER_DIR:04d}/module_{i}.py")
+        return paths
+    depth = min(DEEP_MAX_DEPTH, max(1, math.ceil(file_count / DEEP_FILES_PER_LEVEL)))
+    per_branch = depth * DEEP_FILES_PER_LEVEL
+    for i in range(file_count):
+        branch, offset = divmod(i, per_branch)
+        level = offset // DEEP_FILES_PER_LEVEL
+        parts = [f"branch{branch:03d}", *(f"level{n:02d}" for n in range(level + 1))]
+        paths.append("/".join([*parts, f"module_{i}.py"]))
+    return paths
+
+
+def create_tree(root: Path, file_count: int, layout: str = "wide", large_file_bytes: int = 0, seed: int = 0) -> list[str]:
+    """Write a synthetic source tree.
+
+    Args:
+        root: Empty or missing directory to fill
+        file_count: Number of Python modules
+        layout: One of LAYOUTS
+        large_file_bytes: Also write `large.txt` of about this size, if non-zero
+        seed: Seed of the generated content, so runs are reproducible
+
+    Returns:
+        Relative paths of the Python modules
+    """
+    rng = random.Random(seed)
+    paths = file_paths(file_count, layout)
+    for index, rel_path in enumerate(paths):
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(module_source(index, rng))
+    (root / ".gitignore").write_text("*.log\nbuild/\n")
+    if large_file_bytes:
+        line = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz ") for _ in range(79)) + "\n"
+        with open(root / "large.txt", "w") as f:
+            for i in range(large_file_bytes // len(line) + 1):
+                f.write(f"{i:08d} {line}")
+    return paths
+
+
+def init_repo(root: Path, commits: int = 3) -> None:
+    """Turn a tree into a git repository with a short history.
+
+    The first commit adds every file; each later commit edits one file.
+
+    Args:
+        root: Directory created by create_tree
+        commits: Total number of commits
+    """
+
+    def git(*args: str) -> None:
+        subprocess.run(["git", *GIT_ENV_CONFIG, *args], cwd=root, check=True, capture_output=True)
+
+    git("init", "-q")
+    git("add", "-A")
+    git("commit", "-q", "-m", "Initial commit")
+    for i in range(1, commits):
+        with open(root / ".gitignore", "a") as f:
+            f.write(f"# revision {i}\n")
+        git("commit", "-q", "-am", f"Revision {i}")
@@ -0,0 +1,209 @@
+"""Timing of tool operations on synthetic trees."""
+
+import asyncio
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from benchmarks.fixtures import create_tree, init_repo
+from mcp_server_code_assist.server import process_instruction
+from mcp_server_code_assist.tools.dir_tools import DirTools
+from mcp_server_code_assist.tools.file_tools import FileTools
+from mcp_server_code_assist.tools.git_tools import GitTools
+
+DEFAULT_SIZES = (1_000, 10_000)
+DEFAULT_LAYOUTS = ("wide", "deep")
+DEFAULT_REPEAT = 5
+DEFAULT_LARGE_FILE_BYTES = 16 * 1024 * 1024
+# Number of modules in the tree holding the large file
+LARGE_CASE_FILES = 100
+READ_MULTIPLE_FILES = 50
+
+Operation = tuple[str, str, Callable[[], Awaitable[Any]]]
+
+
+async def measure(func: Callable[[], Awaitable[Any]], repeat: int) -> dict[str, Any]:
+    """Time one cold call followed by repeat warm calls.
+
+    Args:
+        func: Operation to time
+        repeat: Number of warm calls
+
+    Returns:
+        Dict with "cold_seconds" and min/median/max of "warm_seconds"
+    """
+    start = time.perf_counter()
+    await func()
+    cold = time.perf_counter() - start
+    warm = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await func()
+        warm.append(time.perf_counter() - start)
+    result: dict[str, Any] = {"cold_seconds": cold}
+    if warm:
+        result["warm_seconds"] = {"min": min(warm), "median": statistics.median(warm), "max": max(warm)}
+    return result
+
+
+def _toggle(first: dict[str, str]) -> Callable[[], dict[str, str]]:
+    """Alternate between replacements and their inverse, so repeated edits keep the file size."""
+    inverse = {new: old for old, new in first.items()}
+    state = {"calls": 0}
+
+    def next_replacements() -> dict[str, str]:
+        state["calls"] += 1
+        return first if state["calls"] % 2 else inverse
+
+    return next_replacements
+
+
+def _file_operations(root: Path, paths: list[str], large: bool) -> list[Operation]:
+    tools = FileTools([str(root)])
+    module = str(root / paths[len(paths) // 2])
+    edits = _toggle({"self.size * factor": "factor * self.size"})
+    operations: list[Operation] = [
+        ("FileTools", "file_tree", lambda: tools.file_tree(str(root))),
+        ("FileTools", "read_file", lambda: tools.read_file(module)),
+        ("FileTools", "read_multiple_files", lambda: tools.read_multiple_files([str(root / rel_path) for rel_path in paths[:READ_MULTIPLE_FILES]])),
+        ("FileTools", "search_code_literal", lambda: tools.search_code(str(root), "helper_7(", literal=True)),
+        ("FileTools", "search_code_regex", lambda: tools.search_code(str(root), r"def helper_\d*5\(")),
+        ("FileTools", "find_symbol", lambda: tools.find_symbol(str(root), "Widget3")),
+        ("FileTools", "symbol_outline", lambda: tools.symbol_outline(module)),
+        ("FileTools", "modify_file", lambda: tools.modify_file(module, edits())),
+    ]
+    if large:
+        large_path = str(root / "large.txt")
+        large_edits = _toggle({"00001000 ": "0000100X "})
+        operations += [
+            ("FileTools", "read_file_large_range", lambda: tools.read_file(large_path, start_line=100_000, end_line=100_100)),
+            ("FileTools", "modify_file_large", lambda: tools.modify_file(large_path, large_edits())),
+        ]
+    return operations
+
+
+def _dir_operations(root: Path, paths: list[str]) -> list[Operation]:
+    tools = DirTools([str(root)])
+    directory = str((root / paths[0]).parent)
+    return [
+        ("DirTools", "list_directory", lambda: tools.list_directory(str(root))),
+        ("DirTools", "list_directory_by_mtime", lambda: tools.list_directory_entries(directory, sort="mtime", limit=100)),
+    ]
+
+
+def _git_operations(root: Path) -> list[Operation]:
+    tools = GitTools([str(root)])
+    repo = str(root)
+    return [
+        ("GitTools", "status", lambda: tools.status(repo)),
+        ("GitTools", "status_structured", lambda: tools.status_entries(repo)),
+        ("GitTools", "diff", lambda: tools.diff(repo)),
+        ("GitTools", "diff_stat", lambda: tools.diff(repo, mode="stat")),
+        ("GitTools", "log", lambda: tools.log(repo, max_count=10)),
+        ("GitTools", "show", lambda: tools.show(repo, "HEAD")),
+    ]
+
+
+def _instruction_operations(root: Path, paths: list[str]) -> list[Operation]:
+    module = str(root / paths[0])
+    edits = _toggle({"def scaled": "def scaled_by"})
+    return [
+        ("process_instruction", "read_file", lambda: process_instruction({"type": "read_file", "path": module}, root)),
+        ("process_instruction", "modify_file", lambda: process_instruction({"type": "modify_file", "path": module, "replacements": edits()}, root)),
+        ("process_instruction", "file_tree", lambda: process_instruction({"type": "file_tree", "path": str(root)}, root)),
+    ]
+
+
+async def run_case(root: Path, file_count: int, layout: str, git: bool, large_file_bytes: int, repeat: int) -> list[dict[str, Any]]:
+    """Create one tree and time every operation on it.
+
+    Args:
+        root: Missing directory to create the tree in
+        file_count: Number of Python modules
+        layout: One of fixtures.LAYOUTS
+        git: Make the tree a git repository and time the git tools too
+        large_file_bytes: Size of an extra large file, if non-zero
+        repeat: Number of warm calls per operation
+
+    Returns:
+        One result per operation
+    """
+    setup_start = time.perf_counter()
+    paths = create_tree(root, file_count, layout, large_file_bytes)
+    if git:
+        init_repo(root)
+        # Leave a modified file, so status and diff have something to report
+        with open(root / paths[-1], "a") as f:
+            f.write("\nEXTRA = 1\n")
+    setup_seconds = time.perf_counter() - setup_start
+
+    case = {"files": file_count, "layout": layout, "git": git, "large_file_bytes": large_file_bytes, "setup_seconds": setup_seconds}
+    operations = _file_operations(root, paths, bool(large_file_bytes)) + _dir_operations(root, paths) + _instruction_operations(root, paths)
+    if git:
+        operations += _git_operations(root)
+    results = []
+    for tool, operation, func in operations:
+        results.append({**case, "tool": tool, "operation": operation, **await measure(func, repeat)})
+    return results
+
+
+def _commit() -> str | None:
+    try:
+        result = subprocess.run(["git", "rev-parse", "HEAD"], cwd=Path(__file__).parent, capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+async def run_benchmarks(
+    sizes: tuple[int, ...] = DEFAULT_SIZES,
+    layouts: tuple[str, ...] = DEFAULT_LAYOUTS,
+    git: bool = True,
+    large_file_bytes: int = DEFAULT_LARGE_FILE_BYTES,
+    repeat: int = DEFAULT_REPEAT,
+    workdir: Path | None = None,
+) -> dict[str, Any]:
+    """Run every case and collect the results.
+
+    Each size and layout is run as a plain tree and, if git is set, as a git
+    repository. A large file, if enabled, gets its own case in a small tree.
+
+    Args:
+        sizes: File counts to run
+        layouts: Layouts to run
+        git: Also run each case as a git repository
+        large_file_bytes: Size of the large file case, 0 to skip it
+        repeat: Number of warm calls per operation
+        workdir: Directory for the trees, a temporary directory by default
+
+    Returns:
+        JSON-serializable dict with "meta" about the run and a list of "results"
+    """
+    meta = {
+        "commit": _commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "started_at": datetime.now(UTC).isoformat(),
+        "repeat": repeat,
+    }
+    with tempfile.TemporaryDirectory(prefix="mcp-bench-", dir=workdir) as tmp:
+        base = Path(tmp)
+        cases = [(size, layout, use_git, 0) for size in sizes for layout in layouts for use_git in ((False, True) if git else (False,))]
+        if large_file_bytes:
+            cases.append((LARGE_CASE_FILES, "wide", git, large_file_bytes))
+        results = []
+        for index, (size, layout, use_git, large) in enumerate(cases):
+            results += await run_case(base / f"case{index}", size, layout, use_git, large, repeat)
+    return {"meta": meta, "results": results}
+
+
+def run(**kwargs: Any) -> dict[str, Any]:
+    """Run run_benchmarks in a new event loop."""
+    return asyncio.run(run_benchmarks(**kwargs))
@@ -1,16 +1,53 @@
+import time
+
+# Taken before any other import, so --import-profile covers the whole package import
+_started = time.perf_counter()
+
+import json
 import logging
 import sys
 from pathlib import Path
 
 import click
 
-from .server import serve
+from .executors import DEFAULT_CPU_WORKERS, DEFAULT_GIT_WORKERS, DEFAULT_IO_WORKERS, configure_cpu_executor, configure_git_executor, configure_io_executor, shutdown_executors
+from .metrics import DEFAULT_SNAPSHOT_INTERVAL, configure_metrics_snapshots
+from .server import profile_startup, serve
+from .tools.content_cache import DEFAULT_CACHE_BYTES, configure_content_cache
+from .tools.file_writer import DEFAULT_FSYNC_POLICY, FSYNC_POLICIES, configure_fsync_policy
+from .tools.repo_pool import close_repo_pool
+from .tools.trigram_index import close_trigram_indexes, configure_trigram_index, default_index_dir
 
 
 @click.command()
 @click.option("--working-dir", "-w", type=Path, help="Working directory path")
+@click.option("--io-workers", type=click.IntRange(min=1), default=DEFAULT_IO_WORKERS, show_default=True, envvar="MCP_CODE_ASSIST_IO_WORKERS", help="Size of the filesystem I/O worker pool")
+@click.option("--git-workers", type=click.IntRange(min=1), default=DEFAULT_GIT_WORKERS, show_default=True, envvar="MCP_CODE_ASSIST_GIT_WORKERS", help="Size of the git worker pool")
+@click.option("--cpu-workers", type=click.IntRange(min=1), default=DEFAULT_CPU_WORKERS, show_default=True, envvar="MCP_CODE_ASSIST_CPU_WORKERS", help="Number of worker processes for parsing")
+@click.option("--cache-bytes", type=click.IntRange(min=0), default=DEFAULT_CACHE_BYTES, show_default=True, envvar="MCP_CODE_ASSIST_CACHE_BYTES", help="Byte budget of the file cache")
+@click.option("--fsync", type=click.Choice(FSYNC_POLICIES), default=DEFAULT_FSYNC_POLICY, show_default=True, envvar="MCP_CODE_ASSIST_FSYNC", help="Durability of file writes")
+@click.option("--trigram-index/--no-trigram-index", default=False, show_default=True, envvar="MCP_CODE_ASSIST_TRIGRAM_INDEX", help="Keep an on-disk trigram index per root to speed up search_code")
+@click.option("--index-dir", type=Path, default=None, envvar="MCP_CODE_ASSIST_INDEX_DIR", help="Directory for trigram index databases [default: ~/.cache/mcp-server-code-assist]")
+@click.option("--stats-file", type=Path, default=None, envvar="MCP_CODE_ASSIST_STATS_FILE", help="Append server_stats snapshots to this file as JSON lines")
+@click.option(
+    "--stats-interval", type=click.FloatRange(min=0, min_open=True), default=DEFAULT_SNAPSHOT_INTERVAL, show_default=True, envvar="MCP_CODE_ASSIST_STATS_INTERVAL", help="Seconds between snapshots"
+)
+@click.option("--import-profile", is_flag=True, help="Print startup timings up to the first initialize response as JSON and exit")
 @click.option("-v", "--verbose", count=True)
-def main(working_dir: Path | None, verbose: bool) -> None:
+def main(
+    working_dir: Path | None,
+    io_workers: int,
+    git_workers: int,
+    cpu_workers: int,
+    cache_bytes: int,
+    fsync: str,
+    trigram_index: bool,
+    index_dir: Path | None,
+    stats_file: Path | None,
+    stats_interval: float,
+    import_profile: bool,
+    verbose: bool,
+) -> None:
     """MCP Code Assist Server - Code operations for MCP"""
     import asyncio
 
@@ -21,7 +58,23 @@ def main(working_dir: Path | None, verbose: bool) -> None:
         logging_level = logging.DEBUG
 
     logging.basicConfig(level=logging_level, stream=sys.stderr)
-    asyncio.run(serve(working_dir))
+    configure_io_executor(io_workers)
+    configure_git_executor(git_workers)
+    configure_cpu_executor(cpu_workers)
+    configure_content_cache(cache_bytes)
+    configure_fsync_policy(fsync)
+    if trigram_index:
+        configure_trigram_index(index_dir or default_index_dir())
+    configure_metrics_snapshots(stats_file, stats_interval)
+    try:
+        if import_profile:
+            click.echo(json.dumps(asyncio.run(profile_startup(working_dir, _started)), indent=2))
+            return
+        asyncio.run(serve(working_dir))
+    finally:
+        close_trigram_indexes()
+        shutdown_executors()
+        close_repo_pool()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,189 @@
+"""Worker pools for running blocking work off the event loop."""
+
+import asyncio
+import functools
+import multiprocessing
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_IO_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+DEFAULT_GIT_WORKERS = min(8, max(4, os.cpu_count() or 1))
+DEFAULT_CPU_WORKERS = min(8, os.cpu_count() or 1)
+
+
+class WorkerPool:
+    """Lazily created, resizable ThreadPoolExecutor, or ProcessPoolExecutor if processes is set."""
+
+    def __init__(self, max_workers: int, thread_name_prefix: str, processes: bool = False):
+        self.max_workers = max_workers
+        self.thread_name_prefix = thread_name_prefix
+        self.processes = processes
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+
+    def configure(self, max_workers: int) -> None:
+        """Set the pool size; running work finishes on the previous executor.
+
+        Raises:
+            ValueError: If max_workers is not positive
+        """
+        if max_workers < 1:
+            raise ValueError(f"Worker count must be positive, got {max_workers}")
+        with self._lock:
+            self.max_workers = max_workers
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+    def executor(self) -> Executor:
+        """Get the executor, creating it on first use."""
+        with self._lock:
+            if self._executor is None:
+                if self.processes:
+                    # Forking a process that runs threads can deadlock the child
+                    self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=self.thread_name_prefix)
+            return self._executor
+
+    async def run(self, func: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+        """Run a blocking callable on the pool and await its result."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor(), functools.partial(func, *args, **kwargs))
+
+    def shutdown(self) -> None:
+        """Shut down the executor, waiting for running work to finish."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+_io_pool = WorkerPool(DEFAULT_IO_WORKERS, "mcp-io")
+_git_pool = WorkerPool(DEFAULT_GIT_WORKERS, "mcp-git")
+# Background index builds run one at a time so they never crowd out request work
+_index_pool = WorkerPool(1, "mcp-index")
+_cpu_pool = WorkerPool(DEFAULT_CPU_WORKERS, "mcp-cpu", processes=True)
+
+
+def configure_io_executor(max_workers: int) -> None:
+    """Set the size of the filesystem I/O worker pool.
+
+    Args:
+        max_workers: Maximum number of I/O worker threads
+
+    Raises:
+        ValueError: If max_workers is not positive
+    """
+    _io_pool.configure(max_workers)
+
+
+def get_io_executor() -> ThreadPoolExecutor:
+    """Get the shared, bounded filesystem I/O worker pool.
+
+    Returns:
+        ThreadPoolExecutor created on first use
+    """
+    return _io_pool.executor()
+
+
+async def run_io(func: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    """Run a blocking filesystem call on the I/O worker pool.
+
+    Args:
+        func: Blocking callable
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        Return value of func
+    """
+    return await _io_pool.run(func, *args, **kwargs)
+
+
+def configure_git_executor(max_workers: int) -> None:
+    """Set the size of the git worker pool.
+
+    Args:
+        max_workers: Maximum number of git worker threads
+
+    Raises:
+        ValueError: If max_workers is not positive
+    """
+    _git_pool.configure(max_workers)
+
+
+def get_git_executor() -> ThreadPoolExecutor:
+    """Get the shared, bounded git worker pool.
+
+    Returns:
+        ThreadPoolExecutor created on first use
+    """
+    return _git_pool.executor()
+
+
+async def run_git(func: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    """Run a blocking git call on the git worker pool.
+
+    Git work has its own pool so that slow git commands never hold up filesystem
+    I/O.
+
+    Args:
+        func: Blocking callable
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        Return value of func
+    """
+    return await _git_pool.run(func, *args, **kwargs)
+
+
+def configure_cpu_executor(max_workers: int) -> None:
+    """Set the number of worker processes for CPU-bound work.
+
+    Args:
+        max_workers: Maximum number of worker processes
+
+    Raises:
+        ValueError: If max_workers is not positive
+    """
+    _cpu_pool.configure(max_workers)
+
+
+async def run_cpu(func: Callable[..., T], /, *args: Any) -> T:
+    """Run a CPU-bound call in a worker process.
+
+    Parsing and similar work holds the GIL, so it runs in processes to use more
+    than one core. func and its arguments must be picklable.
+
+    Args:
+        func: Module-level callable
+        *args: Positional arguments for func
+
+    Returns:
+        Return value of func
+    """
+    return await _cpu_pool.run(func, *args)
+
+
+def get_index_executor() -> ThreadPoolExecutor:
+    """Get the single-threaded pool for background index builds.
+
+    Returns:
+        ThreadPoolExecutor created on first use
+    """
+    return _index_pool.executor()
+
+
+def shutdown_executors() -> None:
+    """Shut down all worker pools, waiting for running work to finish."""
+    _io_pool.shutdown()
+    _git_pool.shutdown()
+    _index_pool.shutdown()
+    _cpu_pool.shutdown()
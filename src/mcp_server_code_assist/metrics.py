@@ -0,0 +1,261 @@
+"""Per-tool call metrics and periodic snapshots of them."""
+
+import asyncio
+import contextlib
+import json
+import logging
+import math
+import threading
+import time
+from collections.abc import Generator
+from pathlib import Path
+from typing import Any
+
+from mcp_server_code_assist.executors import run_io
+from mcp_server_code_assist.tools.content_cache import get_content_cache
+from mcp_server_code_assist.tools.repo_pool import get_repo_pool
+from mcp_server_code_assist.tools.status_cache import get_status_cache
+from mcp_server_code_assist.tools.tools_manager import get_tool_registry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SNAPSHOT_INTERVAL = 60.0
+# Latency histogram buckets grow by 2 ** 0.25 from 0.1ms, so percentiles are within about 10%
+_BUCKET_BASE = 1e-4
+_BUCKET_GROWTH = 2**0.25
+PERCENTILES = (50, 95, 99)
+
+
+def _bucket(seconds: float) -> int:
+    if seconds <= _BUCKET_BASE:
+        return 0
+    return math.ceil(math.log(seconds / _BUCKET_BASE, _BUCKET_GROWTH))
+
+
+def _bucket_value(bucket: int) -> float:
+    # Geometric middle of the bucket's range
+    return _BUCKET_BASE * _BUCKET_GROWTH ** (bucket - 0.5) if bucket else _BUCKET_BASE
+
+
+def _rate(hits: int, misses: int) -> dict[str, int | float]:
+    lookups = hits + misses
+    return {"hits": hits, "misses": misses, "hit_rate": hits / lookups if lookups else 0.0}
+
+
+class ToolStats:
+    """Counters of one tool's calls."""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.histogram: dict[int, int] = {}
+        self.response_bytes = 0
+        self.max_response_bytes = 0
+        # Cache lookups made while the tool ran: [hits, misses]
+        self.cache: dict[str, list[int]] = {"content": [0, 0], "status": [0, 0]}
+
+    def percentile(self, percent: float) -> float:
+        """Estimate a latency percentile from the histogram.
+
+        Args:
+            percent: Percentile between 0 and 100
+
+        Returns:
+            Latency in seconds, 0.0 if there were no calls
+        """
+        if not self.calls:
+            return 0.0
+        rank = max(1, math.ceil(self.calls * percent / 100))
+        seen = 0
+        for bucket in sorted(self.histogram):
+            seen += self.histogram[bucket]
+            if seen >= rank:
+                return min(_bucket_value(bucket), self.max_seconds)
+        return self.max_seconds
+
+    def to_dict(self) -> dict[str, Any]:
+        """Summarize the counters, with latencies in seconds."""
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "latency_seconds": {
+                **{f"p{percent}": self.percentile(percent) for percent in PERCENTILES},
+                "mean": self.total_seconds / self.calls if self.calls else 0.0,
+                "max": self.max_seconds,
+            },
+            "response_bytes": {
+                "total": self.response_bytes,
+                "mean": self.response_bytes / self.calls if self.calls else 0.0,
+                "max": self.max_response_bytes,
+            },
+            "cache": {name: _rate(*counts) for name, counts in self.cache.items()},
+        }
+
+
+class CallRecord:
+    """Outcome of one tracked call, filled in by the caller."""
+
+    def __init__(self):
+        self.response_bytes = 0
+
+
+class ServerMetrics:
+    """Call counts, errors, latencies, response sizes and cache use per tool.
+
+    Latencies go into a fixed logarithmic histogram, so memory stays bounded no
+    matter how many calls are made. Cache lookups are attributed to the tool
+    that was running when they happened; while calls overlap, each sees the
+    lookups of the others too.
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self._tools: dict[str, ToolStats] = {}
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def track(self, name: str) -> Generator[CallRecord, None, None]:
+        """Time a tool call and record it when the block exits.
+
+        An exception leaving the block counts as an error and is re-raised.
+
+        Args:
+            name: Tool name
+
+        Yields:
+            CallRecord whose response_bytes the caller sets
+        """
+        content_cache, status_cache = get_content_cache(), get_status_cache()
+        before = (content_cache.hits, content_cache.misses, status_cache.hits, status_cache.misses)
+        record = CallRecord()
+        started = time.perf_counter()
+        error = True
+        try:
+            yield record
+            error = False
+        finally:
+            seconds = time.perf_counter() - started
+            after = (content_cache.hits, content_cache.misses, status_cache.hits, status_cache.misses)
+            self.record(name, seconds, record.response_bytes, error, [end - start for start, end in zip(before, after)])
+
+    def record(self, name: str, seconds: float, response_bytes: int = 0, error: bool = False, cache_deltas: list[int] | None = None) -> None:
+        """Record one tool call.
+
+        Args:
+            name: Tool name
+            seconds: Time the call took
+            response_bytes: Size of the response
+            error: Whether the call failed
+            cache_deltas: Content cache hits and misses, then status cache hits and misses, made by the call
+        """
+        with self._lock:
+            stats = self._tools.get(name)
+            if stats is None:
+                stats = self._tools[name] = ToolStats()
+            stats.calls += 1
+            stats.errors += error
+            stats.total_seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            bucket = _bucket(seconds)
+            stats.histogram[bucket] = stats.histogram.get(bucket, 0) + 1
+            stats.response_bytes += response_bytes
+            stats.max_response_bytes = max(stats.max_response_bytes, response_bytes)
+            if cache_deltas:
+                for counts, (hits, misses) in zip(stats.cache.values(), (cache_deltas[:2], cache_deltas[2:])):
+                    counts[0] += hits
+                    counts[1] += misses
+
+    def snapshot(self) -> dict[str, Any]:
+        """Get all counters.
+
+        Returns:
+            Dict with uptime, per-tool metrics sorted by name and the server-wide cache stats
+        """
+        with self._lock:
+            tools = {name: self._tools[name].to_dict() for name in sorted(self._tools)}
+        return {
+            "uptime_seconds": time.time() - self.started,
+            "tools": tools,
+            "caches": {
+                "content": get_content_cache().stats(),
+                "status": get_status_cache().stats(),
+                "repo_pool": get_repo_pool().stats(),
+                "tool_registry": get_tool_registry().stats(),
+            },
+        }
+
+    def reset(self) -> None:
+        """Drop the per-tool counters and restart the uptime clock."""
+        with self._lock:
+            self._tools.clear()
+            self.started = time.time()
+
+
+_metrics = ServerMetrics()
+_snapshot_path: Path | None = None
+_snapshot_interval = DEFAULT_SNAPSHOT_INTERVAL
+
+
+def get_metrics() -> ServerMetrics:
+    """Get the metrics recorded by the server's call_tool handler.
+
+    Returns:
+        Shared ServerMetrics
+    """
+    return _metrics
+
+
+def configure_metrics_snapshots(path: Path | None, interval: float = DEFAULT_SNAPSHOT_INTERVAL) -> None:
+    """Set where and how often serve appends metrics snapshots.
+
+    Args:
+        path: JSON Lines file to append to, or None to disable snapshots
+        interval: Seconds between snapshots
+
+    Raises:
+        ValueError: If interval is not positive
+    """
+    global _snapshot_path, _snapshot_interval
+    if interval <= 0:
+        raise ValueError(f"Snapshot interval must be positive, got {interval}")
+    _snapshot_path = path
+    _snapshot_interval = interval
+
+
+def write_snapshot(path: Path, metrics: ServerMetrics | None = None) -> None:
+    """Append a timestamped snapshot as one JSON line.
+
+    Args:
+        path: File to append to; its directory is created if needed
+        metrics: Metrics to write, the shared ones by default
+    """
+    snapshot = {"timestamp": time.time(), **(metrics or get_metrics()).snapshot()}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(snapshot) + "\n")
+
+
+async def write_snapshots_periodically() -> None:
+    """Append a snapshot every configured interval until cancelled, then once more.
+
+    Returns immediately if snapshots are not configured. Write errors are logged
+    and do not stop the loop.
+    """
+    if _snapshot_path is None:
+        return
+    path, interval = _snapshot_path, _snapshot_interval
+    try:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await run_io(write_snapshot, path)
+            except OSError as e:
+                logger.warning("Could not write metrics snapshot to %s: %s", path, e)
+    finally:
+        # A last snapshot on shutdown keeps the calls made since the previous one
+        try:
+            write_snapshot(path)
+        except OSError as e:
+            logger.warning("Could not write metrics snapshot to %s: %s", path, e)
@@ -4,7 +4,7 @@ import platform
 
 from mcp.types import GetPromptResult, Prompt, PromptArgument, PromptMessage, TextContent
 
-from mcp_server_code_assist.tools.git_tools import GitTools
+from mcp_server_code_assist.tools.tools_manager import get_git_tools
 
 git_prompts = {
     "git-advanced": Prompt(
@@ -26,7 +26,7 @@ git_prompts = {
 }
 
 
-def handle_git_prompt(name: str, arguments: dict[str, str] | None = None) -> GetPromptResult:
+async def handle_git_prompt(name: str, arguments: dict[str, str] | None = None) -> GetPromptResult:
     """Handle git prompts.
 
     Args:
@@ -51,11 +51,11 @@ def handle_git_prompt(name: str, arguments: dict[str, str] | None = None) -> Get
     if not operation or not repo_path:
         raise ValueError("Operation and repo_path are required")
 
-    git_tools = GitTools([repo_path])
+    git_tools = get_git_tools([repo_path])
 
     system_info = f"{platform.system()} {platform.machine()}"
 
-    before_status = git_tools.status(repo_path)
+    before_status = await git_tools.status(repo_path)
     user_prompt = (
         f"Please help with the following git operation in {repo_path}:\n{operation}\n\n"
         f"Current status:\n{before_status}\n\n"
@@ -63,4 +63,4 @@ def handle_git_prompt(name: str, arguments: dict[str, str] | None = None) -> Get
         "After you provide the commands and I execute them, I'll respond with 'done'. Then use git_tools to verify the changes."
     )
 
-    return GetPromptResult(messages=[PromptMessage(role="user", content=TextContent(text=user_prompt))])
+    return GetPromptResult(messages=[PromptMessage(role="user", content=TextContent(type="text", text=user_prompt))])
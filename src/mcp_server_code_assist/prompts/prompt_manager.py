@@ -33,4 +33,4 @@ async def handle_prompt(name: str, arguments: dict[str, str] | None = None) -> G
     if name.startswith("git-"):
         return await handle_git_prompt(name, arguments)
 
-    return GetPromptResult(messages=[PromptMessage(role="user", content=TextContent(text=f"Unhandled prompt: {name}"))])
+    return GetPromptResult(messages=[PromptMessage(role="user", content=TextContent(type="text", text=f"Unhandled prompt: {name}"))])
@@ -1,3 +1,9 @@
+import asyncio
+import contextlib
+import json
+import os
+import sys
+import time
 from enum import Enum
 from pathlib import Path
 from typing import Any
@@ -5,9 +11,30 @@ from typing import Any
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import GetPromptResult, Prompt, TextContent, Tool
+from pydantic import BaseModel
 
+from mcp_server_code_assist.metrics import get_metrics, write_snapshots_periodically
 from mcp_server_code_assist.prompts.prompt_manager import get_prompts, handle_prompt
-from mcp_server_code_assist.tools.models import CreateDirectory, FileCreate, FileDelete, FileModify, FileRead, FileRewrite, FileTree, GitDiff, GitLog, GitShow, GitStatus, ListDirectory
+from mcp_server_code_assist.tools.models import (
+    CreateDirectory,
+    FileCreate,
+    FileDelete,
+    FileModify,
+    FileRead,
+    FileReadMultiple,
+    FileRewrite,
+    FileTree,
+    FindSymbol,
+    GitDiff,
+    GitLog,
+    GitShow,
+    GitStatus,
+    InstructionBatch,
+    ListDirectory,
+    SearchCode,
+    ServerStats,
+    SymbolOutline,
+)
 from mcp_server_code_assist.tools.tools_manager import get_dir_tools, get_file_tools, get_git_tools
 
 
@@ -22,7 +49,11 @@ class CodeAssistTools(str, Enum):
     MODIFY_FILE = "modify_file"
     REWRITE_FILE = "rewrite_file"
     READ_FILE = "read_file"
+    READ_MULTIPLE_FILES = "read_multiple_files"
     FILE_TREE = "file_tree"
+    SEARCH_CODE = "search_code"
+    FIND_SYMBOL = "find_symbol"
+    SYMBOL_OUTLINE = "symbol_outline"
 
     # Git operations
     GIT_STATUS = "git_status"
@@ -30,119 +61,209 @@ class CodeAssistTools(str, Enum):
     GIT_LOG = "git_log"
     GIT_SHOW = "git_show"
 
+    # Server operations
+    SERVER_STATS = "server_stats"
+
+    # Batch operations
+    PROCESS_INSTRUCTIONS = "process_instructions"
+
+
+# Heavy modules that are only imported once a tool needs them
+LAZY_MODULES = ("git", "xmlschema", "sqlite3", "difflib")
+
+# Instruction types that change the file at their path
+WRITE_INSTRUCTIONS = {"create_file", "modify_file", "rewrite_file", "delete_file"}
+
 
 async def process_instruction(instruction: dict[str, Any], repo_path: Path) -> dict[str, Any]:
-    file_tools = get_file_tools([str(repo_path)])
-    dir_tools = get_dir_tools([str(repo_path)])
-    git_tools = get_git_tools([str(repo_path)])
+    paths = [str(repo_path)]
     try:
-        match instruction["type"]:
+        match instruction.get("type"):
             case "read_file":
-                return {"content": await file_tools.read_file(instruction["path"])}
+                model = FileRead.model_validate(instruction)
+                return {"content": await get_file_tools(paths).read_file(model.path, model.start_line, model.end_line, model.byte_offset, model.byte_length, model.max_bytes)}
             case "read_multiple":
-                return {"contents": await file_tools.read_multiple_files(instruction["paths"])}
+                model = FileReadMultiple.model_validate(instruction)
+                return {"contents": await get_file_tools(paths).read_multiple_files(model.paths, model.max_concurrency)}
             case "create_file":
-                return {"message": await file_tools.create_file(instruction["path"], instruction["content"])}
+                model = FileCreate.model_validate(instruction)
+                return {"message": await get_file_tools(paths).create_file(model.path, model.content)}
             case "modify_file":
-                return {"diff": await file_tools.modify_file(instruction["path"], instruction["replacements"])}
+                model = FileModify.model_validate(instruction)
+                diff, counts = await get_file_tools(paths).modify_file_with_counts(model.path, model.replacements, model.strict, model)
+                return {"diff": diff, "counts": counts}
             case "rewrite_file":
-                return {"diff": await file_tools.rewrite_file(instruction["path"], instruction["content"])}
+                model = FileRewrite.model_validate(instruction)
+                return {"diff": await get_file_tools(paths).rewrite_file(model.path, model.content, model)}
             case "delete_file":
-                return {"message": await file_tools.delete_file(instruction["path"])}
+                model = FileDelete.model_validate(instruction)
+                return {"message": await get_file_tools(paths).delete_file(model.path)}
             case "file_tree":
-                tree, dirs, files = await file_tools.file_tree(instruction["path"])
+                model = FileTree.model_validate(instruction)
+                tree, dirs, files = await get_file_tools(paths).file_tree_with_counts(model.path)
                 return {"tree": tree, "directories": dirs, "files": files}
+            case "search_code":
+                model = SearchCode.model_validate(instruction)
+                file_tools = get_file_tools(paths)
+                return {"search": await file_tools.search_code(model.path, model.pattern, model.literal, model.ignore_case, model.include, model.context_lines, model.max_results, model.timeout)}
+            case "find_symbol":
+                model = FindSymbol.model_validate(instruction)
+                return {"symbols": await get_file_tools(paths).find_symbol(model.path, model.name, model.kind, model.exact, model.max_results)}
+            case "symbol_outline":
+                model = SymbolOutline.model_validate(instruction)
+                return {"outline": await get_file_tools(paths).symbol_outline(model.path)}
             case "list_directory":
-                return {"content": await dir_tools.list_directory(instruction["path"])}
+                model = ListDirectory.model_validate(instruction)
+                dir_tools = get_dir_tools(paths)
+                if model.structured:
+                    return {"listing": await dir_tools.list_directory_entries(model.path, model.sort, model.reverse, model.pattern, model.offset, model.limit)}
+                return {"content": await dir_tools.list_directory(model.path, model.sort, model.reverse, model.pattern, model.offset, model.limit)}
             case "git_status":
-                return {"status": git_tools.status(str(repo_path))}
+                model = GitStatus.model_validate({**instruction, "repo_path": str(repo_path)})
+                git_tools = get_git_tools(paths)
+                if model.structured:
+                    return {"status": await git_tools.status_entries(model.repo_path, model.refresh)}
+                return {"status": await git_tools.status(model.repo_path, refresh=model.refresh)}
             case "git_diff":
-                return {"diff": git_tools.diff(str(repo_path), instruction.get("target"))}
+                model = GitDiff.model_validate({**instruction, "repo_path": str(repo_path)})
+                return {"diff": await get_git_tools(paths).diff(model.repo_path, model.target, model.paths, model.mode, model.max_hunks_per_file, model.max_bytes, model.cursor)}
             case "git_log":
-                return {"log": git_tools.log(str(repo_path), instruction.get("max_count", 10))}
+                model = GitLog.model_validate({**instruction, "repo_path": str(repo_path)})
+                return {"log": await get_git_tools(paths).log_page(model.repo_path, model.max_count, model.cursor, model.rev, model.path, model.author)}
             case "git_show":
-                return {"show": git_tools.show(str(repo_path), instruction["commit"])}
+                model = GitShow.model_validate({**instruction, "repo_path": str(repo_path)})
+                return {"show": await get_git_tools(paths).show(model.repo_path, model.revision)}
             case _:
-                raise ValueError(f"Unknown instruction type: {instruction['type']}")
+                raise ValueError(f"Unknown instruction type: {instruction.get('type')}")
     except Exception as e:
         return {"error": str(e)}
 
 
-async def serve(working_dir: Path | None) -> None:
+def _instruction_scope(instruction: dict[str, Any], repo_path: Path) -> tuple[list[Path], bool]:
+    """Get the paths an instruction touches and whether it writes to them."""
+    instruction_type = instruction.get("type", "")
+    if instruction_type.startswith("git_"):
+        paths = [repo_path]
+    elif instruction_type == "read_multiple":
+        paths = instruction.get("paths", [])
+    else:
+        paths = [instruction["path"]] if "path" in instruction else []
+    return [Path(os.path.abspath(path)) for path in paths], instruction_type in WRITE_INSTRUCTIONS
+
+
+def _scopes_conflict(first: tuple[list[Path], bool], second: tuple[list[Path], bool]) -> bool:
+    """Check if two instructions must keep their relative order.
+
+    They conflict when at least one of them writes and their paths overlap, i.e.
+    one path equals or contains the other.
+    """
+    if not (first[1] or second[1]):
+        return False
+    return any(a == b or a.is_relative_to(b) or b.is_relative_to(a) for a in first[0] for b in second[0])
+
+
+async def process_instructions(instructions: list[dict[str, Any]], repo_path: Path) -> list[dict[str, Any]]:
+    """Execute a batch of instructions with dependency-aware parallelism.
+
+    Instructions run concurrently unless they conflict on a path, in which case the
+    later one waits for the earlier one, so edits to the same file keep their order.
+
+    Args:
+        instructions: Instruction dicts as accepted by process_instruction
+        repo_path: Repository path the instructions operate on
+
+    Returns:
+        Results of each instruction, in input order
+    """
+    tasks: list[asyncio.Task] = []
+    scopes = []
+
+    async def run_after(dependencies: list[asyncio.Task], instruction: dict[str, Any]) -> dict[str, Any]:
+        if dependencies:
+            await asyncio.wait(dependencies)
+        return await process_instruction(instruction, repo_path)
+
+    for instruction in instructions:
+        try:
+            scope = _instruction_scope(instruction, repo_path)
+        except (TypeError, ValueError):
+            scope = ([], False)
+        dependencies = [task for task, other in zip(tasks, scopes) if _scopes_conflict(scope, other)]
+        tasks.append(asyncio.create_task(run_after(dependencies, instruction)))
+        scopes.append(scope)
+
+    return list(await asyncio.gather(*tasks))
+
+
+# Name, description and argument model of each tool, in the order they are listed
+TOOL_DEFINITIONS: tuple[tuple[CodeAssistTools, str, type[BaseModel]], ...] = (
+    # Directory operations
+    (CodeAssistTools.LIST_DIRECTORY, "Lists one page of a directory's entries with type, size, mtime and mode; supports sorting and glob filtering", ListDirectory),
+    (CodeAssistTools.CREATE_DIRECTORY, "Creates a new directory", CreateDirectory),
+    # File operations
+    (CodeAssistTools.CREATE_FILE, "Creates a new file with content", FileCreate),
+    (CodeAssistTools.DELETE_FILE, "Deletes a file", FileDelete),
+    (CodeAssistTools.MODIFY_FILE, "Modifies parts of a file using string replacements applied in one pass; with strict, fails unless each pattern matches exactly once", FileModify),
+    (CodeAssistTools.REWRITE_FILE, "Rewrites entire file content", FileRewrite),
+    (CodeAssistTools.READ_FILE, "Reads file content, optionally limited to a line or byte range and a maximum size", FileRead),
+    (CodeAssistTools.READ_MULTIPLE_FILES, "Reads many files concurrently in one call, returning each file's content or error", FileReadMultiple),
+    (CodeAssistTools.FILE_TREE, "Lists directory tree structure with git tracking support", FileTree),
+    (
+        CodeAssistTools.SEARCH_CODE,
+        "Searches file contents for a regex or literal, honoring git tracking and gitignore like file_tree; returns matching lines with line numbers and context as JSON",
+        SearchCode,
+    ),
+    (CodeAssistTools.FIND_SYMBOL, "Finds where Python classes, functions, methods and module-level variables are defined under a directory; returns JSON with paths and line ranges", FindSymbol),
+    (CodeAssistTools.SYMBOL_OUTLINE, "Outlines the definitions of a Python file, or of every Python file under a directory, as JSON", SymbolOutline),
+    # Git operations
+    (CodeAssistTools.GIT_STATUS, "Shows git repository status, as text or porcelain v2 style JSON; results are cached until the index, HEAD or refs change", GitStatus),
+    (CodeAssistTools.GIT_DIFF, "Shows git diff; supports pathspecs, stat/numstat summaries, per-file hunk limits and a byte cap with a continuation cursor", GitDiff),
+    (CodeAssistTools.GIT_LOG, "Shows one page of git commit history as JSON records; pass next_cursor back to get the next page", GitLog),
+    (CodeAssistTools.GIT_SHOW, "Shows git commit details", GitShow),
+    # Server operations
+    (
+        CodeAssistTools.SERVER_STATS,
+        "Returns per-tool call counts, error counts, latency percentiles (p50/p95/p99), response sizes and cache hit rates as JSON",
+        ServerStats,
+    ),
+    # Batch operations
+    (CodeAssistTools.PROCESS_INSTRUCTIONS, "Runs a list of instructions in one call; independent paths run concurrently, operations on the same path keep their order", InstructionBatch),
+)
+
+
+def build_tool_catalog() -> tuple[Tool, ...]:
+    """Build the tool list with the JSON schema of each tool's arguments.
+
+    Returns:
+        Tools in TOOL_DEFINITIONS order
+    """
+    return tuple(Tool(name=name, description=description, inputSchema=model.model_json_schema()) for name, description, model in TOOL_DEFINITIONS)
+
+
+def create_server(working_dir: Path | None) -> Server:
+    """Create the server with its tool and prompt handlers.
+
+    Args:
+        working_dir: Directory the tools may operate in, if given
+
+    Returns:
+        Server ready to run over any transport
+    """
     server = Server("mcp-code-assist")
     allowed_paths = [str(working_dir)] if working_dir else []
 
+    # Schemas and prompts never change while the server runs, so they are built once
+    tools = build_tool_catalog()
+    prompts = tuple(get_prompts())
+    tool_names = {tool.name for tool in tools}
+
     @server.list_tools()
     async def list_tools() -> list[Tool]:
-        return [
-            # Directory operations
-            Tool(
-                name=CodeAssistTools.LIST_DIRECTORY,
-                description="Lists directory contents using system ls/dir command",
-                inputSchema=ListDirectory.model_json_schema(),
-            ),
-            Tool(
-                name=CodeAssistTools.CREATE_DIRECTORY,
-                description="Creates a new directory",
-                inputSchema=CreateDirectory.model_json_schema(),
-            ),
-            # File operations
-            Tool(
-                name=CodeAssistTools.CREATE_FILE,
-                description="Creates a new file with content",
-                inputSchema=FileCreate.model_json_schema(),
-            ),
-            Tool(
-                name=CodeAssistTools.DELETE_FILE,
-                description="Deletes a file",
-                inputSchema=FileDelete.model_json_schema(),
-            ),
-            Tool(
-                name=CodeAssistTools.MODIFY_FILE,
-                description="Modifies parts of a file using string replacements",
-                inputSchema=FileModify.model_json_schema(),
-            ),
-            Tool(
-                name=CodeAssistTools.REWRITE_FILE,
-                description="Rewrites entire file content",
-                inputSchema=FileRewrite.model_json_schema(),
-            ),
-            Tool(
-                name=CodeAssistTools.READ_FILE,
-                description="Reads file content",
-                inputSchema=FileRead.model_json_schema(),
-            ),
-            Tool(
-                name=CodeAssistTools.FILE_TREE,
-                description="Lists directory tree structure with git tracking support",
-                inputSchema=ListDirectory.model_json_schema(),
-            ),
-            # Git operations
-            Tool(
-                name=CodeAssistTools.GIT_STATUS,
-                description="Shows git repository status",
-                inputSchema=GitStatus.model_json_schema(),
-            ),
-            Tool(
-                name=CodeAssistTools.GIT_DIFF,
-                description="Shows git diff",
-                inputSchema=GitDiff.model_json_schema(),
-            ),
-            Tool(
-                name=CodeAssistTools.GIT_LOG,
-                description="Shows git commit history",
-                inputSchema=GitLog.model_json_schema(),
-            ),
-            Tool(
-                name=CodeAssistTools.GIT_SHOW,
-                description="Shows git commit details",
-                inputSchema=GitShow.model_json_schema(),
-            ),
-        ]
+        return list(tools)
 
     @server.list_prompts()
     async def list_prompts() -> list[Prompt]:
-        return get_prompts()
+        return list(prompts)
 
     @server.get_prompt()
     async def get_prompt(name: str, arguments: dict[str, str] | None = None) -> GetPromptResult:
@@ -150,69 +271,152 @@ async def serve(working_dir: Path | None) -> None:
 
     @server.call_tool()
     async def call_tool(name: str, arguments: dict) -> list[TextContent]:
+        # Unknown names share one entry, so clients cannot grow the metrics without bound
+        with get_metrics().track(name if name in tool_names else "<unknown>") as call:
+            result = await run_tool(name, arguments)
+            call.response_bytes = sum(len(content.text.encode()) for content in result)
+        return result
+
+    async def run_tool(name: str, arguments: dict) -> list[TextContent]:
         repo_path = arguments.get("repo_path", "")
         paths = [repo_path] if repo_path else allowed_paths
-        file_tools = get_file_tools(paths)
-        dir_tools = get_dir_tools(paths)
-        git_tools = get_git_tools(paths)
 
         match name:
             # Directory operations
             case CodeAssistTools.LIST_DIRECTORY:
-                model = ListDirectory(path=arguments["path"])
-                result = await dir_tools.list_directory(model.path)
+                model = ListDirectory.model_validate(arguments)
+                result = await get_dir_tools(paths).list_directory(model.path, model.sort, model.reverse, model.pattern, model.offset, model.limit, model.structured)
                 return [TextContent(type="text", text=result)]
             case CodeAssistTools.CREATE_DIRECTORY:
-                model = CreateDirectory(path=arguments["path"])
-                result = await dir_tools.create_directory(model.path)
+                model = CreateDirectory.model_validate(arguments)
+                result = await get_dir_tools(paths).create_directory(model.path)
                 return [TextContent(type="text", text=result)]
 
             # File operations
             case CodeAssistTools.READ_FILE:
-                model = FileRead(path=arguments["path"])
-                result = await file_tools.read_file(model.path)
+                model = FileRead.model_validate(arguments)
+                result = await get_file_tools(paths).read_file(model.path, model.start_line, model.end_line, model.byte_offset, model.byte_length, model.max_bytes)
                 return [TextContent(type="text", text=result)]
+            case CodeAssistTools.READ_MULTIPLE_FILES:
+                model = FileReadMultiple.model_validate(arguments)
+                results = await get_file_tools(paths).read_multiple_files(model.paths, model.max_concurrency)
+                return [TextContent(type="text", text=f"{path}:\n{result['content']}" if "content" in result else f"{path}: Error - {result['error']}") for path, result in results.items()]
             case CodeAssistTools.CREATE_FILE:
-                model = FileCreate(path=arguments["path"], content=arguments["content"])
-                result = await file_tools.create_file(model.path, model.content)
+                model = FileCreate.model_validate(arguments)
+                result = await get_file_tools(paths).create_file(model.path, model.content)
                 return [TextContent(type="text", text=result)]
             case CodeAssistTools.MODIFY_FILE:
-                model = FileModify(path=arguments["path"], replacements=arguments["replacements"])
-                result = await file_tools.modify_file(model.path, model.replacements)
-                return [TextContent(type="text", text=result)]
+                model = FileModify.model_validate(arguments)
+                diff, counts = await get_file_tools(paths).modify_file_with_counts(model.path, model.replacements, model.strict, model)
+                summary = "\n".join(f"{old!r}: {count} replacement{'' if count == 1 else 's'}" for old, count in counts.items())
+                return [TextContent(type="text", text=f"{diff}\n\n{summary}" if diff else summary)]
             case CodeAssistTools.REWRITE_FILE:
-                model = FileRewrite(path=arguments["path"], content=arguments["content"])
-                result = await file_tools.rewrite_file(model.path, model.content)
+                model = FileRewrite.model_validate(arguments)
+                result = await get_file_tools(paths).rewrite_file(model.path, model.content, model)
                 return [TextContent(type="text", text=result)]
             case CodeAssistTools.DELETE_FILE:
-                model = FileDelete(path=arguments["path"])
-                result = await file_tools.delete_file(model.path)
+                model = FileDelete.model_validate(arguments)
+                result = await get_file_tools(paths).delete_file(model.path)
                 return [TextContent(type="text", text=result)]
             case CodeAssistTools.FILE_TREE:
-                model = FileTree(path=arguments["path"])
-                result = await file_tools.file_tree(model.path)
+                model = FileTree.model_validate(arguments)
+                result = await get_file_tools(paths).file_tree(model.path)
                 return [TextContent(type="text", text=result)]
+            case CodeAssistTools.SEARCH_CODE:
+                model = SearchCode.model_validate(arguments)
+                result = await get_file_tools(paths).search_code(model.path, model.pattern, model.literal, model.ignore_case, model.include, model.context_lines, model.max_results, model.timeout)
+                return [TextContent(type="text", text=json.dumps(result, indent=2))]
+            case CodeAssistTools.FIND_SYMBOL:
+                model = FindSymbol.model_validate(arguments)
+                result = await get_file_tools(paths).find_symbol(model.path, model.name, model.kind, model.exact, model.max_results)
+                return [TextContent(type="text", text=json.dumps(result, indent=2))]
+            case CodeAssistTools.SYMBOL_OUTLINE:
+                model = SymbolOutline.model_validate(arguments)
+                result = await get_file_tools(paths).symbol_outline(model.path)
+                return [TextContent(type="text", text=json.dumps(result, indent=2))]
 
             # Git operations
             case CodeAssistTools.GIT_STATUS:
-                model = GitStatus(repo_path=arguments["repo_path"])
-                result = await git_tools.status(model.repo_path)
+                model = GitStatus.model_validate(arguments)
+                result = await get_git_tools(paths).status(model.repo_path, model.structured, model.refresh)
                 return [TextContent(type="text", text=result)]
             case CodeAssistTools.GIT_DIFF:
-                model = GitDiff(repo_path=arguments["repo_path"], target=arguments.get("target", ""))
-                result = await git_tools.diff(model.repo_path, model.target)
+                model = GitDiff.model_validate(arguments)
+                result = await get_git_tools(paths).diff(model.repo_path, model.target, model.paths, model.mode, model.max_hunks_per_file, model.max_bytes, model.cursor)
                 return [TextContent(type="text", text=result)]
             case CodeAssistTools.GIT_LOG:
-                model = GitLog(repo_path=arguments["repo_path"], max_count=arguments.get("max_count", 10))
-                result = await git_tools.log(model.repo_path, model.max_count)
+                model = GitLog.model_validate(arguments)
+                result = await get_git_tools(paths).log(model.repo_path, model.max_count, model.cursor, model.rev, model.path, model.author)
                 return [TextContent(type="text", text=result)]
             case CodeAssistTools.GIT_SHOW:
-                model = GitShow(repo_path=arguments["repo_path"], revision=arguments["commit"])
-                result = await git_tools.show(model.repo_path, model.revision)
+                model = GitShow.model_validate(arguments)
+                result = await get_git_tools(paths).show(model.repo_path, model.revision)
                 return [TextContent(type="text", text=result)]
+
+            # Server operations
+            case CodeAssistTools.SERVER_STATS:
+                model = ServerStats.model_validate(arguments)
+                metrics = get_metrics()
+                result = metrics.snapshot()
+                if model.reset:
+                    metrics.reset()
+                return [TextContent(type="text", text=json.dumps(result, indent=2))]
+
+            # Batch operations
+            case CodeAssistTools.PROCESS_INSTRUCTIONS:
+                model = InstructionBatch.model_validate(arguments)
+                results = await process_instructions(model.instructions, Path(model.repo_path))
+                return [TextContent(type="text", text=json.dumps(results, indent=2, default=str))]
             case _:
                 raise ValueError(f"Unknown tool: {name}")
 
+    return server
+
+
+async def serve(working_dir: Path | None) -> None:
+    server = create_server(working_dir)
     options = server.create_initialization_options()
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(read_stream, write_stream, options, raise_exceptions=True)
+    snapshots = asyncio.create_task(write_snapshots_periodically())
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(read_stream, write_stream, options, raise_exceptions=True)
+    finally:
+        snapshots.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await snapshots
+
+
+async def profile_startup(working_dir: Path | None, started: float) -> dict[str, Any]:
+    """Time startup up to the first initialize response.
+
+    The server is run in-process over memory streams, and a client performs the
+    initialize handshake, so the measurement excludes only interpreter startup.
+
+    Args:
+        working_dir: Directory the tools may operate in, if given
+        started: time.perf_counter() value from before the package was imported
+
+    Returns:
+        Seconds spent importing, creating the server and answering initialize, their
+        total, and which of LAZY_MODULES were loaded by then
+    """
+    import anyio
+    from mcp.client.session import ClientSession
+    from mcp.shared.memory import create_client_server_memory_streams
+
+    imported = time.perf_counter()
+    server = create_server(working_dir)
+    created = time.perf_counter()
+    async with create_client_server_memory_streams() as (client_streams, server_streams), anyio.create_task_group() as tg:
+        tg.start_soon(lambda: server.run(*server_streams, server.create_initialization_options(), raise_exceptions=True))
+        async with ClientSession(*client_streams) as session:
+            await session.initialize()
+            initialized = time.perf_counter()
+        tg.cancel_scope.cancel()
+    return {
+        "import_seconds": imported - started,
+        "setup_seconds": created - imported,
+        "initialize_seconds": initialized - created,
+        "total_seconds": initialized - started,
+        "lazy_modules_loaded": sorted(name for name in LAZY_MODULES if name in sys.modules),
+    }
@@ -0,0 +1,138 @@
+"""Byte-budgeted LRU cache of file contents."""
+
+import threading
+import time
+from collections import OrderedDict
+
+from mcp_server_code_assist.tools import tree_index
+
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+
+
+class ContentCache:
+    """LRU cache of decoded file contents keyed on (resolved path, mtime_ns, size).
+
+    The total size of cached files is kept under max_bytes by evicting the least
+    recently used entries. Files modified within the racy window are not cached,
+    since a rewrite in the same mtime tick with the same size would go unnoticed.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, tuple[int, int, str]] = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, path: str, mtime_ns: int, size: int) -> str | None:
+        """Get cached content if the file is unchanged.
+
+        Args:
+            path: Resolved file path
+            mtime_ns: Current modification time of the file
+            size: Current size of the file
+
+        Returns:
+            Cached content, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == mtime_ns and entry[1] == size:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry[2]
+            if entry is not None:
+                self._remove(path)
+            self.misses += 1
+            return None
+
+    def put(self, path: str, mtime_ns: int, size: int, content: str) -> None:
+        """Cache content read from a file.
+
+        Args:
+            path: Resolved file path
+            mtime_ns: Modification time of the file when it was read
+            size: Size of the file in bytes, counted against the budget
+            content: Decoded file content
+        """
+        if size > self.max_bytes or time.time_ns() - mtime_ns <= tree_index.RACY_WINDOW_NS:
+            return
+        with self._lock:
+            self._remove(path)
+            self._entries[path] = (mtime_ns, size, content)
+            self._total_bytes += size
+            while self._total_bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, path: str) -> None:
+        """Drop the cached content of a file.
+
+        Args:
+            path: Resolved file path
+        """
+        with self._lock:
+            self._remove(path)
+
+    def clear(self) -> None:
+        """Drop all cached contents."""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> dict[str, int | float]:
+        """Get cache counters for tuning the budget.
+
+        Returns:
+            Dict with hits, misses, evictions, hit rate, entry count and byte usage
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _remove(self, path: str) -> None:
+        entry = self._entries.pop(path, None)
+        if entry is not None:
+            self._total_bytes -= entry[1]
+
+
+_content_cache_bytes = DEFAULT_CACHE_BYTES
+_content_cache: ContentCache | None = None
+
+
+def configure_content_cache(max_bytes: int) -> None:
+    """Set the byte budget of the shared content cache.
+
+    Args:
+        max_bytes: Maximum total size of cached files; 0 disables caching
+
+    Raises:
+        ValueError: If max_bytes is negative
+    """
+    global _content_cache_bytes, _content_cache
+    if max_bytes < 0:
+        raise ValueError(f"Cache size must not be negative, got {max_bytes}")
+    _content_cache_bytes = max_bytes
+    _content_cache = None
+
+
+def get_content_cache() -> ContentCache:
+    """Get the content cache shared by all FileTools instances.
+
+    Returns:
+        ContentCache created on first use
+    """
+    global _content_cache
+    if _content_cache is None:
+        _content_cache = ContentCache(_content_cache_bytes)
+    return _content_cache
@@ -0,0 +1,262 @@
+"""Unified diffs of file edits, bounded in time and size."""
+
+import math
+import time
+
+NO_NEWLINE = "\\ No newline at end of file\n"
+
+# Runs of equal lines: (a_start, b_start, size)
+Block = tuple[int, int, int]
+# Changed ranges: (a_start, a_end, b_start, b_end)
+Change = tuple[int, int, int, int]
+
+
+class _DiffTimeout(Exception):
+    pass
+
+
+def _furthest(v: list[int], index: int, k: int, d: int) -> int:
+    # Step down from diagonal k + 1 or right from diagonal k - 1, whichever reaches further
+    if k == -d or (k != d and v[index - 1] < v[index + 1]):
+        return v[index + 1]
+    return v[index - 1] + 1
+
+
+def _middle_snake(a: list[int], a_lo: int, a_hi: int, b: list[int], b_lo: int, b_hi: int, deadline: float) -> tuple[int, int, int, int]:
+    """Find the middle snake of a shortest edit script (Myers, linear space).
+
+    Both ranges must be non-empty and differ in their first and last lines.
+
+    Returns:
+        Tuple of (a_start, b_start, a_end, b_end) of the snake; may be empty
+    """
+    n = a_hi - a_lo
+    m = b_hi - b_lo
+    delta = n - m
+    odd = delta & 1
+    offset = (n + m + 1) // 2 + 2
+    forward = [0] * (2 * offset + 1)
+    backward = [0] * (2 * offset + 1)
+    for d in range((n + m + 1) // 2 + 1):
+        if time.monotonic() > deadline:
+            raise _DiffTimeout
+        for k in range(-d, d + 1, 2):
+            x = _furthest(forward, offset + k, k, d)
+            y = x - k
+            x0, y0 = x, y
+            while x < n and y < m and a[a_lo + x] == b[b_lo + y]:
+                x += 1
+                y += 1
+            forward[offset + k] = x
+            if odd and delta - d < k < delta + d and x + backward[offset + delta - k] >= n:
+                return a_lo + x0, b_lo + y0, a_lo + x, b_lo + y
+        for k in range(-d, d + 1, 2):
+            x = _furthest(backward, offset + k, k, d)
+            y = x - k
+            x0, y0 = x, y
+            while x < n and y < m and a[a_hi - 1 - x] == b[b_hi - 1 - y]:
+                x += 1
+                y += 1
+            backward[offset + k] = x
+            if not odd and -d <= delta - k <= d and x + forward[offset + delta - k] >= n:
+                return a_hi - x, b_hi - y, a_hi - x0, b_hi - y0
+    raise AssertionError("no middle snake")
+
+
+def matching_blocks(a: list[int], b: list[int], deadline: float = math.inf) -> list[Block]:
+    """Find the equal runs of a longest common subsequence.
+
+    Ranges are split at their middle snake with an explicit stack, so deep
+    recursion is never needed.
+
+    Args:
+        a: Line ids of the original
+        b: Line ids of the modified text
+        deadline: time.monotonic() value after which to give up
+
+    Returns:
+        Runs of equal lines as (a_start, b_start, size), in order
+
+    Raises:
+        _DiffTimeout: If the deadline passed
+    """
+    blocks: list[Block] = []
+    stack: list[tuple[int, ...]] = [(0, len(a), 0, len(b))]
+    while stack:
+        item = stack.pop()
+        if len(item) == 3:
+            if item[2]:
+                blocks.append(item)  # type: ignore[arg-type]
+            continue
+        a_lo, a_hi, b_lo, b_hi = item
+        prefix = 0
+        while a_lo + prefix < a_hi and b_lo + prefix < b_hi and a[a_lo + prefix] == b[b_lo + prefix]:
+            prefix += 1
+        suffix = 0
+        while a_hi - suffix > a_lo + prefix and b_hi - suffix > b_lo + prefix and a[a_hi - suffix - 1] == b[b_hi - suffix - 1]:
+            suffix += 1
+        # Pushed in reverse, so blocks come out in order
+        stack.append((a_hi - suffix, b_hi - suffix, suffix))
+        a_lo, a_hi, b_lo, b_hi = a_lo + prefix, a_hi - suffix, b_lo + prefix, b_hi - suffix
+        if a_lo < a_hi and b_lo < b_hi:
+            x0, y0, x1, y1 = _middle_snake(a, a_lo, a_hi, b, b_lo, b_hi, deadline)
+            stack.append((x1, a_hi, y1, b_hi))
+            stack.append((x0, y0, x1 - x0))
+            stack.append((a_lo, x0, b_lo, y0))
+        stack.append((a_lo - prefix, b_lo - prefix, prefix))
+    return blocks
+
+
+def _split_lines(text: str) -> list[str]:
+    """Split text after each newline; unlike str.splitlines, other line breaks like \r or \f stay inside a line."""
+    lines = [line + "\n" for line in text.split("\n")]
+    last = lines.pop()
+    if last != "\n":
+        lines.append(last[:-1])
+    return lines
+
+
+def _changes(blocks: list[Block], n: int, m: int) -> list[Change]:
+    changes = []
+    i = j = 0
+    for a_start, b_start, size in blocks:
+        if a_start > i or b_start > j:
+            changes.append((i, a_start, j, b_start))
+        i, j = a_start + size, b_start + size
+    if i < n or j < m:
+        changes.append((i, n, j, m))
+    return changes
+
+
+def _format_range(start: int, stop: int) -> str:
+    length = stop - start
+    if length == 1:
+        return str(start + 1)
+    return f"{start + 1 if length else start},{length}"
+
+
+def _emit(out: list[str], tag: str, lines: list[str]) -> None:
+    for line in lines:
+        out.append(tag + line)
+        if not line.endswith("\n"):
+            out.append("\n" + NO_NEWLINE)
+
+
+def _hunk(a: list[str], b: list[str], changes: list[Change], context: int) -> str:
+    first, last = changes[0], changes[-1]
+    a_start = max(0, first[0] - context)
+    b_start = first[2] - (first[0] - a_start)
+    a_end = min(len(a), last[1] + context)
+    b_end = last[3] + (a_end - last[1])
+    out = [f"@@ -{_format_range(a_start, a_end)} +{_format_range(b_start, b_end)} @@\n"]
+    i = a_start
+    for a_lo, a_hi, b_lo, b_hi in changes:
+        _emit(out, " ", a[i:a_lo])
+        _emit(out, "-", a[a_lo:a_hi])
+        _emit(out, "+", b[b_lo:b_hi])
+        i = a_hi
+    _emit(out, " ", a[i:a_end])
+    return "".join(out)
+
+
+def _group(changes: list[Change], context: int) -> list[list[Change]]:
+    groups: list[list[Change]] = []
+    for change in changes:
+        # Changes whose context would touch or overlap share a hunk
+        if groups and change[0] - groups[-1][-1][1] <= 2 * context:
+            groups[-1].append(change)
+        else:
+            groups.append([change])
+    return groups
+
+
+def _summary(reason: str, n: int, m: int) -> str:
+    return f"[{reason}; original has {n} lines, modified has {m} lines]"
+
+
+def line_summary(original: str, modified: str, reason: str) -> str:
+    """Describe a change without diffing it.
+
+    Args:
+        original: Original text
+        modified: Modified text
+        reason: Why no diff is shown
+
+    Returns:
+        One-line summary of the line counts
+    """
+    return _summary(reason, len(_split_lines(original)), len(_split_lines(modified)))
+
+
+def _diff_blocks(a: list[str], b: list[str], prefix: int, suffix: int, deadline: float) -> list[Block]:
+    """Find the matching blocks of the lines between a common prefix and suffix."""
+    n, m = len(a), len(b)
+    ids: dict[str, int] = {}
+    a_ids = [ids.setdefault(line, len(ids)) for line in a[prefix : n - suffix]]
+    b_ids = [ids.setdefault(line, len(ids)) for line in b[prefix : m - suffix]]
+    # Lines found on one side only can never match, so they are left out of the search
+    a_set, b_set = set(a_ids), set(b_ids)
+    a_keep = [i for i, line_id in enumerate(a_ids) if line_id in b_set]
+    b_keep = [j for j, line_id in enumerate(b_ids) if line_id in a_set]
+    inner = matching_blocks([a_ids[i] for i in a_keep], [b_ids[j] for j in b_keep], deadline)
+
+    blocks = [(0, 0, prefix)]
+    for i, j, size in inner:
+        for offset in range(size):
+            a_start, b_start = a_keep[i + offset] + prefix, b_keep[j + offset] + prefix
+            last = blocks[-1]
+            if last[0] + last[2] == a_start and last[1] + last[2] == b_start:
+                blocks[-1] = (last[0], last[1], last[2] + 1)
+            else:
+                blocks.append((a_start, b_start, 1))
+    blocks.append((n - suffix, m - suffix, suffix))
+    return [block for block in blocks if block[2]]
+
+
+def unified_diff(original: str, modified: str, context: int = 3, max_bytes: int | None = None, timeout: float | None = None) -> str:
+    """Generate a unified diff between two texts.
+
+    The common prefix and suffix are trimmed first, the remaining lines are
+    mapped to integer ids, and a linear-space Myers diff runs on the ids. The
+    output matches `difflib.unified_diff`, except that lines end only at "\n"
+    and a missing final newline is marked, like git does.
+
+    Args:
+        original: Original text
+        modified: Modified text
+        context: Number of unchanged lines shown around each change
+        max_bytes: Maximum size of the diff; later hunks are left out
+        timeout: Seconds after which a summary is returned instead of a diff
+
+    Returns:
+        Unified diff, empty if the texts are equal
+    """
+    deadline = time.monotonic() + timeout if timeout is not None else math.inf
+    a = _split_lines(original)
+    b = _split_lines(modified)
+    n, m = len(a), len(b)
+    prefix = 0
+    while prefix < n and prefix < m and a[prefix] == b[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < n - prefix and suffix < m - prefix and a[n - suffix - 1] == b[m - suffix - 1]:
+        suffix += 1
+    if prefix == n == m:
+        return ""
+    try:
+        blocks = _diff_blocks(a, b, prefix, suffix, deadline)
+    except _DiffTimeout:
+        return _summary(f"diff not computed within {timeout:g}s", n, m)
+
+    out = ["--- original\n", "+++ modified\n"]
+    total = sum(len(line) for line in out)
+    groups = _group(_changes(blocks, n, m), context)
+    for index, group in enumerate(groups):
+        hunk = _hunk(a, b, group, context)
+        if max_bytes is not None:
+            total += len(hunk.encode())
+            if total > max_bytes:
+                out.append(f"[{len(groups) - index} more hunk(s) omitted]\n")
+                break
+        out.append(hunk)
+    return "".join(out)
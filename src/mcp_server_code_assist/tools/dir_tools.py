@@ -1,11 +1,18 @@
 """Directory operations and utilities."""
 
-import asyncio
+import fnmatch
+import heapq
+import json
 import os
-import sys
+import stat
+from collections.abc import Callable
+from datetime import datetime
 from pathlib import Path
+from typing import Any
 
 from mcp_server_code_assist.base_tools import BaseTools
+from mcp_server_code_assist.executors import run_io
+from mcp_server_code_assist.tools.models import DEFAULT_LIST_LIMIT, LIST_SORT_KEYS
 
 
 class DirTools(BaseTools):
@@ -50,29 +57,145 @@ class DirTools(BaseTools):
         """
         path = await self.validate_path(path)
         try:
-            path.mkdir(parents=True, exist_ok=True)
+            await run_io(path.mkdir, parents=True, exist_ok=True)
             return f"Created directory: {path}"
         except Exception as e:
             self.handle_error(e, {"operation": "create_directory", "path": str(path)})
 
-    async def list_directory(self, path: str) -> str:
-        """List contents of a directory using system ls/dir command.
+    async def list_directory(
+        self,
+        path: str,
+        sort: str = "name",
+        reverse: bool = False,
+        pattern: str | None = None,
+        offset: int = 0,
+        limit: int | None = DEFAULT_LIST_LIMIT,
+        structured: bool = False,
+    ) -> str:
+        """List one page of a directory's entries.
 
         Args:
             path: Directory path to list
+            sort: One of LIST_SORT_KEYS
+            reverse: Reverse the sort order
+            pattern: Only include entries whose name matches this glob
+            offset: Number of entries to skip
+            limit: Maximum number of entries returned
+            structured: Return the entries as JSON instead of ls-style text
 
         Returns:
-            Raw command output as string
+            ls-style listing with a paging summary, or JSON from list_directory_entries
         """
-        path = await self.validate_path(path)
-        if not path.is_dir():
-            raise ValueError(f"Path {path} is not a directory")
-
-        if sys.platform == "win32":
-            cmd = ["dir", path]
+        listing = await self.list_directory_entries(path, sort, reverse, pattern, offset, limit)
+        if structured:
+            return json.dumps(listing)
+        lines = [_format_entry(entry) for entry in listing["entries"]]
+        shown = len(listing["entries"])
+        if not shown and offset:
+            summary = f"offset {offset} is past the end of {listing['total']} entries"
+        elif shown == listing["total"]:
+            summary = f"{listing['total']} entries"
         else:
-            cmd = ["ls", "-la", path]
+            summary = f"entries {offset + 1}-{offset + shown} of {listing['total']}"
+        if listing["next_offset"] is not None:
+            summary += f", next offset {listing['next_offset']}"
+        return "\n".join([*lines, "", summary]) if lines else summary
+
+    async def list_directory_entries(
+        self,
+        path: str,
+        sort: str = "name",
+        reverse: bool = False,
+        pattern: str | None = None,
+        offset: int = 0,
+        limit: int | None = DEFAULT_LIST_LIMIT,
+    ) -> dict[str, Any]:
+        """List one page of a directory's entries in structured form.
+
+        The directory is read in-process with os.scandir. Entry types come from the
+        directory listing itself, so only the entries on the returned page are
+        stat()ed, unless the sort key is size or mtime.
+
+        Args:
+            path: Directory path to list
+            sort: One of LIST_SORT_KEYS; "type" lists directories first
+            reverse: Reverse the sort order
+            pattern: Only include entries whose name matches this glob
+            offset: Number of entries to skip
+            limit: Maximum number of entries returned
 
-        proc = await asyncio.create_subprocess_exec(*cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
-        stdout, _ = await proc.communicate()
-        return stdout.decode()
+        Returns:
+            Dict with "entries" (name, type, size, mtime, mode), "total" matching
+            entries and "next_offset", None on the last page
+
+        Raises:
+            ValueError: If the path is not a directory or sort is unknown
+        """
+        if sort not in LIST_SORT_KEYS:
+            raise ValueError(f"Invalid sort key: {sort}, expected one of {', '.join(LIST_SORT_KEYS)}")
+        path = await self.validate_path(path)
+        if not await run_io(path.is_dir):
+            raise ValueError(f"Path {path} is not a directory")
+        return await run_io(_list_page, path, sort, reverse, pattern, offset, limit)
+
+
+def _entry_type(entry: os.DirEntry) -> str:
+    if entry.is_symlink():
+        return "symlink"
+    if entry.is_dir(follow_symlinks=False):
+        return "directory"
+    if entry.is_file(follow_symlinks=False):
+        return "file"
+    return "other"
+
+
+def _stat(entry: os.DirEntry) -> os.stat_result | None:
+    try:
+        return entry.stat(follow_symlinks=False)
+    except OSError:
+        # Removed since the directory was read
+        return None
+
+
+def _sort_key(sort: str) -> Callable[[os.DirEntry], Any]:
+    if sort == "size":
+        return lambda entry: (getattr(_stat(entry), "st_size", -1), entry.name)
+    if sort == "mtime":
+        return lambda entry: (getattr(_stat(entry), "st_mtime_ns", -1), entry.name)
+    if sort == "type":
+        return lambda entry: (not entry.is_dir(follow_symlinks=False), entry.name)
+    return lambda entry: entry.name
+
+
+def _list_page(path: Path, sort: str, reverse: bool, pattern: str | None, offset: int, limit: int | None) -> dict[str, Any]:
+    with os.scandir(path) as it:
+        entries = list(it)
+    if pattern is not None:
+        names = set(fnmatch.filter([entry.name for entry in entries], pattern))
+        entries = [entry for entry in entries if entry.name in names]
+    total = len(entries)
+    key = _sort_key(sort)
+    end = total if limit is None else min(total, offset + limit)
+    if end < total:
+        # Only the first offset + limit entries need to be ordered
+        ordered = (heapq.nlargest if reverse else heapq.nsmallest)(end, entries, key=key)
+    else:
+        ordered = sorted(entries, key=key, reverse=reverse)
+    page = []
+    for entry in ordered[offset:end]:
+        info = _stat(entry)
+        page.append({
+            "name": entry.name,
+            "type": _entry_type(entry),
+            "size": info.st_size if info else None,
+            "mtime": info.st_mtime if info else None,
+            "mode": stat.filemode(info.st_mode) if info else None,
+        })
+    return {"entries": page, "total": total, "next_offset": end if end < total else None}
+
+
+def _format_entry(entry: dict[str, Any]) -> str:
+    mtime = datetime.fromtimestamp(entry["mtime"]).strftime("%Y-%m-%d %H:%M") if entry["mtime"] is not None else "?"
+    size = entry["size"] if entry["size"] is not None else "?"
+    suffix = "/" if entry["type"] == "directory" else ""
+    return f"{entry['mode'] or '?':<10} {size:>10} {mtime} {entry['name']}{suffix}"
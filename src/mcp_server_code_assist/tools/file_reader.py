@@ -0,0 +1,92 @@
+"""Ranged file reading that avoids loading large files into memory."""
+
+import mmap
+import os
+from pathlib import Path
+
+# Files at least this large are memory-mapped instead of read into memory.
+MMAP_THRESHOLD = 1024 * 1024
+# Newlines are counted in chunks of this size while locating line offsets.
+SCAN_CHUNK_SIZE = 1024 * 1024
+
+
+def _line_offset(buf: bytes | mmap.mmap, size: int, line: int, pos: int = 0, current_line: int = 1) -> int:
+    """Find the byte offset at which a line starts.
+
+    Newlines are counted chunk by chunk, so only the chunk containing the target
+    line is searched one newline at a time.
+
+    Args:
+        buf: File contents, either bytes or a memory map
+        size: Size of buf
+        line: 1-based line number to locate
+        pos: Offset to start scanning from
+        current_line: Line number that starts at pos
+
+    Returns:
+        Offset of the first byte of the line, or size if the file has fewer lines
+    """
+    while current_line < line and pos < size:
+        chunk_end = min(pos + SCAN_CHUNK_SIZE, size)
+        newlines = buf[pos:chunk_end].count(b"\n")
+        if current_line + newlines < line:
+            current_line += newlines
+            pos = chunk_end
+            continue
+        while current_line < line:
+            pos = buf.find(b"\n", pos, chunk_end) + 1
+            current_line += 1
+        return pos
+    return pos if current_line >= line else size
+
+
+def read_range(
+    path: Path,
+    start_line: int | None = None,
+    end_line: int | None = None,
+    byte_offset: int | None = None,
+    byte_length: int | None = None,
+    max_bytes: int | None = None,
+) -> tuple[str, int, int]:
+    """Read a byte or line range of a file.
+
+    Line numbers are 1-based and inclusive. Files of at least MMAP_THRESHOLD bytes
+    are memory-mapped, so only the requested range is paged in and decoded.
+
+    Args:
+        path: File to read
+        start_line: First line to read
+        end_line: Last line to read
+        byte_offset: First byte to read
+        byte_length: Number of bytes to read
+        max_bytes: Maximum number of bytes to return
+
+    Returns:
+        Tuple of (decoded text, number of bytes returned, bytes in the requested range)
+
+    Raises:
+        ValueError: If a line range and a byte range are both given
+    """
+    if (start_line is not None or end_line is not None) and (byte_offset is not None or byte_length is not None):
+        raise ValueError("Cannot combine a line range with a byte range")
+
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return "", 0, 0
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size >= MMAP_THRESHOLD else f.read()
+        try:
+            if start_line is not None or end_line is not None:
+                start = _line_offset(buf, size, start_line or 1)
+                end = _line_offset(buf, size, end_line + 1, start, start_line or 1) if end_line is not None else size
+            else:
+                start = min(byte_offset or 0, size)
+                end = min(start + byte_length, size) if byte_length is not None else size
+
+            requested = end - start
+            if max_bytes is not None:
+                end = min(end, start + max_bytes)
+            return buf[start:end].decode(errors="replace"), end - start, requested
+        finally:
+            if isinstance(buf, mmap.mmap):
+                buf.close()
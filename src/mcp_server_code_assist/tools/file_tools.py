@@ -1,14 +1,32 @@
-import difflib
+import asyncio
 import fnmatch
 import os
+import time
 from pathlib import Path
-
-import git
+from typing import Any
 
 from mcp_server_code_assist.base_tools import BaseTools
+from mcp_server_code_assist.executors import run_io
+from mcp_server_code_assist.tools.content_cache import ContentCache, get_content_cache
+from mcp_server_code_assist.tools.diff import line_summary, unified_diff
+from mcp_server_code_assist.tools.file_reader import read_range
+from mcp_server_code_assist.tools.file_writer import atomic_write, get_fsync_policy
+from mcp_server_code_assist.tools.ignore import get_ignore_matcher
+from mcp_server_code_assist.tools.models import DEFAULT_MAX_RESULTS, DEFAULT_READ_CONCURRENCY, DEFAULT_SEARCH_TIMEOUT, DiffOptions
+from mcp_server_code_assist.tools.replace import replace_all
+from mcp_server_code_assist.tools.repo_pool import get_repo_pool
+from mcp_server_code_assist.tools.search import compile_pattern, search_file
+from mcp_server_code_assist.tools.status_cache import get_status_cache
+from mcp_server_code_assist.tools.symbols import Symbol, get_symbol_index, is_source_file
+from mcp_server_code_assist.tools.tree_index import get_tree_index
+from mcp_server_code_assist.tools.trigram_index import get_trigram_index, mark_path_changed, required_literals
 
 
 class FileTools(BaseTools):
+    def __init__(self, allowed_paths: list[str] | None = None, content_cache: ContentCache | None = None):
+        super().__init__(allowed_paths)
+        self.content_cache = content_cache if content_cache is not None else get_content_cache()
+
     def is_valid_operation(self, path: Path) -> bool:
         """Validate if operation can be performed on path"""
         return path.exists() and path.is_file()
@@ -19,29 +37,113 @@ class FileTools(BaseTools):
             raise ValueError(f"Path {path} is outside allowed directories")
         return Path(abs_path)
 
-    async def read_file(self, path: str) -> str:
+    async def read_file(
+        self,
+        path: str,
+        start_line: int | None = None,
+        end_line: int | None = None,
+        byte_offset: int | None = None,
+        byte_length: int | None = None,
+        max_bytes: int | None = None,
+    ) -> str:
+        """Read a file, optionally limited to a line or byte range.
+
+        Args:
+            path: File path
+            start_line: First line to read (1-based, inclusive)
+            end_line: Last line to read (1-based, inclusive)
+            byte_offset: First byte to read
+            byte_length: Number of bytes to read
+            max_bytes: Maximum number of bytes to return; a truncation notice is appended when exceeded
+
+        Returns:
+            File content
+        """
         path = await self.validate_path(path)
         try:
-            return path.read_text()
+            if start_line is None and end_line is None and byte_offset is None and byte_length is None and max_bytes is None:
+                return await run_io(self._read_cached, path)
+            content, returned, requested = await run_io(read_range, path, start_line, end_line, byte_offset, byte_length, max_bytes)
         except Exception as e:
             self.handle_error(e, {"operation": "read", "path": str(path)})
+        if returned < requested:
+            content += f"\n[truncated: showing {returned} of {requested} bytes]"
+        return content
+
+    async def read_multiple_files(self, paths: list[str], max_concurrency: int = DEFAULT_READ_CONCURRENCY) -> dict[str, dict[str, str]]:
+        """Read many files concurrently.
+
+        All paths are validated up front; valid ones are then read with at most
+        max_concurrency reads in flight.
+
+        Args:
+            paths: File paths to read
+            max_concurrency: Maximum number of concurrent reads
+
+        Returns:
+            Mapping of each path, in input order, to {"content": ...} or {"error": ...}
+        """
+        results: dict[str, dict[str, str]] = {}
+        valid_paths = []
+        for path in dict.fromkeys(paths):
+            try:
+                valid_paths.append((path, await self.validate_path(path)))
+            except ValueError as e:
+                results[path] = {"error": str(e)}
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def read_one(path: str, resolved: Path) -> tuple[str, dict[str, str]]:
+            async with semaphore:
+                try:
+                    return path, {"content": await self.read_file(resolved)}
+                except Exception as e:
+                    return path, {"error": str(e)}
+
+        results.update(await asyncio.gather(*(read_one(path, resolved) for path, resolved in valid_paths)))
+        return {path: results[path] for path in dict.fromkeys(paths)}
 
     async def write_file(self, path: str, content: str) -> None:
         path = await self.validate_path(path)
         try:
-            path.parent.mkdir(parents=True, exist_ok=True)
-            path.write_text(content)
+            await run_io(self._write_text, path, content)
         except Exception as e:
             self.handle_error(e, {"operation": "write", "path": str(path)})
 
+    def _read_cached(self, path: Path) -> str:
+        resolved = os.path.realpath(path)
+        st = os.stat(resolved)
+        content = self.content_cache.get(resolved, st.st_mtime_ns, st.st_size)
+        if content is None:
+            content = path.read_text()
+            self.content_cache.put(resolved, st.st_mtime_ns, st.st_size, content)
+        return content
+
+    def cache_stats(self) -> dict[str, int | float]:
+        """Get content cache hit/miss counters and byte usage."""
+        return self.content_cache.stats()
+
+    def _write_text(self, path: Path, content: str) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            atomic_write(path, content.encode(), get_fsync_policy())
+        finally:
+            self.content_cache.invalidate(os.path.realpath(path))
+            get_status_cache().invalidate_path(path)
+            mark_path_changed(path)
+
     async def create_file(self, path: str, content: str = "") -> str:
         await self.write_file(path, content)
         return f"Created file: {path}"
 
     async def delete_file(self, path: str) -> str:
         path = await self.validate_path(path)
+        return await run_io(self._move_to_trash, path)
+
+    def _move_to_trash(self, path: Path) -> str:
         if not path.is_file():
             return f"Path not found: {path}"
+        self.content_cache.invalidate(os.path.realpath(path))
 
         # Create trash directory
         trash_dir = path.parent / ".mcp_server_code_assist_trash"
@@ -53,138 +155,266 @@ class FileTools(BaseTools):
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         trash_path = trash_dir / f"{path.name}_{timestamp}"
         path.rename(trash_path)
+        get_status_cache().invalidate_path(path)
+        mark_path_changed(path)
 
         return f"Moved file to trash: {trash_path}"
 
-    async def modify_file(self, path: str, replacements: dict[str, str]) -> str:
-        path = await self.validate_path(path)
-        content = await self.read_file(path)
-        original = content
+    async def modify_file(self, path: str, replacements: dict[str, str], strict: bool = False, diff_options: DiffOptions | None = None) -> str:
+        diff, _ = await self.modify_file_with_counts(path, replacements, strict, diff_options)
+        return diff
 
-        for old, new in replacements.items():
-            content = content.replace(old, new)
+    async def modify_file_with_counts(
+        self,
+        path: str,
+        replacements: dict[str, str],
+        strict: bool = False,
+        diff_options: DiffOptions | None = None,
+    ) -> tuple[str, dict[str, int]]:
+        """Replace literal strings in a file in a single pass.
 
-        await self.write_file(path, content)
-        return self.generate_diff(original, content)
+        Args:
+            path: File path
+            replacements: Mapping of old text to new text
+            strict: Fail unless every pattern matches exactly once
+            diff_options: How the returned diff is generated
+
+        Returns:
+            Tuple of (diff, number of replacements made per pattern)
+
+        Raises:
+            ValueError: If a pattern is empty, or strict is set and a pattern is
+                missing or ambiguous; the file is left unchanged
+        """
+        path = await self.validate_path(path)
+        original = await self.read_file(path)
+        content, counts = await run_io(replace_all, original, replacements, strict)
+        if content != original:
+            await self.write_file(path, content)
+        return await run_io(self.generate_diff, original, content, diff_options), counts
 
-    async def rewrite_file(self, path: str, content: str) -> str:
+    async def rewrite_file(self, path: str, content: str, diff_options: DiffOptions | None = None) -> str:
         path = await self.validate_path(path)
-        original = await self.read_file(path) if path.exists() else ""
+        original = await self.read_file(path) if await run_io(path.exists) else ""
         await self.write_file(path, content)
-        return self.generate_diff(original, content)
+        return await run_io(self.generate_diff, original, content, diff_options)
 
     @staticmethod
-    def generate_diff(original: str, modified: str) -> str:
-        diff = difflib.unified_diff(original.splitlines(keepends=True), modified.splitlines(keepends=True), fromfile="original", tofile="modified")
-        return "".join(diff)
+    def generate_diff(original: str, modified: str, options: DiffOptions | None = None) -> str:
+        """Generate a unified diff of an edit.
 
-    async def file_tree(self, path: str) -> tuple[str, int, int]:
+        Args:
+            original: Original content
+            modified: New content
+            options: Context size, output cap and time limit; defaults apply when omitted
+
+        Returns:
+            Unified diff, or a line count summary if the diff is disabled or timed out
+        """
+        options = options if options is not None else DiffOptions()
+        if not options.diff:
+            return line_summary(original, modified, "diff disabled")
+        return unified_diff(original, modified, options.diff_context, options.diff_max_bytes, options.diff_timeout)
+
+    async def file_tree(self, path: str) -> str:
         """Generate tree view of directory structure.
 
         Args:
             path: Root directory path
 
         Returns:
-            Tree view as string
+            Tree view as string, followed by a directory and file count summary
+        """
+        tree, dir_count, file_count = await self.file_tree_with_counts(path)
+        summary = f"{dir_count} directories, {file_count} files"
+        return f"{tree}\n\n{summary}" if tree else summary
+
+    async def file_tree_with_counts(self, path: str) -> tuple[str, int, int]:
+        """Generate tree view of directory structure along with its counts.
+
+        Git repositories are rendered from a prefix trie of `git ls-files`, so only
+        directories containing tracked files are listed. Other trees are walked once,
+        pruning directories excluded by `.gitignore` files or `.git/info/exclude`.
+        Results are served from a per-root TreeIndex that only re-reads directories
+        whose mtime changed.
+
+        Args:
+            path: Root directory path
+
+        Returns:
+            Tuple of (tree view, directory count, file count)
         """
         path = await self.validate_path(path)
-        base_path = path
-
-        # Try git tracking first
-        tracked_files = self._get_tracked_files(path)
-        gitignore = self._load_gitignore(path) if tracked_files is None else []
-
-        def gen_tree(path: Path, prefix: str = "") -> tuple[list[str], int, int]:
-            entries = []
-            dir_count = 0
-            file_count = 0
-
-            items = sorted(path.iterdir(), key=lambda x: (x.is_file(), x.name))
-            for i, item in enumerate(items):
-                rel_path = str(item.relative_to(base_path))
-
-                # Skip if file should be ignored
-                if tracked_files is not None:
-                    if rel_path not in tracked_files and not any(str(p.relative_to(base_path)) in tracked_files for p in item.rglob("*") if p.is_file()):
-                        continue
-                else:
-                    # Use gitignore
-                    if self._should_ignore(rel_path, gitignore):
-                        continue
-
-                is_last = i == len(items) - 1
-                curr_prefix = "└── " if is_last else "├── "
-                curr_line = prefix + curr_prefix + item.name
-
-                if item.is_dir():
-                    next_prefix = prefix + ("    " if is_last else "│   ")
-                    subtree, sub_dirs, sub_files = gen_tree(item, next_prefix)
-                    if tracked_files is not None and not subtree:
-                        continue
-                    entries.extend([curr_line] + subtree)
-                    dir_count += 1 + sub_dirs
-                    file_count += sub_files
-                else:
-                    if tracked_files is not None and rel_path not in tracked_files:
-                        continue
-                    entries.append(curr_line)
-                    file_count += 1
-
-            return entries, dir_count, file_count
-
-        tree_lines, _, _ = gen_tree(path)
-        return "\n".join(tree_lines)
-
-    def _should_ignore(self, path: str, patterns: list[str]) -> bool:
-        """Check if path matches gitignore patterns.
+        return await run_io(get_tree_index(path).file_tree, self._get_tracked_files, get_ignore_matcher(path))
+
+    async def search_code(
+        self,
+        path: str,
+        pattern: str,
+        literal: bool = False,
+        ignore_case: bool = False,
+        include: str | None = None,
+        context_lines: int = 0,
+        max_results: int = DEFAULT_MAX_RESULTS,
+        timeout: float = DEFAULT_SEARCH_TIMEOUT,
+        max_concurrency: int = DEFAULT_READ_CONCURRENCY,
+    ) -> dict[str, Any]:
+        """Search file contents under a directory.
+
+        Files are enumerated like file_tree: tracked files in a git repository, files
+        not excluded by gitignore rules otherwise. They are scanned in tree order on
+        the I/O pool with at most max_concurrency files in flight; binary files are
+        skipped. When trigram indexing is enabled, files that cannot contain the
+        pattern's literal parts are left out before scanning.
+
+        Args:
+            path: Root directory to search
+            pattern: Regular expression, or plain text if literal
+            literal: Match pattern as plain text
+            ignore_case: Match case-insensitively
+            include: Glob limiting the searched files, matched against the relative path or file name
+            context_lines: Number of lines shown before and after each match
+            max_results: Maximum number of matching lines returned
+            timeout: Seconds after which the search stops and returns what it found
+            max_concurrency: Maximum number of files scanned at the same time
+
+        Returns:
+            Dict with "matches" (path, line, text and context) in tree order,
+            "files_searched", and "truncated"/"timed_out" flags telling whether the
+            search stopped early
+        """
+        root = await self.validate_path(path)
+        regex = compile_pattern(pattern, literal, ignore_case)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        # Checked by search_file on the worker thread, so a slow pattern stops soon after the timeout
+        file_deadline = time.monotonic() + timeout
+        tree_files = files = await run_io(get_tree_index(root).files, self._get_tracked_files, get_ignore_matcher(root))
+        if include:
+            files = [f for f in files if fnmatch.fnmatch(f, include) or fnmatch.fnmatch(f.rpartition("/")[2], include)]
+        files = await self._index_candidates(root, tree_files, files, required_literals(pattern, literal))
+
+        results: dict[int, list[dict[str, Any]]] = {}
+        found = 0
+        searched = 0
+        next_index = 0
+        cut_short = False
+
+        async def worker() -> None:
+            nonlocal found, searched, next_index, cut_short
+            while next_index < len(files) and found < max_results and loop.time() < deadline:
+                index = next_index
+                next_index += 1
+                try:
+                    matches = await run_io(search_file, root / files[index], regex, context_lines, max_results, file_deadline)
+                except TimeoutError:
+                    cut_short = True
+                    return
+                except OSError:
+                    # Tracked files may be missing from the work tree
+                    continue
+                searched += 1
+                if matches:
+                    results[index] = matches
+                    found += len(matches)
+
+        workers = [asyncio.create_task(worker()) for _ in range(max(1, min(max_concurrency, len(files))))]
+        done, pending = await asyncio.wait(workers, timeout=max(0.0, deadline - loop.time()))
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        for task in done:
+            task.result()
+
+        # Files are handed out in order, so every file before the last one started has been searched
+        matches = [{"path": files[index], **match} for index in sorted(results) for match in results[index]]
+        return {
+            "matches": matches[:max_results],
+            "files_searched": searched,
+            "truncated": len(matches) > max_results or (len(matches) == max_results and next_index < len(files)),
+            "timed_out": bool(pending) or cut_short or (next_index < len(files) and found < max_results),
+        }
+
+    async def find_symbol(self, path: str, name: str, kind: str | None = None, exact: bool = True, max_results: int = DEFAULT_MAX_RESULTS) -> dict[str, Any]:
+        """Find definitions in the Python files under a directory.
 
         Args:
-            path: Path to check
-            patterns: List of gitignore patterns
+            path: Root directory to search
+            name: Symbol name or qualified name, e.g. "FileTools.read_file"
+            kind: Only return symbols of this kind: class, function, method or variable
+            exact: Match the name exactly; otherwise match a case-insensitive substring of the qualified name
+            max_results: Maximum number of definitions returned
 
         Returns:
-            True if path should be ignored
+            Dict with "symbols" (path, name, qualname, kind, line, end_line) in tree order and "truncated"
         """
-        if not patterns:
-            return False
-
-        parts = Path(path).parts
-        for pattern in patterns:
-            pattern = pattern.strip()
-            if not pattern or pattern.startswith("#"):
-                continue
-
-            if pattern.endswith("/"):
-                pattern = pattern.rstrip("/")
-                if pattern in parts:
-                    return True
-            else:
-                if fnmatch.fnmatch(parts[-1], pattern):  # Match basename
-                    return True
-                # Match full path
-                if fnmatch.fnmatch(path, pattern):
-                    return True
-
-        return False
-
-    def _load_gitignore(self, path: str) -> list[str]:
-        """Load gitignore patterns from a directory.
+        root = await self.validate_path(path)
+        needle = name.lower()
+        found = []
+        for rel_path, symbols in (await self._symbols_under(root)).items():
+            for symbol in symbols:
+                if kind is not None and symbol["kind"] != kind:
+                    continue
+                if name in (symbol["name"], symbol["qualname"]) if exact else needle in symbol["qualname"].lower():
+                    found.append({"path": rel_path, **symbol})
+        return {"symbols": found[:max_results], "truncated": len(found) > max_results}
+
+    async def symbol_outline(self, path: str) -> dict[str, list[Symbol]]:
+        """Outline the definitions of a Python file, or of every Python file under a directory.
 
         Args:
-            path: Directory containing .gitignore
+            path: File or directory path
 
         Returns:
-            List of gitignore patterns
+            Mapping of each file (relative to a directory, or as given for a file) to its symbols
         """
-        gitignore_path = os.path.join(path, ".gitignore")
-        patterns = []
-        if os.path.exists(gitignore_path):
-            with open(gitignore_path) as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith("#"):
-                        patterns.append(line)
-        return patterns
+        target = await self.validate_path(path)
+        if await run_io(target.is_dir):
+            return await self._symbols_under(target)
+        # A single file is looked up in its allowed root's index, which outlines of the root share
+        root = self._index_root(target.parent)
+        rel_path = target.relative_to(root).as_posix()
+        symbols = await get_symbol_index(root).update([rel_path], prune=False)
+        if rel_path not in symbols:
+            raise FileNotFoundError(f"File not found: {path}")
+        return {path: symbols[rel_path]}
+
+    async def _symbols_under(self, root: Path) -> dict[str, list[Symbol]]:
+        """Get the symbols of the Python files file_tree shows under root, re-parsing only changed files."""
+        files = await run_io(get_tree_index(root).files, self._get_tracked_files, get_ignore_matcher(root))
+        return await get_symbol_index(root).update([rel_path for rel_path in files if is_source_file(rel_path)])
+
+    async def _index_candidates(self, root: Path, tree_files: list[str], files: list[str], literals: list[str]) -> list[str]:
+        """Leave out the files the trigram index rules out, if indexing is enabled.
+
+        Args:
+            root: Searched directory
+            tree_files: All files under root, relative to it
+            files: Files to narrow down, relative to root
+            literals: Substrings every match contains
+
+        Returns:
+            Files that may match, in the given order
+        """
+        index_root = self._index_root(root)
+        index = get_trigram_index(index_root)
+        if index is None:
+            return files
+        # One index covers the whole allowed root, so it is refreshed with all of its files
+        if index_root != root:
+            tree_files = await run_io(get_tree_index(index_root).files, self._get_tracked_files, get_ignore_matcher(index_root))
+        index.schedule_refresh(tree_files)
+        prefix = "" if index_root == root else root.relative_to(index_root).as_posix() + "/"
+        candidates = await run_io(index.candidates, [prefix + f for f in files], literals)
+        return files if candidates is None else [f[len(prefix) :] for f in candidates]
+
+    def _index_root(self, root: Path) -> Path:
+        """Get the allowed directory containing root, whose trigram and symbol indexes cover it."""
+        for allowed in self.allowed_paths:
+            allowed_root = Path(os.path.abspath(allowed))
+            if root.is_relative_to(allowed_root):
+                return allowed_root
+        return root
 
     def _get_tracked_files(self, repo_path: str) -> set[str] | None:
         """Get set of tracked files in a git repository.
@@ -195,8 +425,10 @@ class FileTools(BaseTools):
         Returns:
             Set of tracked file paths or None if not a git repo
         """
+        import git
+
         try:
-            repo = git.Repo(repo_path)
-            return set(repo.git.ls_files().splitlines())
+            with get_repo_pool().repo(repo_path) as repo:
+                return set(filter(None, repo.git.ls_files("-z").split("\0")))
         except git.exc.InvalidGitRepositoryError:
             return None
@@ -0,0 +1,90 @@
+"""Atomic file writes with a configurable fsync policy."""
+
+import os
+import secrets
+import stat
+from pathlib import Path
+
+# "none" leaves flushing to the OS, "file" syncs the data before the rename, and
+# "file+dir" also syncs the directory so the rename itself survives a crash.
+FSYNC_POLICIES = ("none", "file", "file+dir")
+DEFAULT_FSYNC_POLICY = "file"
+
+
+def atomic_write(path: Path, data: bytes, fsync: str = DEFAULT_FSYNC_POLICY) -> None:
+    """Replace a file's content atomically.
+
+    The data is written to a temporary file in the same directory, which is then
+    renamed over the target, so readers see either the old or the new content.
+    An existing file keeps its permission bits; a new file gets the default
+    permissions for the process umask. Symlinks are written through to their
+    target.
+
+    Args:
+        path: File to write
+        data: New content
+        fsync: One of FSYNC_POLICIES
+
+    Raises:
+        ValueError: If fsync is not a known policy
+    """
+    if fsync not in FSYNC_POLICIES:
+        raise ValueError(f"Invalid fsync policy: {fsync}, expected one of {', '.join(FSYNC_POLICIES)}")
+    target = Path(os.path.realpath(path))
+    try:
+        mode = stat.S_IMODE(os.stat(target).st_mode)
+    except FileNotFoundError:
+        mode = None
+
+    tmp_path = target.parent / f".{target.name}.{secrets.token_hex(4)}.tmp"
+    # Created with 0o666 so the umask applies, like a plain open() would
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o666)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            if fsync != "none":
+                f.flush()
+                os.fsync(f.fileno())
+        if mode is not None:
+            os.chmod(tmp_path, mode)
+        os.replace(tmp_path, target)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    if fsync == "file+dir" and os.name != "nt":
+        dir_fd = os.open(target.parent, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+_fsync_policy = DEFAULT_FSYNC_POLICY
+
+
+def configure_fsync_policy(policy: str) -> None:
+    """Set the fsync policy of writes made through FileTools.
+
+    Args:
+        policy: One of FSYNC_POLICIES
+
+    Raises:
+        ValueError: If policy is not a known policy
+    """
+    global _fsync_policy
+    if policy not in FSYNC_POLICIES:
+        raise ValueError(f"Invalid fsync policy: {policy}, expected one of {', '.join(FSYNC_POLICIES)}")
+    _fsync_policy = policy
+
+
+def get_fsync_policy() -> str:
+    """Get the configured fsync policy.
+
+    Returns:
+        One of FSYNC_POLICIES
+    """
+    return _fsync_policy
@@ -1,43 +1,338 @@
 """Git operations and utilities."""
 
+import asyncio
+import json
+import os
+import re
+import weakref
+from collections.abc import Callable
 from pathlib import Path
-
-import git
+from typing import TYPE_CHECKING, Any, TypeVar
 
 from mcp_server_code_assist.base_tools import BaseTools
+from mcp_server_code_assist.executors import run_git
+from mcp_server_code_assist.tools.repo_pool import RepoPool, get_repo_pool
+from mcp_server_code_assist.tools.status_cache import StatusCache, get_status_cache, parse_porcelain_v2, status_stamp
+
+if TYPE_CHECKING:
+    import git
+
+T = TypeVar("T")
+
+# Commands that may refresh or write .git/index are serialized per repository
+INDEX_LOCK = "index"
+# Reading objects goes through the Repo's shared `git cat-file` pipe, which must not be used concurrently
+OBJECTS_LOCK = "objects"
+
+DIFF_MODES = ("patch", "stat", "numstat")
+NO_OPTIONAL_LOCKS = {"GIT_OPTIONAL_LOCKS": "0"}
+# Full SHA-1 or SHA-256 object name, as written into log cursors
+FULL_SHA = re.compile(r"[0-9a-f]{40}(?:[0-9a-f]{24})?")
+
+_repo_locks: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[tuple[str, str], asyncio.Lock]] = weakref.WeakKeyDictionary()
+
+
+def _repo_lock(repo_path: str, name: str) -> asyncio.Lock:
+    """Get a named per-repository lock for the running event loop."""
+    locks = _repo_locks.setdefault(asyncio.get_running_loop(), {})
+    key = (os.path.realpath(repo_path), name)
+    lock = locks.get(key)
+    if lock is None:
+        lock = locks[key] = asyncio.Lock()
+    return lock
+
+
+class _FilePatch:
+    """Patch lines of one file, leaving out hunks past the per-file limit."""
+
+    def __init__(self, max_hunks: int | None):
+        self.max_hunks = max_hunks
+        self.lines: list[bytes] = []
+        self.size = 0
+        self.hunks = 0
+        self.omitted = 0
+
+    def add(self, line: bytes) -> bool:
+        """Add a line of the file's patch.
+
+        Returns:
+            Whether the line was kept
+        """
+        if line.startswith(b"@@"):
+            self.hunks += 1
+            if self.max_hunks is not None and self.hunks > self.max_hunks:
+                self.omitted += 1
+        if self.max_hunks is not None and self.hunks > self.max_hunks:
+            return False
+        self.lines.append(line)
+        self.size += len(line)
+        return True
+
+    def finish(self) -> list[bytes]:
+        """Get the kept lines, with a notice if hunks were left out."""
+        if self.omitted:
+            return [*self.lines, f"[{self.omitted} more hunk(s) omitted]\n".encode()]
+        return self.lines
+
+
+def _bounded_diff(repo: "git.Repo", args: list[str], start_file: int, max_hunks_per_file: int | None, max_bytes: int | None) -> str:
+    """Stream `git diff` output, stopping once the byte budget is used up.
+
+    Args:
+        repo: Repository to diff
+        args: Arguments for `git diff`
+        start_file: Index of the first file to include
+        max_hunks_per_file: Maximum number of hunks kept per file
+        max_bytes: Maximum size of the returned patch
+
+    Returns:
+        Patch text, with a continuation notice if files were left out
+    """
+    proc = repo.git.diff(*args, as_process=True)
+    out: list[bytes] = []
+    total = 0
+    file_index = -1
+    current = _FilePatch(max_hunks_per_file)
+    next_file = None
+
+    for line in proc.stdout:
+        if line.startswith(b"diff --git "):
+            out.extend(current.finish())
+            total += current.size
+            file_index += 1
+            current = _FilePatch(max_hunks_per_file)
+        if file_index < start_file or not current.add(line):
+            continue
+        if max_bytes is not None and total + current.size > max_bytes:
+            if total == 0:
+                # A single file larger than the budget is cut short rather than skipped
+                out.append(b"".join(current.lines)[:max_bytes])
+                out.append(b"\n[file truncated]\n")
+                next_file = file_index + 1
+            else:
+                next_file = file_index
+            break
+    else:
+        out.extend(current.finish())
+
+    if next_file is None:
+        proc.wait()
+        return b"".join(out).decode(errors="replace")
+    proc.terminate()
+    return b"".join(out).decode(errors="replace") + f"\n[diff truncated: call again with cursor={next_file} for the remaining files]"
 
 
 class GitTools(BaseTools):
     """Tools for git operations."""
 
-    def __init__(self, allowed_paths: list[str] | None = None):
+    def __init__(self, allowed_paths: list[str] | None = None, repo_pool: RepoPool | None = None, status_cache: StatusCache | None = None):
         super().__init__(allowed_paths)
-        # Validate that all paths are git repositories
+        self.repo_pool = repo_pool if repo_pool is not None else get_repo_pool()
+        self.status_cache = status_cache if status_cache is not None else get_status_cache()
+        # Validate that all paths are git repositories; this also warms the pool
         if allowed_paths:
+            import git
+
             for path in allowed_paths:
                 try:
-                    git.Repo(path)
+                    self.repo_pool.validate(path)
                 except (git.exc.InvalidGitRepositoryError, git.exc.NoSuchPathError) as e:
                     raise ValueError(f"Invalid git repository path: {path}") from e
 
-    async def status(self, repo_path: str) -> str:
-        """Get git repository status."""
-        repo = git.Repo(repo_path)
-        return repo.git.status()
-
-    async def diff(self, repo_path: str, target: str | None = None) -> str:
-        """Show git diff."""
-        repo = git.Repo(repo_path)
-        return repo.git.diff(target) if target else repo.git.diff()
-
-    async def log(self, repo_path: str, max_count: int = 10) -> str:
-        """Show git commit history."""
-        repo = git.Repo(repo_path)
-        commits = list(repo.iter_commits(max_count=max_count))
-        log = []
-        for commit in commits:
-            log.append(f"Commit: {commit.hexsha}\nAuthor: {commit.author}\nDate: {commit.authored_datetime}\nMessage: {commit.message}\n")
-        return "\n".join(log)
+    async def _run(self, repo_path: str, func: Callable[["git.Repo"], T], lock: str | None = None) -> T:
+        """Run func with the pooled repository handle on the git worker pool.
+
+        Args:
+            repo_path: Path to git repository
+            func: Blocking callable receiving the git.Repo
+            lock: Name of a per-repository lock to hold while func runs, if any
+
+        Returns:
+            Return value of func
+        """
+
+        def call() -> T:
+            with self.repo_pool.repo(repo_path) as repo:
+                return func(repo)
+
+        if lock is None:
+            return await run_git(call)
+        async with _repo_lock(repo_path, lock):
+            return await run_git(call)
+
+    async def status(self, repo_path: str, structured: bool = False, refresh: bool = False) -> str:
+        """Get git repository status.
+
+        Results are cached until the index, HEAD or a ref changes, or a file in the
+        repository is written through FileTools.
+
+        Args:
+            repo_path: Path to git repository
+            structured: Return porcelain v2 entries as JSON instead of the human-readable text
+            refresh: Bypass the cache, e.g. after files were changed outside the server
+
+        Returns:
+            Status text, or JSON with "branch" and "entries"
+        """
+        if structured:
+            return json.dumps(await self.status_entries(repo_path, refresh))
+        return await self._run(repo_path, lambda repo: self._cached_status(repo, "text", refresh), INDEX_LOCK)
+
+    async def status_entries(self, repo_path: str, refresh: bool = False) -> dict[str, Any]:
+        """Get git repository status in a structured, porcelain v2 style form.
+
+        Args:
+            repo_path: Path to git repository
+            refresh: Bypass the cache
+
+        Returns:
+            Dict with "branch" headers (oid, head, upstream, ahead, behind) and "entries"
+        """
+        return await self._run(repo_path, lambda repo: self._cached_status(repo, "porcelain", refresh), INDEX_LOCK)
+
+    def _cached_status(self, repo: "git.Repo", kind: str, refresh: bool) -> Any:
+        generation = self.status_cache.generation(repo.working_dir)
+        stamp = status_stamp(repo.git_dir)
+        if not refresh:
+            cached = self.status_cache.get(repo.working_dir, stamp, kind)
+            if cached is not None:
+                return cached
+        for _ in range(2):
+            # Keep git status from rewriting .git/index to refresh stat data, which would change the stamp
+            if kind == "porcelain":
+                value = parse_porcelain_v2(repo.git.status("--porcelain=v2", "--branch", "-z", env=NO_OPTIONAL_LOCKS))
+            else:
+                value = repo.git.status(env=NO_OPTIONAL_LOCKS)
+            # Only cache a result if nothing changed the repository while it was computed
+            after = status_stamp(repo.git_dir)
+            if after == stamp:
+                self.status_cache.put(repo.working_dir, stamp, kind, value, generation)
+                break
+            stamp = after
+        return value
+
+    async def diff(
+        self,
+        repo_path: str,
+        target: str | None = None,
+        paths: list[str] | None = None,
+        mode: str = "patch",
+        max_hunks_per_file: int | None = None,
+        max_bytes: int | None = None,
+        cursor: str | None = None,
+    ) -> str:
+        """Show git diff, optionally filtered and bounded.
+
+        Args:
+            repo_path: Path to git repository
+            target: Revision or range to diff against
+            paths: Pathspecs limiting the diff
+            mode: "patch" for the full diff, "stat" or "numstat" for a summary
+            max_hunks_per_file: Maximum number of hunks shown per file, patch mode only
+            max_bytes: Maximum size of the returned patch, patch mode only
+            cursor: Cursor from a truncated diff, to continue with the next files
+
+        Returns:
+            Diff output; a truncated patch ends with a notice holding the next cursor
+
+        Raises:
+            ValueError: If the mode is unknown, the cursor is malformed, or bounds are given for a summary
+        """
+        if mode not in DIFF_MODES:
+            raise ValueError(f"Invalid diff mode: {mode}, expected one of {', '.join(DIFF_MODES)}")
+        if mode != "patch" and (max_hunks_per_file is not None or max_bytes is not None or cursor is not None):
+            raise ValueError("max_hunks_per_file, max_bytes and cursor only apply to mode 'patch'")
+        if cursor is not None and not cursor.isdigit():
+            raise ValueError(f"Invalid diff cursor: {cursor}")
+
+        args = [target] if target else []
+        if mode != "patch":
+            args.append(f"--{mode}")
+        if paths:
+            args.extend(["--", *paths])
+
+        if max_hunks_per_file is None and max_bytes is None and cursor is None:
+            return await self._run(repo_path, lambda repo: repo.git.diff(*args), INDEX_LOCK)
+        return await self._run(repo_path, lambda repo: _bounded_diff(repo, args, int(cursor or 0), max_hunks_per_file, max_bytes), INDEX_LOCK)
+
+    async def log(
+        self,
+        repo_path: str,
+        max_count: int = 10,
+        cursor: str | None = None,
+        rev: str | None = None,
+        path: str | None = None,
+        author: str | None = None,
+    ) -> str:
+        """Show one page of git commit history.
+
+        Commits are streamed lazily from `iter_commits`, so memory use is bounded by
+        the page size rather than the history length.
+
+        Args:
+            repo_path: Path to git repository
+            max_count: Number of commits per page
+            cursor: Cursor returned by a previous page; rev is ignored when given
+            rev: Revision to start from, defaults to HEAD
+            path: Only include commits touching this path
+            author: Only include commits whose author matches this pattern
+
+        Returns:
+            JSON with a "commits" list and a "next_cursor" for the following page, or null
+        """
+        return json.dumps(await self.log_page(repo_path, max_count, cursor, rev, path, author))
+
+    async def log_page(
+        self,
+        repo_path: str,
+        max_count: int = 10,
+        cursor: str | None = None,
+        rev: str | None = None,
+        path: str | None = None,
+        author: str | None = None,
+    ) -> dict[str, Any]:
+        """Get one page of commit history as structured records.
+
+        Args:
+            repo_path: Path to git repository
+            max_count: Number of commits per page
+            cursor: Cursor returned by a previous page
+            rev: Revision to start from, defaults to HEAD
+            path: Only include commits touching this path
+            author: Only include commits whose author matches this pattern
+
+        Returns:
+            Dict with "commits" records and "next_cursor"
+        """
+        if cursor:
+            start, _, skip_str = cursor.rpartition(":")
+            # The start commit is passed to git, so anything but an object name could be an option
+            if not FULL_SHA.fullmatch(start) or not skip_str.isdigit():
+                raise ValueError(f"Invalid log cursor: {cursor}")
+            skip = int(skip_str)
+        else:
+            start, skip = None, 0
+
+        def read_page(repo: "git.Repo") -> dict[str, Any]:
+            # Pin the first page's start commit so later pages are stable when new commits arrive
+            start_sha = start or repo.rev_parse(rev or "HEAD").hexsha
+            kwargs = {"author": author} if author else {}
+            commits = []
+            has_more = False
+            for commit in repo.iter_commits(["--end-of-options", start_sha], paths=path or "", max_count=max_count + 1, skip=skip, **kwargs):
+                if len(commits) == max_count:
+                    has_more = True
+                    break
+                commits.append({
+                    "sha": commit.hexsha,
+                    "author": commit.author.name,
+                    "email": commit.author.email,
+                    "date": commit.authored_datetime.isoformat(),
+                    "summary": commit.summary,
+                })
+            return {"commits": commits, "next_cursor": f"{start_sha}:{skip + max_count}" if has_more else None}
+
+        return await self._run(repo_path, read_page, OBJECTS_LOCK)
 
     async def show(self, repo_path: str, revision: str | None = None, format_str: str | None = None) -> str:
         """Show various types of git objects.
@@ -50,13 +345,12 @@ class GitTools(BaseTools):
         Returns:
             String output of git show command
         """
-        repo = git.Repo(repo_path)
         args = []
         if format_str:
             args.extend([f"--format={format_str}"])
         if revision:
             args.append(revision)
-        return repo.git.show(*args)
+        return await self._run(repo_path, lambda repo: repo.git.show(*args))
 
     async def is_valid_operation(self, path: Path) -> bool:
         """Validate if operation can be performed on path.
@@ -67,8 +361,10 @@ class GitTools(BaseTools):
         Returns:
             True if path exists and is a git repository
         """
+        import git
+
         try:
-            git.Repo(path)
+            self.repo_pool.validate(path)
             return True
-        except git.exc.InvalidGitRepositoryError:
+        except (git.exc.InvalidGitRepositoryError, git.exc.NoSuchPathError):
             return False
@@ -0,0 +1,274 @@
+"""Compiled gitignore matching for trees that are not git repositories."""
+
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from mcp_server_code_assist.tools.tree_index import FileStamp, file_stamp
+
+# Never listed, like git itself
+ALWAYS_IGNORED = frozenset({".git"})
+# At most this many roots keep an ignore matcher; the least recently used is dropped.
+MAX_IGNORE_MATCHERS = 16
+
+
+def _translate_bracket(pattern: str, start: int) -> tuple[str, int]:
+    """Translate the bracket expression at start, returning it with the index after it."""
+    n = len(pattern)
+    j = start + 1
+    if j < n and pattern[j] in "!^":
+        j += 1
+    if j < n and pattern[j] == "]":
+        j += 1
+    while j < n and pattern[j] != "]":
+        j += 1
+    if j >= n:
+        # An unclosed bracket is a literal
+        return re.escape("["), start + 1
+    body = pattern[start + 1 : j]
+    if body[0] in "!^":
+        body = "^" + body[1:]
+    return "[" + body.replace("\\", "\\\\") + "]", j + 1
+
+
+def translate_glob(pattern: str) -> str:
+    """Translate a gitignore glob into a regular expression.
+
+    `*` and `?` do not match "/", and `**` matches any number of directories when
+    it makes up a whole path component.
+
+    Args:
+        pattern: Glob without negation prefix or trailing slash
+
+    Returns:
+        Regular expression source for use with fullmatch
+    """
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            j = i + 1
+            if j < n and pattern[j] == "*" and (i == 0 or pattern[i - 1] == "/") and (j + 1 == n or pattern[j + 1] == "/"):
+                if j + 1 == n:
+                    out.append(".*")
+                    i = n
+                else:
+                    out.append("(?:.*/)?")
+                    i = j + 2
+                continue
+            while j < n and pattern[j] == "*":
+                j += 1
+            out.append("[^/]*")
+            i = j
+            continue
+        if c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            regex, i = _translate_bracket(pattern, i)
+            out.append(regex)
+            continue
+        elif c == "\\" and i + 1 < n:
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+            continue
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+def parse_pattern(line: str) -> tuple[str, bool, bool] | None:
+    """Parse one line of a gitignore file.
+
+    Args:
+        line: Line without its line terminator
+
+    Returns:
+        Tuple of (regex source, negated, directories only), or None for blank lines and comments
+    """
+    line = line.rstrip("\r")
+    while line.endswith(" ") and not line.endswith("\\ "):
+        line = line[:-1]
+    if not line or line.startswith("#"):
+        return None
+    negated = line.startswith("!")
+    if negated:
+        line = line[1:]
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+    # A slash anywhere but at the end anchors the pattern to the gitignore's directory
+    anchored = "/" in line
+    regex = translate_glob(line.removeprefix("/"))
+    return (regex if anchored else "(?:.*/)?" + regex), negated, dir_only
+
+
+class IgnoreRules:
+    """Patterns of one ignore file, compiled into a single regex.
+
+    Alternatives are ordered last pattern first, so the first alternative that
+    matches is the one git would apply. Each alternative is a named group whose
+    prefix tells whether it negates.
+    """
+
+    def __init__(self, lines: list[str]):
+        all_parts = []
+        file_parts = []
+        patterns = [parse_pattern(line) for line in lines]
+        for index in reversed(range(len(patterns))):
+            if patterns[index] is None:
+                continue
+            regex, negated, dir_only = patterns[index]
+            part = f"(?P<{'n' if negated else 'i'}{index}>{regex})"
+            all_parts.append(part)
+            if not dir_only:
+                file_parts.append(part)
+        self._dir_regex = re.compile("|".join(all_parts)) if all_parts else None
+        self._file_regex = re.compile("|".join(file_parts)) if file_parts else None
+
+    def match(self, rel_path: str, is_dir: bool) -> bool | None:
+        """Match a path relative to the ignore file's directory.
+
+        Args:
+            rel_path: '/'-separated relative path
+            is_dir: Whether the path is a directory
+
+        Returns:
+            True if ignored, False if re-included by a negation, None if no pattern matches
+        """
+        regex = self._dir_regex if is_dir else self._file_regex
+        if regex is None:
+            return None
+        m = regex.fullmatch(rel_path)
+        if m is None:
+            return None
+        return m.lastgroup[0] == "i"
+
+
+def _load_rules(path: str) -> IgnoreRules | None:
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            return IgnoreRules(f.read().splitlines())
+    except OSError:
+        return None
+
+
+class IgnoreMatcher:
+    """Gitignore matcher for one tree root.
+
+    Reads `.git/info/exclude` and the `.gitignore` of every directory, following
+    git's precedence: patterns in deeper files override those in parent
+    directories, which override the exclude file, and later lines override earlier
+    ones. Compiled rules are cached per directory and only re-read when the file
+    changes; each file is checked at most once between calls to refresh.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+        self._generation = 0
+        self._rules: dict[str, tuple[int, FileStamp, IgnoreRules | None]] = {}
+        self._lock = threading.Lock()
+
+    def refresh(self) -> None:
+        """Revalidate ignore files against the filesystem on their next use."""
+        self._generation += 1
+
+    def _rules_for(self, path: str) -> IgnoreRules | None:
+        generation = self._generation
+        cached = self._rules.get(path)
+        if cached is not None and cached[0] == generation:
+            return cached[2]
+        stamp = file_stamp(path)
+        if cached is not None and cached[1] == stamp:
+            rules = cached[2]
+        else:
+            rules = _load_rules(path) if stamp is not None else None
+        with self._lock:
+            self._rules[path] = (generation, stamp, rules)
+        return rules
+
+    def is_ignored(self, rel_path: str, is_dir: bool) -> bool:
+        """Check a path, assuming none of its parent directories is ignored.
+
+        This is the check to use while walking the tree top-down, pruning ignored
+        directories.
+
+        Args:
+            rel_path: '/'-separated path relative to the root
+            is_dir: Whether the path is a directory
+
+        Returns:
+            True if the path is ignored
+        """
+        parts = rel_path.split("/")
+        if parts[-1] in ALWAYS_IGNORED:
+            return True
+        # Deepest .gitignore first; the first file with a matching pattern decides
+        for depth in range(len(parts) - 1, -1, -1):
+            base = "/".join(parts[:depth])
+            rules = self._rules_for(os.path.join(self.root, base, ".gitignore"))
+            if rules is not None:
+                decision = rules.match("/".join(parts[depth:]), is_dir)
+                if decision is not None:
+                    return decision
+        rules = self._rules_for(os.path.join(self.root, ".git", "info", "exclude"))
+        return bool(rules is not None and rules.match(rel_path, is_dir))
+
+    def is_path_ignored(self, rel_path: str, is_dir: bool = False) -> bool:
+        """Check a path, including whether one of its parent directories is ignored.
+
+        Args:
+            rel_path: '/'-separated path relative to the root
+            is_dir: Whether the path is a directory
+
+        Returns:
+            True if the path or one of its parents is ignored
+        """
+        parts = rel_path.split("/")
+        for depth in range(1, len(parts)):
+            if self.is_ignored("/".join(parts[:depth]), True):
+                return True
+        return self.is_ignored(rel_path, is_dir)
+
+    def sources(self) -> dict[str, FileStamp]:
+        """Get the ignore files consulted so far with their stamps.
+
+        Missing .gitignore files are left out since creating one changes its
+        directory's mtime; the exclude file is always included.
+
+        Returns:
+            Dict mapping file path to the stamp its rules were read at
+        """
+        exclude = os.path.join(self.root, ".git", "info", "exclude")
+        with self._lock:
+            return {path: stamp for path, (_, stamp, _) in self._rules.items() if stamp is not None or path == exclude}
+
+
+_matchers: OrderedDict[Path, IgnoreMatcher] = OrderedDict()
+_matchers_lock = threading.Lock()
+
+
+def get_ignore_matcher(root: Path) -> IgnoreMatcher:
+    """Get or create the IgnoreMatcher for a root directory.
+
+    Only the MAX_IGNORE_MATCHERS most recently used matchers are kept.
+
+    Args:
+        root: Absolute root directory path
+
+    Returns:
+        IgnoreMatcher shared by all FileTools instances
+    """
+    with _matchers_lock:
+        matcher = _matchers.get(root)
+        if matcher is None:
+            matcher = _matchers[root] = IgnoreMatcher(root)
+            while len(_matchers) > MAX_IGNORE_MATCHERS:
+                _matchers.popitem(last=False)
+        else:
+            _matchers.move_to_end(root)
+        return matcher
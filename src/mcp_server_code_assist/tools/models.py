@@ -1,6 +1,15 @@
 from pathlib import Path
+from typing import Any, Literal
 
-from pydantic import BaseModel
+from pydantic import AliasChoices, BaseModel, Field, model_validator
+
+DEFAULT_READ_CONCURRENCY = 16
+DEFAULT_MAX_RESULTS = 100
+DEFAULT_SEARCH_TIMEOUT = 10.0
+DEFAULT_DIFF_CONTEXT = 3
+DEFAULT_DIFF_TIMEOUT = 2.0
+DEFAULT_LIST_LIMIT = 1000
+LIST_SORT_KEYS = ("name", "type", "size", "mtime")
 
 
 # File operations
@@ -14,16 +23,65 @@ class FileDelete(BaseModel):
     path: str | Path
 
 
-class FileModify(BaseModel):
+class DiffOptions(BaseModel):
+    diff: bool = Field(default=True, description="Return a diff of the change; otherwise only a line count summary")
+    diff_context: int = Field(default=DEFAULT_DIFF_CONTEXT, ge=0, description="Unchanged lines shown around each change")
+    diff_max_bytes: int | None = Field(default=None, ge=1, description="Maximum size of the returned diff")
+    diff_timeout: float | None = Field(default=DEFAULT_DIFF_TIMEOUT, gt=0, description="Seconds after which a summary is returned instead of a diff")
+
+
+class FileModify(DiffOptions):
     path: str | Path
     replacements: dict[str, str]
+    strict: bool = False
 
 
 class FileRead(BaseModel):
     path: str | Path
+    start_line: int | None = Field(default=None, ge=1, description="First line to read (1-based, inclusive)")
+    end_line: int | None = Field(default=None, ge=1, description="Last line to read (1-based, inclusive)")
+    byte_offset: int | None = Field(default=None, ge=0, description="First byte to read")
+    byte_length: int | None = Field(default=None, ge=0, description="Number of bytes to read")
+    max_bytes: int | None = Field(default=None, ge=1, description="Maximum number of bytes to return")
+
+    @model_validator(mode="after")
+    def check_range(self) -> "FileRead":
+        if (self.start_line is not None or self.end_line is not None) and (self.byte_offset is not None or self.byte_length is not None):
+            raise ValueError("Cannot combine a line range with a byte range")
+        if self.start_line is not None and self.end_line is not None and self.end_line < self.start_line:
+            raise ValueError("end_line must not be before start_line")
+        return self
+
+
+class FileReadMultiple(BaseModel):
+    paths: list[str | Path]
+    max_concurrency: int = Field(default=DEFAULT_READ_CONCURRENCY, ge=1, description="Maximum number of files read at the same time")
+
+
+class SearchCode(BaseModel):
+    path: str | Path
+    pattern: str = Field(description="Regular expression to search for")
+    literal: bool = Field(default=False, description="Match pattern as plain text instead of a regular expression")
+    ignore_case: bool = Field(default=False, description="Match case-insensitively")
+    include: str | None = Field(default=None, description="Glob limiting the searched files, e.g. '*.py'")
+    context_lines: int = Field(default=0, ge=0, description="Number of lines shown before and after each match")
+    max_results: int = Field(default=DEFAULT_MAX_RESULTS, ge=1, description="Maximum number of matching lines returned")
+    timeout: float = Field(default=DEFAULT_SEARCH_TIMEOUT, gt=0, description="Seconds after which the search returns what it found so far")
+
+
+class FindSymbol(BaseModel):
+    path: str | Path
+    name: str = Field(description="Symbol name or qualified name, e.g. 'FileTools.read_file'")
+    kind: Literal["class", "function", "method", "variable"] | None = Field(default=None, description="Only return symbols of this kind")
+    exact: bool = Field(default=True, description="Match the name exactly; otherwise match a case-insensitive substring of the qualified name")
+    max_results: int = Field(default=DEFAULT_MAX_RESULTS, ge=1, description="Maximum number of definitions returned")
 
 
-class FileRewrite(BaseModel):
+class SymbolOutline(BaseModel):
+    path: str | Path
+
+
+class FileRewrite(DiffOptions):
     path: str | Path
     content: str
 
@@ -36,6 +94,12 @@ class FileTree(BaseModel):
 # ====================================================================
 class ListDirectory(BaseModel):
     path: str | Path
+    sort: Literal["name", "type", "size", "mtime"] = Field(default="name", description="Sort key; type lists directories first")
+    reverse: bool = Field(default=False, description="Reverse the sort order")
+    pattern: str | None = Field(default=None, description="Only list entries whose name matches this glob")
+    offset: int = Field(default=0, ge=0, description="Number of entries to skip, e.g. next_offset of the previous page")
+    limit: int | None = Field(default=DEFAULT_LIST_LIMIT, ge=1, description="Maximum number of entries returned")
+    structured: bool = Field(default=False, description="Return JSON entries (name, type, size, mtime, mode) instead of text")
 
 
 class CreateDirectory(BaseModel):
@@ -50,24 +114,54 @@ class GitBase(BaseModel):
 
 class GitDiff(BaseModel):
     repo_path: str
-    target: str
+    target: str = ""
+    paths: list[str] | None = Field(default=None, description="Pathspecs limiting the diff")
+    mode: Literal["patch", "stat", "numstat"] = Field(default="patch", description="Full patch, or a stat/numstat summary")
+    max_hunks_per_file: int | None = Field(default=None, ge=1, description="Maximum number of hunks shown per file; patch mode only")
+    max_bytes: int | None = Field(default=None, ge=1, description="Maximum size of the returned patch; patch mode only")
+    cursor: str | None = Field(default=None, description="Cursor from a truncated diff, to fetch the next files; patch mode only")
+
+    @model_validator(mode="after")
+    def check_bounds(self) -> "GitDiff":
+        if self.mode != "patch" and (self.max_hunks_per_file is not None or self.max_bytes is not None or self.cursor is not None):
+            raise ValueError("max_hunks_per_file, max_bytes and cursor only apply to mode 'patch'")
+        return self
 
 
 class GitShow(BaseModel):
     repo_path: str
-    revision: str
+    revision: str = Field(validation_alias=AliasChoices("revision", "commit"), description="Commit or other revision to show")
 
 
 class GitLog(BaseModel):
     repo_path: str
-    max_count: int = 10
+    max_count: int = Field(default=10, ge=1, description="Number of commits per page")
+    cursor: str | None = Field(default=None, description="next_cursor from a previous page; repeat the same path and author filters")
+    rev: str | None = Field(default=None, description="Revision to start from, defaults to HEAD")
+    path: str | None = Field(default=None, description="Only include commits touching this path")
+    author: str | None = Field(default=None, description="Only include commits whose author matches this pattern")
 
 
 class GitStatus(BaseModel):
     repo_path: str
+    structured: bool = Field(default=False, description="Return porcelain v2 style JSON entries instead of text")
+    refresh: bool = Field(default=False, description="Bypass the status cache, e.g. after files changed outside the server")
 
 
 class RepositoryOperation(BaseModel):
     path: str
     content: str | None = None
     replacements: dict[str, str] | None = None
+
+
+# Server operations
+# ====================================================================
+class ServerStats(BaseModel):
+    reset: bool = Field(default=False, description="Clear the per-tool counters after reading them")
+
+
+# Batch operations
+# ====================================================================
+class InstructionBatch(BaseModel):
+    repo_path: str
+    instructions: list[dict[str, Any]] = Field(description="Instruction dicts with a 'type' key, e.g. read_file, modify_file or git_status, and its arguments")
@@ -0,0 +1,49 @@
+"""Single-pass replacement of many literal strings."""
+
+import functools
+import re
+
+
+@functools.lru_cache(maxsize=128)
+def _compile(patterns: tuple[str, ...]) -> re.Pattern[str]:
+    # Longest first, so a pattern that is a prefix of another never shadows it
+    return re.compile("|".join(re.escape(pattern) for pattern in sorted(patterns, key=len, reverse=True)))
+
+
+def replace_all(content: str, replacements: dict[str, str], strict: bool = False) -> tuple[str, dict[str, int]]:
+    """Apply literal replacements in one scan of the content.
+
+    All patterns are matched by one combined regex, leftmost first and longest
+    first at the same position. Text inserted by a replacement is never matched
+    again, so the result does not depend on the order of replacements.
+
+    Args:
+        content: Text to edit
+        replacements: Mapping of old text to new text
+        strict: Require every pattern to match exactly once
+
+    Returns:
+        Tuple of (new content, number of replacements made per pattern)
+
+    Raises:
+        ValueError: If a pattern is empty, or strict is set and a pattern is missing or matches more than once
+    """
+    if "" in replacements:
+        raise ValueError("Replacement pattern must not be empty")
+    counts = dict.fromkeys(replacements, 0)
+    if not replacements:
+        return content, counts
+
+    def substitute(match: re.Match[str]) -> str:
+        old = match.group()
+        counts[old] += 1
+        return replacements[old]
+
+    result = _compile(tuple(replacements)).sub(substitute, content)
+    if strict:
+        missing = [old for old, count in counts.items() if count == 0]
+        ambiguous = [old for old, count in counts.items() if count > 1]
+        if missing or ambiguous:
+            problems = [f"not found: {old!r}" for old in missing] + [f"found {counts[old]} times: {old!r}" for old in ambiguous]
+            raise ValueError("Replacements must match exactly once; " + "; ".join(problems))
+    return result, counts
@@ -0,0 +1,172 @@
+"""Pool of long-lived GitPython repository handles."""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Generator
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import git
+
+DEFAULT_IDLE_TIMEOUT = 300.0
+DEFAULT_MAX_REPOS = 32
+
+
+class PooledRepo:
+    """A pooled repository handle with its usage bookkeeping."""
+
+    def __init__(self, repo: "git.Repo"):
+        self.repo = repo
+        self.in_use = 0
+        self.last_used = time.monotonic()
+
+
+class RepoPool:
+    """Pool of `git.Repo` objects keyed by resolved repository path.
+
+    Opening a Repo discovers `.git` and may start persistent `git cat-file`
+    helper processes, so handles are reused across calls. Handles idle for longer
+    than idle_timeout, or beyond max_repos, are closed to reap those processes;
+    this is checked whenever a handle is borrowed or returned.
+    """
+
+    def __init__(self, idle_timeout: float = DEFAULT_IDLE_TIMEOUT, max_repos: int = DEFAULT_MAX_REPOS):
+        self.idle_timeout = idle_timeout
+        self.max_repos = max_repos
+        self.opened = 0
+        self.reused = 0
+        self._repos: OrderedDict[str, PooledRepo] = OrderedDict()
+        self._validated: set[str] = set()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def repo(self, repo_path: str | os.PathLike) -> Generator["git.Repo", None, None]:
+        """Borrow the pooled handle of a repository.
+
+        Args:
+            repo_path: Path to the repository root
+
+        Yields:
+            Shared git.Repo handle, kept open while borrowed
+
+        Raises:
+            git.exc.InvalidGitRepositoryError: If the path is not a repository root
+            git.exc.NoSuchPathError: If the path does not exist
+        """
+        entry = self._acquire(os.path.realpath(repo_path))
+        try:
+            yield entry.repo
+        finally:
+            with self._lock:
+                entry.in_use -= 1
+                entry.last_used = time.monotonic()
+            self.evict_idle()
+
+    def _acquire(self, key: str) -> PooledRepo:
+        # Also reaps repositories that are never borrowed again
+        self.evict_idle()
+        with self._lock:
+            entry = self._repos.get(key)
+            if entry is not None:
+                self._repos.move_to_end(key)
+                entry.in_use += 1
+                self.reused += 1
+                return entry
+
+        # Open outside the lock; failures are not cached. GitPython is imported on first use to keep startup fast
+        import git
+
+        repo = git.Repo(key)
+        with self._lock:
+            entry = self._repos.get(key)
+            if entry is None:
+                entry = self._repos[key] = PooledRepo(repo)
+                self.opened += 1
+            else:
+                repo.close()
+            self._repos.move_to_end(key)
+            entry.in_use += 1
+            return entry
+
+    def validate(self, repo_path: str | os.PathLike) -> None:
+        """Open a repository into the pool, raising if it is not a repository.
+
+        Validations are remembered until the repository's handle is evicted, so
+        only the first call after that opens it again.
+
+        Args:
+            repo_path: Path to the repository root
+        """
+        key = os.path.realpath(repo_path)
+        if key in self._validated:
+            return
+        with self.repo(key), self._lock:
+            # Added while borrowed, so an eviction on release also forgets it
+            self._validated.add(key)
+
+    def evict_idle(self, now: float | None = None) -> int:
+        """Close handles that are idle too long or exceed the pool size.
+
+        Args:
+            now: Current monotonic time, defaults to time.monotonic()
+
+        Returns:
+            Number of handles closed
+        """
+        now = time.monotonic() if now is None else now
+        evicted = []
+        with self._lock:
+            excess = len(self._repos) - self.max_repos
+            for key, entry in list(self._repos.items()):
+                if entry.in_use:
+                    continue
+                if excess > 0 or now - entry.last_used > self.idle_timeout:
+                    evicted.append(self._repos.pop(key))
+                    self._validated.discard(key)
+                    excess -= 1
+        for entry in evicted:
+            entry.repo.close()
+        return len(evicted)
+
+    def close_all(self) -> None:
+        """Close every pooled handle."""
+        with self._lock:
+            entries = list(self._repos.values())
+            self._repos.clear()
+        for entry in entries:
+            entry.repo.close()
+
+    def stats(self) -> dict[str, int]:
+        """Get pool counters.
+
+        Returns:
+            Dict with open handle count and opened/reused totals
+        """
+        with self._lock:
+            return {"repos": len(self._repos), "opened": self.opened, "reused": self.reused}
+
+
+_repo_pool: RepoPool | None = None
+_repo_pool_lock = threading.Lock()
+
+
+def get_repo_pool() -> RepoPool:
+    """Get the repository pool shared by all tools.
+
+    Returns:
+        RepoPool created on first use
+    """
+    global _repo_pool
+    with _repo_pool_lock:
+        if _repo_pool is None:
+            _repo_pool = RepoPool()
+        return _repo_pool
+
+
+def close_repo_pool() -> None:
+    """Close all handles of the shared pool, if it was created."""
+    if _repo_pool is not None:
+        _repo_pool.close_all()
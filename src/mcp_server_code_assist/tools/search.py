@@ -0,0 +1,163 @@
+"""Regex search over file contents."""
+
+import math
+import mmap
+import os
+import re
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+from mcp_server_code_assist.tools.file_reader import MMAP_THRESHOLD, SCAN_CHUNK_SIZE
+
+# Files with a NUL byte in their first BINARY_SNIFF_BYTES bytes are treated as binary, like git does.
+BINARY_SNIFF_BYTES = 8000
+# Matched and context lines are cut to this many bytes, so minified files stay bounded.
+MAX_LINE_BYTES = 500
+# Files are matched in windows of about this many bytes, ending at a line break, so a deadline is checked often.
+SEARCH_WINDOW_BYTES = 64 * 1024
+
+
+def compile_pattern(pattern: str, literal: bool = False, ignore_case: bool = False) -> re.Pattern[bytes]:
+    """Compile a search pattern for matching raw file bytes.
+
+    Args:
+        pattern: Regular expression, or plain text if literal
+        literal: Match pattern as plain text
+        ignore_case: Match case-insensitively
+
+    Returns:
+        Compiled bytes pattern; ^ and $ match at line boundaries
+
+    Raises:
+        ValueError: If the pattern is not a valid regular expression
+    """
+    source = re.escape(pattern) if literal else pattern
+    flags = re.MULTILINE | (re.IGNORECASE if ignore_case else 0)
+    try:
+        return re.compile(source.encode(), flags)
+    except re.error as e:
+        raise ValueError(f"Invalid search pattern: {e}") from e
+
+
+def _line_text(buf: bytes | mmap.mmap, start: int, end: int) -> str:
+    line = buf[start : min(end, start + MAX_LINE_BYTES)].decode(errors="replace").rstrip("\r")
+    return line + "…" if end - start > MAX_LINE_BYTES else line
+
+
+def _line_end(buf: bytes | mmap.mmap, pos: int, size: int) -> int:
+    end = buf.find(b"\n", pos)
+    return size if end == -1 else end
+
+
+def _count_newlines(buf: bytes | mmap.mmap, start: int, end: int) -> int:
+    if isinstance(buf, bytes):
+        return buf.count(b"\n", start, end)
+    # mmap has no count(); count chunk by chunk so large gaps are not copied at once
+    count = 0
+    for pos in range(start, end, SCAN_CHUNK_SIZE):
+        count += buf[pos : min(pos + SCAN_CHUNK_SIZE, end)].count(b"\n")
+    return count
+
+
+def _context(buf: bytes | mmap.mmap, start: int, end: int, size: int, count: int) -> tuple[list[str], list[str]]:
+    """Get up to count lines before and after the line spanning start to end."""
+    before = []
+    pos = start
+    while len(before) < count and pos > 0:
+        prev_start = buf.rfind(b"\n", 0, pos - 1) + 1
+        before.append(_line_text(buf, prev_start, pos - 1))
+        pos = prev_start
+    after = []
+    pos = end
+    while len(after) < count and pos + 1 < size:
+        next_end = _line_end(buf, pos + 1, size)
+        after.append(_line_text(buf, pos + 1, next_end))
+        pos = next_end
+    return before[::-1], after
+
+
+def _windows(buf: bytes | mmap.mmap, size: int) -> Iterator[tuple[int, int]]:
+    start = 0
+    while start < size:
+        end = buf.find(b"\n", min(start + SEARCH_WINDOW_BYTES, size))
+        end = size if end == -1 else end + 1
+        yield start, end
+        start = end
+
+
+def _match_starts(buf: bytes | mmap.mmap, size: int, regex: re.Pattern[bytes], deadline: float) -> Iterator[int]:
+    """Yield the start of each match, window by window, checking the deadline between regex calls."""
+    for window_start, window_end in _windows(buf, size):
+        if time.monotonic() > deadline:
+            raise TimeoutError("Search deadline passed")
+        for m in regex.finditer(buf, window_start, window_end):
+            yield m.start()
+            if time.monotonic() > deadline:
+                raise TimeoutError("Search deadline passed")
+
+
+def search_file(
+    path: Path,
+    regex: re.Pattern[bytes],
+    context_lines: int = 0,
+    max_matches: int | None = None,
+    deadline: float = math.inf,
+) -> list[dict[str, Any]] | None:
+    """Search one file, reporting each matching line once.
+
+    Files of at least MMAP_THRESHOLD bytes are memory-mapped, and line numbers are
+    counted incrementally between matches, so the file is never split into lines.
+    The regex runs over windows of SEARCH_WINDOW_BYTES that end at line breaks,
+    so a match spans at most one window, and the deadline is checked between
+    windows and matches.
+
+    Args:
+        path: File to search
+        regex: Pattern from compile_pattern
+        context_lines: Number of lines shown before and after each match
+        max_matches: Stop after this many matching lines
+        deadline: time.monotonic() value after which to give up
+
+    Returns:
+        Matches with 1-based "line", "text" and "before"/"after" context lines,
+        or None if the file is binary
+
+    Raises:
+        TimeoutError: If the deadline passed before the file was searched
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return []
+        if b"\0" in f.read(BINARY_SNIFF_BYTES):
+            return None
+        if size >= MMAP_THRESHOLD:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            f.seek(0)
+            buf = f.read()
+        try:
+            matches = []
+            line = 1
+            counted_to = 0
+            next_line_start = 0
+            for match_start in _match_starts(buf, size, regex, deadline):
+                if match_start < next_line_start:
+                    continue
+                line += _count_newlines(buf, counted_to, match_start)
+                counted_to = match_start
+                start = buf.rfind(b"\n", 0, match_start) + 1
+                end = _line_end(buf, match_start, size)
+                match: dict[str, Any] = {"line": line, "text": _line_text(buf, start, end)}
+                if context_lines:
+                    match["before"], match["after"] = _context(buf, start, end, size, context_lines)
+                matches.append(match)
+                if max_matches is not None and len(matches) >= max_matches:
+                    break
+                next_line_start = end + 1
+            return matches
+        finally:
+            if isinstance(buf, mmap.mmap):
+                buf.close()
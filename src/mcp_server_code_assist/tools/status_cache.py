@@ -0,0 +1,177 @@
+"""Per-repository cache of git status results."""
+
+import os
+import threading
+from typing import Any
+
+from mcp_server_code_assist.tools.tree_index import file_stamp
+
+
+def status_stamp(git_dir: str) -> tuple:
+    """Get a change detector for the state git status depends on in .git.
+
+    Covers the index, HEAD, packed-refs and every directory under refs/; loose ref
+    updates are renamed into place, which changes their directory's mtime.
+
+    Args:
+        git_dir: Path to the repository's .git directory
+
+    Returns:
+        Hashable stamp that changes when the index, HEAD or any ref changes
+    """
+    refs = []
+    for dir_path, _, _ in os.walk(os.path.join(git_dir, "refs")):
+        refs.append((dir_path, file_stamp(dir_path)))
+    head = os.path.join(git_dir, "HEAD")
+    return (file_stamp(os.path.join(git_dir, "index")), file_stamp(head), _read_small(head), file_stamp(os.path.join(git_dir, "packed-refs")), tuple(refs))
+
+
+def _read_small(path: str) -> bytes | None:
+    try:
+        with open(path, "rb") as f:
+            return f.read(1024)
+    except OSError:
+        return None
+
+
+def parse_porcelain_v2(output: str) -> dict[str, Any]:
+    """Parse `git status --porcelain=v2 --branch -z` output.
+
+    Args:
+        output: NUL-separated porcelain v2 output
+
+    Returns:
+        Dict with "branch" headers and a list of "entries"
+    """
+    branch: dict[str, Any] = {}
+    entries = []
+    fields = iter(output.split("\0"))
+    for field in fields:
+        if not field:
+            continue
+        kind = field[0]
+        if kind == "#":
+            name, _, value = field[2:].partition(" ")
+            if name == "branch.ab":
+                ahead, behind = value.split()
+                branch["ahead"], branch["behind"] = int(ahead), -int(behind)
+            else:
+                branch[name.removeprefix("branch.")] = value
+        elif kind == "1":
+            parts = field.split(" ", 8)
+            entries.append({"type": "changed", "xy": parts[1], "path": parts[8]})
+        elif kind == "2":
+            parts = field.split(" ", 9)
+            entries.append({"type": "renamed", "xy": parts[1], "score": parts[8], "path": parts[9], "orig_path": next(fields, "")})
+        elif kind == "u":
+            parts = field.split(" ", 10)
+            entries.append({"type": "unmerged", "xy": parts[1], "path": parts[10]})
+        elif kind == "?":
+            entries.append({"type": "untracked", "path": field[2:]})
+        elif kind == "!":
+            entries.append({"type": "ignored", "path": field[2:]})
+    return {"branch": branch, "entries": entries}
+
+
+class StatusCache:
+    """Cache of git status results per repository and output kind.
+
+    Entries are tied to a status_stamp of the repository and are dropped when a
+    write goes through FileTools inside the repository. Such a write also bumps
+    the repository's generation, so a status computed while it happened is not
+    cached. Changes made to the work tree by other processes are not detected;
+    pass refresh to bypass the cache.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict[str, tuple[tuple, dict[str, Any]]] = {}
+        self._generations: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def generation(self, repo_root: str) -> int:
+        """Get the number of invalidations of a repository, to pass to put.
+
+        Args:
+            repo_root: Repository working directory
+
+        Returns:
+            Counter that changes whenever a path in the repository is invalidated
+        """
+        with self._lock:
+            return self._generations.setdefault(repo_root, 0)
+
+    def get(self, repo_root: str, stamp: tuple, kind: str) -> Any | None:
+        """Get a cached status result.
+
+        Args:
+            repo_root: Repository working directory
+            stamp: Current status_stamp of the repository
+            kind: Output kind, e.g. "text" or "porcelain"
+
+        Returns:
+            Cached result, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(repo_root)
+            if entry is not None and entry[0] == stamp and kind in entry[1]:
+                self.hits += 1
+                return entry[1][kind]
+            self.misses += 1
+            return None
+
+    def put(self, repo_root: str, stamp: tuple, kind: str, value: Any, generation: int) -> None:
+        """Cache a status result computed at the given stamp.
+
+        Args:
+            repo_root: Repository working directory
+            stamp: status_stamp taken before the result was computed
+            kind: Output kind
+            value: Status result
+            generation: generation() read before the result was computed; the result is
+                dropped if the repository was invalidated since
+        """
+        with self._lock:
+            if self._generations.get(repo_root) != generation:
+                return
+            entry = self._entries.get(repo_root)
+            if entry is None or entry[0] != stamp:
+                entry = self._entries[repo_root] = (stamp, {})
+            entry[1][kind] = value
+
+    def invalidate_path(self, path: str | os.PathLike) -> None:
+        """Drop results of every repository containing path.
+
+        Args:
+            path: Absolute path that was written
+        """
+        path = os.path.realpath(path)
+        with self._lock:
+            # Every repository that was ever looked up has a generation, cached or not
+            for repo_root in self._generations:
+                if path == repo_root or path.startswith(repo_root.rstrip(os.sep) + os.sep):
+                    self._entries.pop(repo_root, None)
+                    self._generations[repo_root] += 1
+
+    def stats(self) -> dict[str, int | float]:
+        """Get cache counters.
+
+        Returns:
+            Dict with hits, misses, hit rate and cached repository count
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / lookups if lookups else 0.0, "repos": len(self._entries)}
+
+
+_status_cache = StatusCache()
+
+
+def get_status_cache() -> StatusCache:
+    """Get the status cache shared by GitTools and FileTools.
+
+    Returns:
+        Shared StatusCache
+    """
+    return _status_cache
@@ -0,0 +1,204 @@
+"""Symbol definitions extracted from Python sources."""
+
+import ast
+import asyncio
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from mcp_server_code_assist.executors import run_cpu, run_io
+from mcp_server_code_assist.tools import tree_index
+from mcp_server_code_assist.tools.tree_index import FileStamp, file_stamp
+
+SOURCE_SUFFIXES = (".py", ".pyi")
+# Up to this many changed files are parsed on the I/O pool; more go to the process pool.
+INLINE_PARSE_FILES = 16
+# Number of files sent to a worker process per task.
+PARSE_CHUNK_FILES = 64
+# At most this many roots keep a symbol index; the least recently used is dropped.
+MAX_SYMBOL_INDEXES = 16
+
+Symbol = dict[str, Any]
+
+
+def _symbol(node: ast.AST, name: str, kind: str, parent: str | None) -> Symbol:
+    return {
+        "name": name,
+        "qualname": f"{parent}.{name}" if parent else name,
+        "kind": kind,
+        "line": node.lineno,
+        "end_line": node.end_lineno,
+    }
+
+
+def _collect(body: list[ast.stmt], parent: str | None, in_class: bool, symbols: list[Symbol]) -> None:
+    for node in body:
+        if isinstance(node, ast.ClassDef):
+            symbol = _symbol(node, node.name, "class", parent)
+            symbols.append(symbol)
+            _collect(node.body, symbol["qualname"], True, symbols)
+        elif isinstance(node, ast.FunctionDef | ast.AsyncFunctionDef):
+            symbols.append(_symbol(node, node.name, "method" if in_class else "function", parent))
+        elif parent is None and isinstance(node, ast.Assign | ast.AnnAssign):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            for target in targets:
+                for name in ast.walk(target):
+                    if isinstance(name, ast.Name):
+                        symbols.append(_symbol(node, name.id, "variable", None))
+        elif isinstance(node, ast.If | ast.Try):
+            # Definitions guarded by TYPE_CHECKING, version checks or import fallbacks
+            for block in (node.body, node.orelse, getattr(node, "finalbody", []), *(handler.body for handler in getattr(node, "handlers", []))):
+                _collect(block, parent, in_class, symbols)
+
+
+def extract_symbols(source: bytes) -> list[Symbol]:
+    """Extract classes, functions, methods and module-level assignments.
+
+    Functions nested inside functions are not included.
+
+    Args:
+        source: Python source code
+
+    Returns:
+        Symbols in source order, each with name, qualname, kind, line and end_line;
+        empty if the source does not parse
+    """
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return []
+    symbols: list[Symbol] = []
+    _collect(tree.body, None, False, symbols)
+    return symbols
+
+
+def parse_sources(sources: list[bytes]) -> list[list[Symbol]]:
+    """Extract symbols of several sources; runs in worker processes.
+
+    Args:
+        sources: Python source codes
+
+    Returns:
+        Symbols of each source, in input order
+    """
+    return [extract_symbols(source) for source in sources]
+
+
+class SymbolIndex:
+    """Symbols of the Python files of one tree root.
+
+    Files are re-read only when their stamp changes, and re-parsed only when
+    their content hash is new, so repeated queries cost one stat per file.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+        self._files: dict[str, tuple[FileStamp, str]] = {}
+        self._symbols: dict[str, list[Symbol]] = {}
+
+    def _scan(self, files: list[str]) -> tuple[dict[str, str], list[tuple[str, FileStamp, str]], dict[str, list[Symbol]], dict[str, bytes]]:
+        """Read and hash the files whose stamp changed.
+
+        Returns:
+            Tuple of (digest of each readable file, changed files as (path, stamp, digest),
+            symbols of known digests, sources of unknown digests)
+        """
+        digests: dict[str, str] = {}
+        changed = []
+        known: dict[str, list[Symbol]] = {}
+        sources: dict[str, bytes] = {}
+        for rel_path in files:
+            path = self.root / rel_path
+            stamp = file_stamp(path)
+            record = self._files.get(rel_path)
+            content = None
+            try:
+                if stamp is not None and record is not None and record[0] == stamp:
+                    digest = record[1]
+                    if digest not in self._symbols:
+                        content = path.read_bytes()
+                else:
+                    content = path.read_bytes()
+                    digest = hashlib.blake2b(content, digest_size=16).hexdigest()
+                    # A stamp within the racy window could miss a later change; keep checking the file
+                    if stamp is not None and time.time_ns() - stamp[0] <= tree_index.RACY_WINDOW_NS:
+                        stamp = None
+                    changed.append((rel_path, stamp, digest))
+            except OSError:
+                continue
+            digests[rel_path] = digest
+            symbols = self._symbols.get(digest)
+            if symbols is not None:
+                known[digest] = symbols
+            elif content is not None:
+                sources[digest] = content
+        return digests, changed, known, sources
+
+    async def update(self, files: list[str], prune: bool = True) -> dict[str, list[Symbol]]:
+        """Bring the symbols of the given files up to date.
+
+        Args:
+            files: '/'-separated paths relative to the root
+            prune: Forget files that are not in files
+
+        Returns:
+            Mapping of each readable file to its symbols, in input order
+        """
+        digests, changed, known, sources = await run_io(self._scan, files)
+        if sources:
+            pending = list(sources)
+            if len(pending) <= INLINE_PARSE_FILES:
+                parsed = await run_io(parse_sources, [sources[digest] for digest in pending])
+            else:
+                chunks = [pending[i : i + PARSE_CHUNK_FILES] for i in range(0, len(pending), PARSE_CHUNK_FILES)]
+                results = await asyncio.gather(*(run_cpu(parse_sources, [sources[digest] for digest in chunk]) for chunk in chunks))
+                parsed = [symbols for result in results for symbols in result]
+            known.update(zip(pending, parsed))
+            self._symbols.update(zip(pending, parsed))
+        for rel_path, stamp, digest in changed:
+            self._files[rel_path] = (stamp, digest)
+
+        if prune:
+            self._files = {rel_path: record for rel_path, record in self._files.items() if rel_path in digests}
+            live = {digest for _, digest in self._files.values()}
+            self._symbols = {digest: symbols for digest, symbols in self._symbols.items() if digest in live}
+        return {rel_path: known[digest] for rel_path, digest in digests.items() if digest in known}
+
+
+_symbol_indexes: OrderedDict[Path, SymbolIndex] = OrderedDict()
+
+
+def get_symbol_index(root: Path) -> SymbolIndex:
+    """Get or create the SymbolIndex for a root directory.
+
+    Only the MAX_SYMBOL_INDEXES most recently used indexes are kept.
+
+    Args:
+        root: Absolute root directory path
+
+    Returns:
+        SymbolIndex shared by all FileTools instances
+    """
+    index = _symbol_indexes.get(root)
+    if index is None:
+        index = _symbol_indexes[root] = SymbolIndex(root)
+        while len(_symbol_indexes) > MAX_SYMBOL_INDEXES:
+            _symbol_indexes.popitem(last=False)
+    else:
+        _symbol_indexes.move_to_end(root)
+    return index
+
+
+def is_source_file(path: str | os.PathLike) -> bool:
+    """Check whether a file is parsed for symbols.
+
+    Args:
+        path: File path
+
+    Returns:
+        True for Python sources
+    """
+    return os.fspath(path).endswith(SOURCE_SUFFIXES)
@@ -1,12 +1,98 @@
-"""Tools manager for maintaining singleton instances of tools."""
+"""Tools manager for maintaining shared instances of tools."""
 
+import os
+import threading
+from collections import OrderedDict
+from typing import TypeVar
+
+from mcp_server_code_assist.base_tools import BaseTools
 from mcp_server_code_assist.tools.dir_tools import DirTools
 from mcp_server_code_assist.tools.file_tools import FileTools
 from mcp_server_code_assist.tools.git_tools import GitTools
 
-_file_tools: FileTools | None = None
-_dir_tools: DirTools | None = None
-_git_tools: GitTools | None = None
+DEFAULT_MAX_ROOT_SETS = 16
+
+T = TypeVar("T", bound=BaseTools)
+
+
+class ToolRegistry:
+    """Tool instances keyed by the resolved set of allowed roots.
+
+    Each root set gets its own FileTools, DirTools and GitTools, each built the
+    first time it is requested. Switching between root sets reuses the existing
+    instances instead of rebuilding them, and the least recently used root sets
+    are dropped beyond max_root_sets.
+    """
+
+    def __init__(self, max_root_sets: int = DEFAULT_MAX_ROOT_SETS):
+        self.max_root_sets = max_root_sets
+        self.built = 0
+        self.reused = 0
+        self._tools: OrderedDict[tuple[str, ...], dict[type[BaseTools], BaseTools]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _key(self, allowed_paths: list[str]) -> tuple[str, ...]:
+        # Resolved on every lookup, which is cheap next to building tools and follows symlink changes
+        return tuple(sorted({os.path.realpath(path) for path in allowed_paths}))
+
+    def get(self, tool_class: type[T], allowed_paths: list[str]) -> T:
+        """Get or create the tool instance for a set of roots.
+
+        Args:
+            tool_class: FileTools, DirTools or GitTools
+            allowed_paths: List of paths that tools can operate on
+
+        Returns:
+            Instance of tool_class shared by every caller with the same roots
+        """
+        key = self._key(allowed_paths)
+        with self._lock:
+            tools = self._tools.get(key)
+            if tools is not None:
+                self._tools.move_to_end(key)
+                tool = tools.get(tool_class)
+                if tool is not None:
+                    # Roots may be spelled differently than when the tool was built
+                    tool.allowed_paths.extend(path for path in allowed_paths if path not in tool.allowed_paths)
+                    self.reused += 1
+                    return tool  # type: ignore[return-value]
+
+        # Built outside the lock, since GitTools opens the repositories; failures are not cached
+        tool = tool_class(allowed_paths=list(allowed_paths))
+        with self._lock:
+            tools = self._tools.setdefault(key, {})
+            self._tools.move_to_end(key)
+            tool = tools.setdefault(tool_class, tool)
+            self.built += 1
+            while len(self._tools) > self.max_root_sets:
+                self._tools.popitem(last=False)
+        return tool  # type: ignore[return-value]
+
+    def clear(self) -> None:
+        """Drop every tool instance."""
+        with self._lock:
+            self._tools.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Get registry counters.
+
+        Returns:
+            Dict with cached root set count and built/reused totals
+        """
+        with self._lock:
+            return {"root_sets": len(self._tools), "built": self.built, "reused": self.reused}
+
+
+_registry = ToolRegistry()
+
+
+def get_tool_registry() -> ToolRegistry:
+    """Get the registry shared by the server and prompts.
+
+    Returns:
+        Module-level ToolRegistry
+    """
+    return _registry
 
 
 def get_file_tools(allowed_paths: list[str]) -> FileTools:
@@ -16,12 +102,9 @@ def get_file_tools(allowed_paths: list[str]) -> FileTools:
         allowed_paths: List of paths that tools can operate on
 
     Returns:
-        FileTools instance with updated paths
+        FileTools instance shared for the same resolved roots
     """
-    global _file_tools
-    if not _file_tools or not all(path in _file_tools.allowed_paths for path in allowed_paths):
-        _file_tools = FileTools(allowed_paths=allowed_paths)
-    return _file_tools
+    return _registry.get(FileTools, allowed_paths)
 
 
 def get_dir_tools(allowed_paths: list[str]) -> DirTools:
@@ -31,12 +114,9 @@ def get_dir_tools(allowed_paths: list[str]) -> DirTools:
         allowed_paths: List of paths that tools can operate on
 
     Returns:
-        DirTools instance with updated paths
+        DirTools instance shared for the same resolved roots
     """
-    global _dir_tools
-    if not _dir_tools or not all(path in _dir_tools.allowed_paths for path in allowed_paths):
-        _dir_tools = DirTools(allowed_paths=allowed_paths)
-    return _dir_tools
+    return _registry.get(DirTools, allowed_paths)
 
 
 def get_git_tools(allowed_paths: list[str]) -> GitTools:
@@ -46,9 +126,6 @@ def get_git_tools(allowed_paths: list[str]) -> GitTools:
         allowed_paths: List of paths that tools can operate on
 
     Returns:
-        GitTools instance with updated paths
+        GitTools instance shared for the same resolved roots
     """
-    global _git_tools
-    if not _git_tools or not all(path in _git_tools.allowed_paths for path in allowed_paths):
-        _git_tools = GitTools(allowed_paths=allowed_paths)
-    return _git_tools
+    return _registry.get(GitTools, allowed_paths)
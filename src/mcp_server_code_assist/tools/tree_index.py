@@ -0,0 +1,292 @@
+"""Directory index helpers backing FileTools.file_tree."""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from mcp_server_code_assist.tools.ignore import IgnoreMatcher
+
+# Nested mapping of path components; directories map to a sub-trie, files to None.
+PathTrie = dict[str, "PathTrie | None"]
+# Rendered tree entry: (name, children). Children is None for files.
+TreeEntry = tuple[str, "list[TreeEntry] | None"]
+# Cheap change detector for a file: (mtime_ns, size, inode), or None if missing.
+FileStamp = tuple[int, int, int] | None
+
+# Directory listings younger than this are not trusted, since a change within the
+# same mtime tick would go unnoticed (the "racy git" problem).
+RACY_WINDOW_NS = 1_000_000_000
+# At most this many roots keep a tree index; the least recently used is dropped.
+MAX_TREE_INDEXES = 16
+
+
+def build_path_trie(paths: Iterable[str]) -> PathTrie:
+    """Build a prefix trie from '/'-separated relative paths.
+
+    Args:
+        paths: Relative file paths, e.g. the output of `git ls-files`
+
+    Returns:
+        Nested dict where directories map to sub-tries and files to None
+    """
+    root: PathTrie = {}
+    for rel_path in paths:
+        if not rel_path:
+            continue
+        node = root
+        *dirs, name = rel_path.split("/")
+        for part in dirs:
+            child = node.get(part)
+            if child is None:
+                child = node[part] = {}
+            node = child
+        node.setdefault(name, None)
+    return root
+
+
+def render_tree(entries: list[TreeEntry], prefix: str = "") -> tuple[list[str], int, int]:
+    """Render tree entries using box-drawing connectors.
+
+    Args:
+        entries: Sorted entries of one directory
+        prefix: Prefix inherited from parent directories
+
+    Returns:
+        Tuple of (tree lines, directory count, file count)
+    """
+    lines = []
+    dir_count = 0
+    file_count = 0
+    last = len(entries) - 1
+    for i, (name, children) in enumerate(entries):
+        lines.append(prefix + ("└── " if i == last else "├── ") + name)
+        if children is None:
+            file_count += 1
+            continue
+        sub_lines, sub_dirs, sub_files = render_tree(children, prefix + ("    " if i == last else "│   "))
+        lines.extend(sub_lines)
+        dir_count += 1 + sub_dirs
+        file_count += sub_files
+    return lines, dir_count, file_count
+
+
+def file_stamp(path: Path) -> FileStamp:
+    """Get a change detector for a file.
+
+    Args:
+        path: File to stat
+
+    Returns:
+        Tuple of (mtime_ns, size, inode), or None if the file does not exist
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+def _collect_files(entries: list[TreeEntry], prefix: str, files: list[str]) -> None:
+    for name, children in entries:
+        if children is None:
+            files.append(prefix + name)
+        else:
+            _collect_files(children, prefix + name + "/", files)
+
+
+def _sort_entries(entries: list[TreeEntry]) -> list[TreeEntry]:
+    entries.sort(key=lambda entry: (entry[1] is None, entry[0]))
+    return entries
+
+
+class TreeIndex:
+    """In-memory index of one tree root, kept for the lifetime of the server.
+
+    Directory listings are cached with the directory's mtime and only re-read when
+    it changes. The tracked file trie is only rebuilt when `.git/index` changes.
+    When nothing changed since the last call, the previous result is returned after
+    one stat per directory and ignore file.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+        self._listings: dict[str, tuple[int, list[tuple[str, bool]]]] = {}
+        self._visited: dict[str, int] = {}
+        self._ignore_sources: dict[str, FileStamp] = {}
+        self._racy = False
+        self._tracked_key: object = None
+        self._tracked: PathTrie | None = None
+        self._entries_key: object = None
+        self._entries: list[TreeEntry] | None = None
+        self._rendered: tuple[list[TreeEntry], tuple[str, int, int]] | None = None
+        self._lock = threading.Lock()
+
+    def _git_key(self) -> tuple | None:
+        git_path = self.root / ".git"
+        if git_path.is_dir():
+            return ("index", file_stamp(git_path / "index"))
+        if git_path.exists():
+            # Worktrees and submodules use a gitfile; there is no cheap stamp for them.
+            return None
+        return ("none",)
+
+    def _tracked_trie(self, load_tracked: Callable[[Path], set[str] | None]) -> PathTrie | None:
+        key = self._git_key()
+        if key is None or key != self._tracked_key:
+            tracked_files = load_tracked(self.root)
+            self._tracked = build_path_trie(tracked_files) if tracked_files is not None else None
+            self._tracked_key = key
+            self._entries = None
+        return self._tracked
+
+    def _unchanged(self) -> bool:
+        for dir_path, mtime in self._visited.items():
+            try:
+                if os.stat(dir_path).st_mtime_ns != mtime:
+                    return False
+            except OSError:
+                return False
+        return all(file_stamp(path) == stamp for path, stamp in self._ignore_sources.items())
+
+    def listdir(self, path: Path) -> list[tuple[str, bool]]:
+        """List a directory, reusing the cached listing if its mtime is unchanged.
+
+        Args:
+            path: Directory to list
+
+        Returns:
+            List of (name, is_dir) tuples; symlinks are not followed
+        """
+        key = str(path)
+        mtime = os.stat(path).st_mtime_ns
+        self._visited[key] = mtime
+        cached = self._listings.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        with os.scandir(path) as it:
+            items = [(item.name, item.is_dir(follow_symlinks=False)) for item in it]
+        if time.time_ns() - mtime > RACY_WINDOW_NS:
+            self._listings[key] = (mtime, items)
+        else:
+            self._listings.pop(key, None)
+            self._racy = True
+        return items
+
+    def file_tree(self, load_tracked: Callable[[Path], set[str] | None], matcher: "IgnoreMatcher") -> tuple[str, int, int]:
+        """Render the tree of the indexed root, revalidating only what changed.
+
+        Args:
+            load_tracked: Returns tracked files of a repository root, or None if not a repo
+            matcher: Gitignore matcher of the root, used when it is not a repository
+
+        Returns:
+            Tuple of (tree view, directory count, file count)
+        """
+        with self._lock:
+            entries = self._current_entries(load_tracked, matcher)
+            if self._rendered is not None and self._rendered[0] is entries:
+                return self._rendered[1]
+            tree_lines, dir_count, file_count = render_tree(entries)
+            result = ("\n".join(tree_lines), dir_count, file_count)
+            self._rendered = (entries, result)
+            return result
+
+    def files(self, load_tracked: Callable[[Path], set[str] | None], matcher: "IgnoreMatcher") -> list[str]:
+        """List the files shown by file_tree.
+
+        Args:
+            load_tracked: Returns tracked files of a repository root, or None if not a repo
+            matcher: Gitignore matcher of the root, used when it is not a repository
+
+        Returns:
+            '/'-separated paths relative to the root, in tree order
+        """
+        with self._lock:
+            entries = self._current_entries(load_tracked, matcher)
+        files: list[str] = []
+        _collect_files(entries, "", files)
+        return files
+
+    def _current_entries(self, load_tracked: Callable[[Path], set[str] | None], matcher: "IgnoreMatcher") -> list[TreeEntry]:
+        tracked = self._tracked_trie(load_tracked)
+        if self._entries is not None and self._tracked_key is not None and self._tracked_key == self._entries_key and self._unchanged():
+            return self._entries
+
+        self._visited = {}
+        self._ignore_sources = {}
+        self._racy = False
+        if tracked is not None:
+            entries = self._tracked_entries(self.root, tracked)
+        else:
+            matcher.refresh()
+            entries = self._ignored_entries(self.root, "", matcher.is_ignored)
+            self._ignore_sources = matcher.sources()
+
+        # Forget listings of directories that are no longer part of the tree
+        self._listings = {key: value for key, value in self._listings.items() if key in self._visited}
+        self._entries_key = self._tracked_key
+        self._entries = None if self._racy else entries
+        return entries
+
+    def _tracked_entries(self, path: Path, node: PathTrie) -> list[TreeEntry]:
+        try:
+            present = {name for name, _ in self.listdir(path)}
+        except OSError:
+            return []
+
+        entries = []
+        for name, child in node.items():
+            if name not in present:
+                continue
+            if child is None:
+                entries.append((name, None))
+                continue
+            children = self._tracked_entries(path / name, child)
+            if children:
+                entries.append((name, children))
+        return _sort_entries(entries)
+
+    def _ignored_entries(self, path: Path, rel_dir: str, is_ignored: Callable[[str, bool], bool]) -> list[TreeEntry]:
+        entries = []
+        for name, is_dir in self.listdir(path):
+            rel_path = rel_dir + name
+            # Ignored directories are pruned without being listed
+            if is_ignored(rel_path, is_dir):
+                continue
+            if is_dir:
+                entries.append((name, self._ignored_entries(path / name, rel_path + "/", is_ignored)))
+            else:
+                entries.append((name, None))
+        return _sort_entries(entries)
+
+
+_tree_indexes: OrderedDict[Path, TreeIndex] = OrderedDict()
+_tree_indexes_lock = threading.Lock()
+
+
+def get_tree_index(root: Path) -> TreeIndex:
+    """Get or create the TreeIndex for a root directory.
+
+    Only the MAX_TREE_INDEXES most recently used indexes are kept.
+
+    Args:
+        root: Absolute root directory path
+
+    Returns:
+        TreeIndex shared by all FileTools instances
+    """
+    with _tree_indexes_lock:
+        index = _tree_indexes.get(root)
+        if index is None:
+            index = _tree_indexes[root] = TreeIndex(root)
+            while len(_tree_indexes) > MAX_TREE_INDEXES:
+                _tree_indexes.popitem(last=False)
+        else:
+            _tree_indexes.move_to_end(root)
+        return index
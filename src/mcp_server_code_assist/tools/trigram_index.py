@@ -0,0 +1,414 @@
+"""Persistent trigram index used to narrow search_code candidates."""
+
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+
+from mcp_server_code_assist.executors import get_index_executor
+from mcp_server_code_assist.tools import tree_index
+from mcp_server_code_assist.tools.search import BINARY_SNIFF_BYTES
+from mcp_server_code_assist.tools.tree_index import FileStamp, file_stamp
+
+SCHEMA_VERSION = 1
+# Files larger than this are not indexed and always searched.
+MAX_INDEXED_FILE_BYTES = 1024 * 1024
+# Rows are committed in batches so searches can run while the index is being built.
+COMMIT_BATCH_FILES = 500
+# An index is revalidated against file mtimes at most this often.
+REFRESH_INTERVAL = 10.0
+# Only this many of a pattern's trigrams are used to look up candidates.
+MAX_QUERY_TRIGRAMS = 32
+# At most this many index databases are open; the least recently used is closed.
+MAX_OPEN_INDEXES = 8
+
+# How a file is stored in the index
+INDEXED = 0
+UNINDEXED = 1
+BINARY = 2
+
+_VERBOSE_FLAG = re.compile(r"\(\?[a-zA-Z]*x")
+# Number of characters following escapes like \x41 that belong to the escape
+_ESCAPE_PAYLOAD = {"x": 2, "u": 4, "U": 8}
+# A brace is a repetition like {3}, {2,}, {,4} or {2,4}, otherwise it matches itself
+_REPEAT = re.compile(r"\{(\d*)(?:,\d*)?\}")
+
+
+def default_index_dir() -> Path:
+    """Get the directory holding index databases.
+
+    Returns:
+        $XDG_CACHE_HOME/mcp-server-code-assist, defaulting to ~/.cache
+    """
+    return Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "mcp-server-code-assist"
+
+
+def _skip_class(pattern: str, start: int) -> int:
+    j = start + 1
+    if j < len(pattern) and pattern[j] == "^":
+        j += 1
+    if j < len(pattern) and pattern[j] == "]":
+        j += 1
+    while j < len(pattern) and pattern[j] != "]":
+        j += 2 if pattern[j] == "\\" else 1
+    return j + 1
+
+
+def _skip_escape(pattern: str, start: int) -> int:
+    """Get the index after an escape whose first character after the backslash is alphanumeric."""
+    c = pattern[start + 1]
+    if c in _ESCAPE_PAYLOAD:
+        return start + 2 + _ESCAPE_PAYLOAD[c]
+    if c == "N" and start + 2 < len(pattern) and pattern[start + 2] == "{":
+        end = pattern.find("}", start + 2)
+        return len(pattern) if end == -1 else end + 1
+    j = start + 2
+    # Octal escapes and group references take up to three digits
+    while c.isdigit() and j < len(pattern) and j - start < 4 and pattern[j].isdigit():
+        j += 1
+    return j
+
+
+def _repeat(pattern: str, i: int) -> re.Match | None:
+    match = _REPEAT.match(pattern, i)
+    return match if match is not None and match.end() - i > 2 else None
+
+
+def _optional(pattern: str, i: int) -> bool:
+    """Check whether the quantifier at i, if any, allows zero repetitions."""
+    if i >= len(pattern):
+        return False
+    if pattern[i] in "*?":
+        return True
+    repeat = _repeat(pattern, i) if pattern[i] == "{" else None
+    return repeat is not None and not int(repeat.group(1) or 0)
+
+
+def _next_token(pattern: str, i: int) -> tuple[str | None, int, int]:
+    """Read one regex token, returning its literal character if any, the next index and the change in group depth."""
+    c = pattern[i]
+    if c == "\\" and i + 1 < len(pattern):
+        # Escaped letters and digits are classes, anchors, code points or references, never themselves
+        if pattern[i + 1].isalnum():
+            return None, _skip_escape(pattern, i), 0
+        return pattern[i + 1], i + 2, 0
+    if c == "[":
+        return None, _skip_class(pattern, i), 0
+    if c in "()":
+        return None, i + 1, 1 if c == "(" else -1
+    if c == "{" and (repeat := _repeat(pattern, i)) is not None:
+        return None, repeat.end(), 0
+    return (None if c in ".^$+*?{}" else c), i + 1, 0
+
+
+def required_literals(pattern: str, literal: bool = False) -> list[str]:
+    """Get substrings that every match of a search pattern must contain.
+
+    Only literal runs outside groups, classes and optional quantifiers are taken,
+    and patterns with alternation or verbose mode yield nothing, so the result is
+    always safe to filter on.
+
+    Args:
+        pattern: Regular expression, or plain text if literal
+        literal: Whether pattern is plain text
+
+    Returns:
+        Required substrings of at least three characters
+    """
+    if literal:
+        return [pattern] if len(pattern) >= 3 else []
+    if "|" in pattern or _VERBOSE_FLAG.search(pattern):
+        return []
+    runs = []
+    run: list[str] = []
+    depth = 0
+    i, n = 0, len(pattern)
+    while i < n:
+        char, i, nesting = _next_token(pattern, i)
+        depth += nesting
+        # A character followed by an optional quantifier is not required
+        if char is not None and depth == 0 and not _optional(pattern, i):
+            run.append(char)
+            continue
+        if run:
+            runs.append("".join(run))
+            run = []
+    if run:
+        runs.append("".join(run))
+    return [run for run in runs if len(run) >= 3]
+
+
+def trigrams(data: bytes) -> set[int]:
+    """Get the case-folded byte trigrams of data.
+
+    Args:
+        data: Raw bytes
+
+    Returns:
+        Set of trigrams, each packed into an int
+    """
+    data = data.lower()
+    return {int.from_bytes(data[i : i + 3], "big") for i in range(len(data) - 2)}
+
+
+def _read_for_index(path: Path) -> tuple[int, set[int]]:
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size > MAX_INDEXED_FILE_BYTES:
+            return UNINDEXED, set()
+        data = f.read()
+    if b"\0" in data[:BINARY_SNIFF_BYTES]:
+        return BINARY, set()
+    return INDEXED, trigrams(data)
+
+
+def _unknown(entry: tuple[FileStamp, int, int] | None) -> bool:
+    """Check whether the index cannot tell what a file contains."""
+    return entry is None or entry[2] == UNINDEXED or entry[0] is None
+
+
+class TrigramIndex:
+    """On-disk trigram index of the files of one tree root.
+
+    The index is a SQLite database mapping each case-folded trigram to the files
+    containing it. It is refreshed in the background: every file is stat'ed and
+    only files whose stamp changed are re-read. Queries trust the stored stamps
+    and stat nothing; files written through FileTools are marked dirty and
+    searched directly, while files changed by other processes are picked up by
+    the next refresh, which runs at most REFRESH_INTERVAL seconds after the
+    previous one.
+    """
+
+    def __init__(self, root: Path, db_path: Path):
+        self.root = root
+        self.db_path = db_path
+        self.ready = False
+        self._files: dict[str, tuple[FileStamp, int, int]] = {}
+        self._dirty: set[str] = set()
+        self._refresh: Future | None = None
+        self._refreshed_at = 0.0
+        self._closing = False
+        self._lock = threading.Lock()
+        import sqlite3
+
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._open()
+
+    def _open(self) -> None:
+        conn = self._conn
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            conn.executescript("DROP TABLE IF EXISTS trigrams; DROP TABLE IF EXISTS files;")
+            conn.executescript(
+                """
+                CREATE TABLE files (id INTEGER PRIMARY KEY, path TEXT UNIQUE NOT NULL, mtime_ns INTEGER, size INTEGER, ino INTEGER, kind INTEGER NOT NULL);
+                CREATE TABLE trigrams (trigram INTEGER NOT NULL, file_id INTEGER NOT NULL, PRIMARY KEY (trigram, file_id)) WITHOUT ROWID;
+                CREATE INDEX trigrams_file ON trigrams (file_id);
+                """
+            )
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.commit()
+        for file_id, path, mtime_ns, size, ino, kind in conn.execute("SELECT id, path, mtime_ns, size, ino, kind FROM files"):
+            self._files[path] = ((mtime_ns, size, ino) if mtime_ns is not None else None, file_id, kind)
+
+    def schedule_refresh(self, files: list[str]) -> Future | None:
+        """Start a background refresh unless one is running or ran recently.
+
+        Args:
+            files: Current '/'-separated relative paths of the tree
+
+        Returns:
+            Future of the refresh, or None if none was started
+        """
+        with self._lock:
+            if self._closing or (self._refresh is not None and not self._refresh.done()):
+                return None
+            if self.ready and time.monotonic() - self._refreshed_at < REFRESH_INTERVAL:
+                return None
+            self._refresh = get_index_executor().submit(self.refresh, files)
+            return self._refresh
+
+    def wait(self, timeout: float | None = None) -> None:
+        """Wait for a running background refresh to finish.
+
+        Args:
+            timeout: Maximum number of seconds to wait
+        """
+        refresh = self._refresh
+        if refresh is not None:
+            refresh.result(timeout)
+
+    def refresh(self, files: list[str]) -> None:
+        """Bring the index up to date with the given files, blocking.
+
+        Args:
+            files: Current '/'-separated relative paths of the tree
+        """
+        present = set(files)
+        pending = 0
+        for rel_path in files:
+            if self._closing:
+                return
+            stamp = file_stamp(self.root / rel_path)
+            entry = self._files.get(rel_path)
+            if stamp is None or (entry is not None and entry[0] == stamp and rel_path not in self._dirty):
+                continue
+            # Clear the dirty mark before reading, so a write during the read marks it again
+            with self._lock:
+                self._dirty.discard(rel_path)
+            try:
+                kind, grams = _read_for_index(self.root / rel_path)
+            except OSError:
+                continue
+            # A stamp taken within the racy window could miss a later change, so store none
+            self._store(rel_path, stamp if time.time_ns() - stamp[0] > tree_index.RACY_WINDOW_NS else None, kind, grams)
+            pending += 1
+            if pending >= COMMIT_BATCH_FILES:
+                with self._lock:
+                    self._conn.commit()
+                pending = 0
+
+        with self._lock:
+            for rel_path in [path for path in self._files if path not in present]:
+                self._conn.execute("DELETE FROM trigrams WHERE file_id = ?", (self._files[rel_path][1],))
+                self._conn.execute("DELETE FROM files WHERE id = ?", (self._files.pop(rel_path)[1],))
+            self._conn.commit()
+            self._refreshed_at = time.monotonic()
+            self.ready = True
+
+    def _store(self, rel_path: str, stamp: FileStamp, kind: int, grams: set[int]) -> None:
+        mtime_ns, size, ino = stamp if stamp is not None else (None, None, None)
+        with self._lock:
+            conn = self._conn
+            entry = self._files.get(rel_path)
+            if entry is not None:
+                file_id = entry[1]
+                conn.execute("DELETE FROM trigrams WHERE file_id = ?", (file_id,))
+                conn.execute("UPDATE files SET mtime_ns = ?, size = ?, ino = ?, kind = ? WHERE id = ?", (mtime_ns, size, ino, kind, file_id))
+            else:
+                file_id = conn.execute("INSERT INTO files (path, mtime_ns, size, ino, kind) VALUES (?, ?, ?, ?, ?)", (rel_path, mtime_ns, size, ino, kind)).lastrowid
+            conn.executemany("INSERT INTO trigrams (trigram, file_id) VALUES (?, ?)", ((gram, file_id) for gram in grams))
+            self._files[rel_path] = (stamp, file_id, kind)
+
+    def mark_dirty(self, rel_path: str) -> None:
+        """Search a file directly until the next refresh re-reads it.
+
+        Args:
+            rel_path: '/'-separated path relative to the root
+        """
+        with self._lock:
+            self._dirty.add(rel_path)
+
+    def candidates(self, files: list[str], literals: list[str]) -> list[str] | None:
+        """Narrow files down to those that may contain all literals.
+
+        Files that are not indexed yet, too large, dirty or stamped within the
+        racy window are always kept. No file is stat'ed; the candidates are
+        verified by searching them.
+
+        Args:
+            files: '/'-separated relative paths, in search order
+            literals: Substrings every match contains, from required_literals
+
+        Returns:
+            Candidate files in the given order, or None if the index cannot narrow the search
+        """
+        grams: set[int] = set()
+        for text in literals:
+            grams |= trigrams(text.encode())
+        if not self.ready or not grams:
+            return None
+        query = " INTERSECT ".join(["SELECT file_id FROM trigrams WHERE trigram = ?"] * min(len(grams), MAX_QUERY_TRIGRAMS))
+        with self._lock:
+            if self._closing:
+                return None
+            matching = {row[0] for row in self._conn.execute(f"SELECT path FROM files WHERE id IN ({query})", sorted(grams)[:MAX_QUERY_TRIGRAMS])}
+            dirty = set(self._dirty)
+        known = self._files
+        return [path for path in files if path in matching or path in dirty or _unknown(known.get(path))]
+
+    def close(self) -> None:
+        """Stop a running refresh and close the database."""
+        self._closing = True
+        refresh = self._refresh
+        if refresh is not None:
+            refresh.cancel()
+            try:
+                refresh.result()
+            except Exception:
+                pass
+        with self._lock:
+            self._conn.close()
+
+
+_index_dir: Path | None = None
+_indexes: OrderedDict[Path, TrigramIndex] = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def configure_trigram_index(index_dir: Path | None) -> None:
+    """Enable or disable trigram indexes for search_code.
+
+    Args:
+        index_dir: Directory holding the index databases, or None to disable indexing
+    """
+    global _index_dir
+    close_trigram_indexes()
+    _index_dir = index_dir
+
+
+def get_trigram_index(root: Path) -> TrigramIndex | None:
+    """Get the trigram index of an allowed root directory.
+
+    At most MAX_OPEN_INDEXES are kept open; the least recently used one is
+    closed when another is opened.
+
+    Args:
+        root: Absolute root directory path
+
+    Returns:
+        TrigramIndex opened on first use, or None if indexing is disabled
+    """
+    if _index_dir is None:
+        return None
+    evicted = []
+    with _indexes_lock:
+        index = _indexes.get(root)
+        if index is None:
+            name = hashlib.sha256(os.fsencode(os.path.realpath(root))).hexdigest()[:32]
+            index = _indexes[root] = TrigramIndex(root, _index_dir / f"{name}.sqlite3")
+            while len(_indexes) > MAX_OPEN_INDEXES:
+                evicted.append(_indexes.popitem(last=False)[1])
+        else:
+            _indexes.move_to_end(root)
+    for old in evicted:
+        old.close()
+    return index
+
+
+def mark_path_changed(path: str | os.PathLike) -> None:
+    """Mark a written file dirty in every index whose root contains it.
+
+    Args:
+        path: Absolute path that was written
+    """
+    path = Path(os.path.abspath(path))
+    with _indexes_lock:
+        indexes = list(_indexes.values())
+    for index in indexes:
+        if path.is_relative_to(index.root):
+            index.mark_dirty(path.relative_to(index.root).as_posix())
+
+
+def close_trigram_indexes() -> None:
+    """Stop background refreshes and close every open index."""
+    with _indexes_lock:
+        indexes = list(_indexes.values())
+        _indexes.clear()
+    for index in indexes:
+        index.close()
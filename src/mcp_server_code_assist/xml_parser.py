@@ -2,11 +2,11 @@ import re
 import xml.etree.ElementTree as ET
 from pathlib import Path
 
-import xmlschema
-
 
 class XMLProcessor:
     def __init__(self):
+        import xmlschema
+
         schema_path = Path(__file__).parent / "schema.xsd"
         self.validator = xmlschema.XMLSchema(schema_path)
 
@@ -0,0 +1,21 @@
+import os
+
+import pytest
+from mcp_server_code_assist.tools import tree_index
+
+
+@pytest.fixture
+def no_racy_window(monkeypatch):
+    """Trust file stamps right away, so tests need not wait out the racy window."""
+    monkeypatch.setattr(tree_index, "RACY_WINDOW_NS", -1)
+
+
+@pytest.fixture
+def bump_mtime():
+    """Move a file's mtime forward, so a change is seen even within the stamp's resolution."""
+
+    def bump(path):
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+
+    return bump
@@ -0,0 +1,31 @@
+import json
+
+import pytest
+from benchmarks.fixtures import create_tree, file_paths
+from benchmarks.runner import run_benchmarks
+
+
+def test_layouts():
+    wide = file_paths(250, "wide")
+    assert len(wide) == 250 and len({path.rsplit("/", 1)[0] for path in wide}) == 3
+    deep = file_paths(100, "deep")
+    assert max(path.count("/") for path in deep) == 6
+    with pytest.raises(ValueError, match="Invalid layout"):
+        file_paths(10, "flat")
+
+
+def test_create_tree_is_reproducible(tmp_path):
+    first = create_tree(tmp_path / "a", 5, large_file_bytes=1000)
+    create_tree(tmp_path / "b", 5, large_file_bytes=1000)
+    assert (tmp_path / "a" / first[0]).read_text() == (tmp_path / "b" / first[0]).read_text()
+    assert (tmp_path / "a" / "large.txt").stat().st_size >= 1000
+
+
+@pytest.mark.asyncio
+async def test_benchmark_smoke(tmp_path):
+    report = await run_benchmarks(sizes=(20,), layouts=("deep",), large_file_bytes=100_000, repeat=1, workdir=tmp_path)
+    json.dumps(report)
+    results = report["results"]
+    assert {result["tool"] for result in results} == {"FileTools", "DirTools", "GitTools", "process_instruction"}
+    assert {(result["git"], result["large_file_bytes"]) for result in results} == {(False, 0), (True, 0), (True, 100_000)}
+    assert all(result["cold_seconds"] >= 0 and result["warm_seconds"]["min"] <= result["warm_seconds"]["max"] for result in results)
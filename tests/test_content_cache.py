@@ -0,0 +1,52 @@
+import pytest
+from mcp_server_code_assist.tools.content_cache import ContentCache
+from mcp_server_code_assist.tools.file_tools import FileTools
+
+
+pytestmark = pytest.mark.usefixtures("no_racy_window")
+
+
+def test_lru_eviction_by_bytes():
+    cache = ContentCache(max_bytes=10)
+    cache.put("/a", 1, 4, "aaaa")
+    cache.put("/b", 1, 4, "bbbb")
+    assert cache.get("/a", 1, 4) == "aaaa"
+
+    cache.put("/c", 1, 4, "cccc")
+
+    assert cache.get("/b", 1, 4) is None
+    assert cache.get("/a", 1, 4) == "aaaa"
+    assert cache.get("/c", 1, 4) == "cccc"
+    stats = cache.stats()
+    assert (stats["evictions"], stats["bytes"], stats["entries"]) == (1, 8, 2)
+
+
+def test_stale_entries_miss():
+    cache = ContentCache()
+    cache.put("/a", 1, 4, "aaaa")
+    assert cache.get("/a", 2, 4) is None
+    assert cache.get("/a", 1, 4) is None
+    assert cache.stats()["misses"] == 2
+
+
+def test_oversized_entries_are_not_cached():
+    cache = ContentCache(max_bytes=3)
+    cache.put("/a", 1, 4, "aaaa")
+    assert cache.stats()["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_file_tools_cache_invalidated_on_write(tmp_path):
+    tools = FileTools(allowed_paths=[str(tmp_path)], content_cache=ContentCache())
+    test_file = tmp_path / "cached.txt"
+    await tools.write_file(str(test_file), "first")
+
+    assert await tools.read_file(str(test_file)) == "first"
+    assert await tools.read_file(str(test_file)) == "first"
+    assert tools.cache_stats()["hits"] == 1
+
+    await tools.modify_file(str(test_file), {"first": "second"})
+    assert await tools.read_file(str(test_file)) == "second"
+
+    await tools.delete_file(str(test_file))
+    assert tools.cache_stats()["entries"] == 0
@@ -0,0 +1,86 @@
+import difflib
+import random
+
+import pytest
+from mcp_server_code_assist.tools.diff import matching_blocks, unified_diff
+from mcp_server_code_assist.tools.file_tools import FileTools
+from mcp_server_code_assist.tools.models import DiffOptions
+
+
+def _lcs_length(a, b):
+    lengths = [[0] * (len(b) + 1) for _ in range(len(a) + 1)]
+    for i in range(len(a) - 1, -1, -1):
+        for j in range(len(b) - 1, -1, -1):
+            lengths[i][j] = lengths[i + 1][j + 1] + 1 if a[i] == b[j] else max(lengths[i + 1][j], lengths[i][j + 1])
+    return lengths[0][0]
+
+
+def test_matching_blocks_find_longest_common_subsequence():
+    rng = random.Random(0)
+    for _ in range(500):
+        a = [rng.randrange(4) for _ in range(rng.randrange(12))]
+        b = [rng.randrange(4) for _ in range(rng.randrange(12))]
+        blocks = matching_blocks(a, b)
+        assert sum(size for _, _, size in blocks) == _lcs_length(a, b)
+        i = j = 0
+        for a_start, b_start, size in blocks:
+            assert a_start >= i and b_start >= j
+            assert a[a_start : a_start + size] == b[b_start : b_start + size]
+            i, j = a_start + size, b_start + size
+
+
+def test_unified_diff_matches_difflib():
+    original = "".join(f"line {i}\n" for i in range(200))
+    lines = original.splitlines(keepends=True)
+    lines[10] = "changed\n"
+    del lines[100:103]
+    lines.insert(150, "inserted\n")
+    modified = "".join(lines)
+    for context in (0, 1, 3):
+        expected = "".join(difflib.unified_diff(original.splitlines(keepends=True), lines, fromfile="original", tofile="modified", n=context))
+        assert unified_diff(original, modified, context) == expected
+
+
+def test_unified_diff_edge_cases():
+    assert unified_diff("same\n", "same\n") == ""
+    assert unified_diff("", "new\n") == "--- original\n+++ modified\n@@ -0,0 +1 @@\n+new\n"
+    assert unified_diff("x\n", "y") == "--- original\n+++ modified\n@@ -1 +1 @@\n-x\n+y\n\\ No newline at end of file\n"
+
+
+def test_unified_diff_only_splits_at_newlines():
+    assert unified_diff("x\x0cy\nz\n", "x\x0cy\nw\n") == "--- original\n+++ modified\n@@ -1,2 +1,2 @@\n x\x0cy\n-z\n+w\n"
+    assert unified_diff("a\r\nb\rc\n", "a\r\nb\rd\n") == "--- original\n+++ modified\n@@ -1,2 +1,2 @@\n a\r\n-b\rc\n+b\rd\n"
+    assert unified_diff("a\x0c", "b\x0c") == "--- original\n+++ modified\n@@ -1 +1 @@\n-a\x0c\n\\ No newline at end of file\n+b\x0c\n\\ No newline at end of file\n"
+
+
+def test_unified_diff_max_bytes():
+    original = "".join(f"line {i}\n" for i in range(1000))
+    modified = original.replace("line 100\n", "one\n").replace("line 500\n", "two\n").replace("line 900\n", "three\n")
+    diff = unified_diff(original, modified, max_bytes=150)
+    assert "+one" in diff
+    assert "+two" not in diff
+    assert diff.endswith("[2 more hunk(s) omitted]\n")
+
+
+def test_unified_diff_timeout_returns_summary(monkeypatch):
+    rng = random.Random(1)
+    original = "".join(f"{rng.randrange(3)}\n" for _ in range(2000))
+    modified = "".join(f"{rng.randrange(3)}\n" for _ in range(2000))
+    times = iter(range(100))
+    monkeypatch.setattr("mcp_server_code_assist.tools.diff.time.monotonic", lambda: next(times))
+    diff = unified_diff(original, modified, timeout=1)
+    assert diff == "[diff not computed within 1s; original has 2000 lines, modified has 2000 lines]"
+
+
+@pytest.mark.asyncio
+async def test_rewrite_file_diff_options(tmp_path):
+    path = tmp_path / "file.txt"
+    path.write_text("a\nb\nc\nd\ne\n")
+    tools = FileTools([str(tmp_path)])
+
+    diff = await tools.rewrite_file(str(path), "a\nb\nC\nd\ne\n", DiffOptions(diff_context=0))
+    assert diff == "--- original\n+++ modified\n@@ -3 +3 @@\n-c\n+C\n"
+
+    summary = await tools.rewrite_file(str(path), "a\n", DiffOptions(diff=False))
+    assert summary == "[diff disabled; original has 5 lines, modified has 1 lines]"
+    assert path.read_text() == "a\n"
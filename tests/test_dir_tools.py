@@ -64,3 +64,51 @@ async def test_is_valid_operation(dir_tools, test_dir):
     file_path = test_dir / "test.txt"
     file_path.write_text("test")
     assert not dir_tools.is_valid_operation(file_path)
+
+
+@pytest.mark.asyncio
+async def test_list_directory_entries(dir_tools, test_dir):
+    (test_dir / "b.txt").write_text("12345")
+    (test_dir / "a.py").write_text("1")
+    (test_dir / "c.txt").write_text("123")
+    (test_dir / "sub").mkdir()
+
+    listing = await dir_tools.list_directory_entries(str(test_dir))
+    assert [entry["name"] for entry in listing["entries"]] == ["a.py", "b.txt", "c.txt", "sub"]
+    assert listing["total"] == 4
+    assert listing["next_offset"] is None
+    entry = listing["entries"][1]
+    assert entry["type"] == "file"
+    assert entry["size"] == 5
+    assert entry["mode"].startswith("-")
+    assert listing["entries"][3]["type"] == "directory"
+
+    by_type = await dir_tools.list_directory_entries(str(test_dir), sort="type")
+    assert by_type["entries"][0]["name"] == "sub"
+
+    by_size = await dir_tools.list_directory_entries(str(test_dir), sort="size", reverse=True, pattern="*.txt")
+    assert [entry["name"] for entry in by_size["entries"]] == ["b.txt", "c.txt"]
+
+    with pytest.raises(ValueError, match="Invalid sort key"):
+        await dir_tools.list_directory_entries(str(test_dir), sort="owner")
+
+
+@pytest.mark.asyncio
+async def test_list_directory_pages(dir_tools, test_dir):
+    for i in range(25):
+        (test_dir / f"file{i:02d}.txt").write_text("x")
+
+    first = await dir_tools.list_directory_entries(str(test_dir), limit=10)
+    assert [entry["name"] for entry in first["entries"]] == [f"file{i:02d}.txt" for i in range(10)]
+    assert first["next_offset"] == 10
+
+    last = await dir_tools.list_directory_entries(str(test_dir), offset=20, limit=10)
+    assert [entry["name"] for entry in last["entries"]] == [f"file{i:02d}.txt" for i in range(20, 25)]
+    assert last["next_offset"] is None
+
+    text = await dir_tools.list_directory(str(test_dir), offset=10, limit=5)
+    assert "file10.txt" in text and "file15.txt" not in text
+    assert text.endswith("entries 11-15 of 25, next offset 15")
+
+    past_end = await dir_tools.list_directory(str(test_dir), offset=25, limit=10)
+    assert past_end == "offset 25 is past the end of 25 entries"
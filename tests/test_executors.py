@@ -0,0 +1,28 @@
+import threading
+
+import pytest
+from mcp_server_code_assist import executors
+from mcp_server_code_assist.executors import configure_io_executor, get_io_executor, run_io
+
+
+@pytest.fixture
+def restore_io_workers():
+    yield
+    configure_io_executor(executors.DEFAULT_IO_WORKERS)
+
+
+@pytest.mark.asyncio
+async def test_run_io_uses_worker_pool():
+    thread_name = await run_io(lambda: threading.current_thread().name)
+    assert thread_name.startswith("mcp-io")
+    assert threading.current_thread().name != thread_name
+
+
+@pytest.mark.asyncio
+async def test_configure_io_executor(restore_io_workers):
+    configure_io_executor(2)
+    assert get_io_executor()._max_workers == 2
+    assert await run_io(sum, [1, 2, 3]) == 6
+
+    with pytest.raises(ValueError):
+        configure_io_executor(0)
@@ -116,3 +116,52 @@ async def test_file_tree(file_tools):
     assert "file2.txt" in tree
     assert "subdir" in tree
     assert "file3.txt" in tree
+
+
+@pytest.mark.asyncio
+async def test_file_tree_git_tracked(tmp_path):
+    from git import Repo
+
+    Repo.init(tmp_path)
+    (tmp_path / "src/pkg").mkdir(parents=True)
+    (tmp_path / "src/pkg/mod.py").write_text("x = 1")
+    (tmp_path / "README.md").write_text("readme")
+    (tmp_path / "untracked_dir").mkdir()
+    (tmp_path / "untracked_dir/file.txt").write_text("untracked")
+    (tmp_path / "deleted.txt").write_text("gone")
+    repo = Repo(tmp_path)
+    repo.index.add(["src/pkg/mod.py", "README.md", "deleted.txt"])
+    (tmp_path / "deleted.txt").unlink()
+
+    tools = FileTools(allowed_paths=[str(tmp_path)])
+    tree, dirs, files = await tools.file_tree_with_counts(str(tmp_path))
+
+    assert tree.splitlines() == ["├── src", "│   └── pkg", "│       └── mod.py", "└── README.md"]
+    assert (dirs, files) == (2, 2)
+    assert (await tools.file_tree(str(tmp_path))).endswith("2 directories, 2 files")
+
+
+@pytest.mark.asyncio
+async def test_read_file_range(file_tools):
+    test_file = TEST_DIR / "range.txt"
+    test_file.write_text("one\ntwo\nthree\n")
+
+    assert await file_tools.read_file(str(test_file), start_line=2, end_line=2) == "two\n"
+    assert await file_tools.read_file(str(test_file), byte_offset=4, byte_length=3) == "two"
+    truncated = await file_tools.read_file(str(test_file), max_bytes=3)
+    assert truncated.startswith("one\n[truncated: showing 3 of 14 bytes]")
+
+
+@pytest.mark.asyncio
+async def test_read_multiple_files(file_tools):
+    (TEST_DIR / "a.txt").write_text("content a")
+    (TEST_DIR / "b.txt").write_text("content b")
+    paths = [str(TEST_DIR / "b.txt"), str(TEST_DIR / "missing.txt"), "/outside/allowed.txt", str(TEST_DIR / "a.txt")]
+
+    results = await file_tools.read_multiple_files(paths, max_concurrency=2)
+
+    assert list(results) == paths
+    assert results[paths[0]] == {"content": "content b"}
+    assert "error" in results[paths[1]]
+    assert "outside allowed directories" in results[paths[2]]["error"]
+    assert results[paths[3]] == {"content": "content a"}
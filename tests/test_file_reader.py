@@ -0,0 +1,42 @@
+import pytest
+from mcp_server_code_assist.tools import file_reader
+from mcp_server_code_assist.tools.file_reader import read_range
+
+
+@pytest.fixture(params=[False, True], ids=["read", "mmap"])
+def lines_file(request, tmp_path, monkeypatch):
+    if request.param:
+        monkeypatch.setattr(file_reader, "MMAP_THRESHOLD", 1)
+        monkeypatch.setattr(file_reader, "SCAN_CHUNK_SIZE", 7)
+    path = tmp_path / "lines.txt"
+    path.write_text("".join(f"line {i}\n" for i in range(1, 21)))
+    return path
+
+
+def test_line_range(lines_file):
+    content, returned, requested = read_range(lines_file, start_line=3, end_line=5)
+    assert content == "line 3\nline 4\nline 5\n"
+    assert returned == requested == len(content)
+
+    assert read_range(lines_file, start_line=19)[0] == "line 19\nline 20\n"
+    assert read_range(lines_file, end_line=1)[0] == "line 1\n"
+    assert read_range(lines_file, start_line=25)[0] == ""
+    assert read_range(lines_file, start_line=20, end_line=30)[0] == "line 20\n"
+
+
+def test_byte_range_and_max_bytes(lines_file):
+    assert read_range(lines_file, byte_offset=7, byte_length=6)[0] == "line 2"
+    content, returned, requested = read_range(lines_file, start_line=1, end_line=2, max_bytes=4)
+    assert content == "line"
+    assert (returned, requested) == (4, 14)
+
+
+def test_rejects_mixed_ranges(lines_file):
+    with pytest.raises(ValueError):
+        read_range(lines_file, start_line=1, byte_offset=0)
+
+
+def test_empty_file(tmp_path):
+    path = tmp_path / "empty.txt"
+    path.write_bytes(b"")
+    assert read_range(path, start_line=1, end_line=2) == ("", 0, 0)
@@ -0,0 +1,79 @@
+import os
+
+import pytest
+from mcp_server_code_assist.tools import file_writer
+from mcp_server_code_assist.tools.file_tools import FileTools
+from mcp_server_code_assist.tools.file_writer import atomic_write, configure_fsync_policy
+
+
+def test_atomic_write_keeps_mode_and_leaves_no_temp_files(tmp_path):
+    path = tmp_path / "script.sh"
+    path.write_text("old")
+    os.chmod(path, 0o751)
+
+    atomic_write(path, b"new")
+    assert path.read_bytes() == b"new"
+    assert os.stat(path).st_mode & 0o777 == 0o751
+    assert os.listdir(tmp_path) == ["script.sh"]
+
+
+def test_atomic_write_new_file_uses_umask(tmp_path):
+    umask = os.umask(0o022)
+    try:
+        atomic_write(tmp_path / "new.txt", b"data")
+    finally:
+        os.umask(umask)
+    assert os.stat(tmp_path / "new.txt").st_mode & 0o777 == 0o644
+
+
+def test_atomic_write_writes_through_symlinks(tmp_path):
+    (tmp_path / "target.txt").write_text("old")
+    os.symlink(tmp_path / "target.txt", tmp_path / "link.txt")
+    atomic_write(tmp_path / "link.txt", b"new")
+    assert os.path.islink(tmp_path / "link.txt")
+    assert (tmp_path / "target.txt").read_text() == "new"
+
+
+def test_atomic_write_failure_keeps_original(tmp_path, monkeypatch):
+    path = tmp_path / "file.txt"
+    path.write_text("original")
+
+    def fail(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(file_writer.os, "replace", fail)
+    with pytest.raises(OSError, match="disk full"):
+        atomic_write(path, b"new")
+    assert path.read_text() == "original"
+    assert os.listdir(tmp_path) == ["file.txt"]
+
+
+@pytest.mark.parametrize("policy, expected_syncs", [("none", 0), ("file", 1), ("file+dir", 2)])
+def test_atomic_write_fsync_policy(tmp_path, monkeypatch, policy, expected_syncs):
+    syncs = []
+    monkeypatch.setattr(file_writer.os, "fsync", syncs.append)
+    atomic_write(tmp_path / "file.txt", b"data", policy)
+    assert len(syncs) == expected_syncs
+
+
+def test_invalid_fsync_policy(tmp_path):
+    with pytest.raises(ValueError, match="Invalid fsync policy"):
+        atomic_write(tmp_path / "file.txt", b"data", "always")
+    with pytest.raises(ValueError, match="Invalid fsync policy"):
+        configure_fsync_policy("always")
+
+
+@pytest.mark.asyncio
+async def test_modify_file_writes_atomically(tmp_path, monkeypatch):
+    writes = []
+    real_write = file_writer.atomic_write
+    monkeypatch.setattr("mcp_server_code_assist.tools.file_tools.atomic_write", lambda path, data, fsync: writes.append(fsync) or real_write(path, data, fsync))
+    configure_fsync_policy("none")
+    try:
+        tools = FileTools(allowed_paths=[str(tmp_path)])
+        await tools.create_file(str(tmp_path / "mod.py"), "x = 1\n")
+        await tools.modify_file(str(tmp_path / "mod.py"), {"x = 1": "x = 2"})
+    finally:
+        configure_fsync_policy(file_writer.DEFAULT_FSYNC_POLICY)
+    assert (tmp_path / "mod.py").read_text() == "x = 2\n"
+    assert writes == ["none", "none"]
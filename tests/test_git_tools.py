@@ -1,6 +1,13 @@
+import asyncio
+import json
+import threading
+import time
+
 import pytest
 from git import Repo
-from mcp_server_code_assist.tools.git_tools import GitTools
+from mcp_server_code_assist.tools.git_tools import INDEX_LOCK, GitTools
+from mcp_server_code_assist.tools.models import GitDiff
+from pydantic import ValidationError
 
 
 @pytest.fixture
@@ -80,3 +87,95 @@ class TestGitTools:
         # Test showing HEAD (latest commit)
         head_output = await git_tools.show(str(repo_path))
         assert "modified commit" in head_output
+
+    @pytest.mark.asyncio
+    async def test_git_work_runs_off_loop_with_per_repo_locks(self, git_tools, repo_path):
+        active = []
+        overlaps = []
+
+        def work(repo):
+            active.append(repo.working_dir)
+            overlaps.append(len(active))
+            time.sleep(0.05)
+            active.remove(repo.working_dir)
+            return threading.current_thread().name
+
+        locked = await asyncio.gather(*(git_tools._run(str(repo_path), work, INDEX_LOCK) for _ in range(3)))
+        assert all(name.startswith("mcp-git") for name in locked)
+        assert max(overlaps) == 1
+
+        overlaps.clear()
+        await asyncio.gather(*(git_tools._run(str(repo_path), work) for _ in range(3)))
+        assert max(overlaps) > 1
+
+    @pytest.mark.asyncio
+    async def test_log_pagination(self, git_tools, repo_path):
+        repo = Repo(repo_path)
+        for i in range(5):
+            name = "docs.txt" if i % 2 else "code.txt"
+            (repo_path / name).write_text(str(i))
+            repo.index.add([name])
+            repo.index.commit(f"commit {i}")
+
+        first = await git_tools.log_page(str(repo_path), max_count=2)
+        assert [c["summary"] for c in first["commits"]] == ["commit 4", "commit 3"]
+
+        # New commits do not shift later pages
+        (repo_path / "code.txt").write_text("new")
+        repo.index.add(["code.txt"])
+        repo.index.commit("commit 5")
+
+        second = await git_tools.log_page(str(repo_path), max_count=2, cursor=first["next_cursor"])
+        assert [c["summary"] for c in second["commits"]] == ["commit 2", "commit 1"]
+        third = json.loads(await git_tools.log(str(repo_path), 2, cursor=second["next_cursor"]))
+        assert [c["summary"] for c in third["commits"]] == ["commit 0"]
+        assert third["next_cursor"] is None
+
+        docs = await git_tools.log_page(str(repo_path), max_count=10, path="docs.txt")
+        assert [c["summary"] for c in docs["commits"]] == ["commit 3", "commit 1"]
+
+        with pytest.raises(ValueError):
+            await git_tools.log_page(str(repo_path), cursor="bogus")
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("cursor", ["--all:0", "--output={target}:0", "HEAD:0", "abc123:0", "{sha}:x", "{sha}"])
+    async def test_log_rejects_malformed_cursor(self, git_tools, repo_path, tmp_path, cursor):
+        target = tmp_path / "pwned"
+        cursor = cursor.format(target=target, sha="a" * 40)
+        with pytest.raises(ValueError, match="Invalid log cursor"):
+            await git_tools.log_page(str(repo_path), cursor=cursor)
+        assert not target.exists()
+
+    @pytest.mark.asyncio
+    async def test_diff_bounded(self, git_tools, repo_path):
+        repo = Repo(repo_path)
+        names = ["a.txt", "b.txt", "c.txt"]
+        for name in names:
+            (repo_path / name).write_text("".join(f"line {i}\n" for i in range(40)))
+        repo.index.add(names)
+        repo.index.commit("initial")
+        for name in names:
+            (repo_path / name).write_text("".join(f"line {i}{' changed' if i in (1, 30) else ''}\n" for i in range(40)))
+
+        numstat = await git_tools.diff(str(repo_path), mode="numstat")
+        assert numstat.splitlines() == [f"2\t2\t{name}" for name in names]
+
+        only_b = await git_tools.diff(str(repo_path), paths=["b.txt"])
+        assert "b.txt" in only_b and "a.txt" not in only_b
+
+        limited = await git_tools.diff(str(repo_path), max_hunks_per_file=1)
+        assert limited.count("[1 more hunk(s) omitted]") == 3
+        assert "+line 30 changed" not in limited
+
+        first = await git_tools.diff(str(repo_path), max_bytes=500)
+        assert "a.txt" in first and "c.txt" not in first
+        cursor = first.rsplit("cursor=", 1)[1].split()[0]
+        rest = await git_tools.diff(str(repo_path), cursor=cursor)
+        assert "a.txt" not in rest and "c.txt" in rest
+
+        with pytest.raises(ValueError):
+            await git_tools.diff(str(repo_path), mode="bogus")
+        with pytest.raises(ValueError, match="only apply to mode 'patch'"):
+            await git_tools.diff(str(repo_path), mode="stat", max_bytes=10)
+        with pytest.raises(ValidationError):
+            GitDiff(repo_path=str(repo_path), mode="numstat", cursor="1")
@@ -0,0 +1,117 @@
+import os
+from collections import OrderedDict
+
+import pytest
+from mcp_server_code_assist.tools import ignore, tree_index
+from mcp_server_code_assist.tools.file_tools import FileTools
+from mcp_server_code_assist.tools.ignore import IgnoreMatcher, IgnoreRules, get_ignore_matcher
+from mcp_server_code_assist.tools.tree_index import TreeIndex
+
+
+pytestmark = pytest.mark.usefixtures("no_racy_window")
+
+
+@pytest.mark.parametrize(
+    "pattern, path, is_dir, expected",
+    [
+        ("*.pyc", "a/b/mod.pyc", False, True),
+        ("*.pyc", "mod.py", False, None),
+        ("/build", "build", True, True),
+        ("/build", "src/build", True, None),
+        ("doc/*.txt", "doc/notes.txt", False, True),
+        ("doc/*.txt", "doc/sub/notes.txt", False, None),
+        ("logs/", "logs", True, True),
+        ("logs/", "logs", False, None),
+        ("**/cache", "a/b/cache", True, True),
+        ("a/**/z", "a/z", False, True),
+        ("a/**/z", "a/b/c/z", False, True),
+        ("out/**", "out/x/y", False, True),
+        ("out/**", "out", True, None),
+        ("file[0-9].txt", "file3.txt", False, True),
+        ("file[!0-9].txt", "file3.txt", False, None),
+        ("\\#hash", "#hash", False, True),
+        ("\\!bang", "!bang", False, True),
+        ("trailing   ", "trailing", False, True),
+    ],
+)
+def test_ignore_rules_patterns(pattern, path, is_dir, expected):
+    assert IgnoreRules([pattern]).match(path, is_dir) is expected
+
+
+def test_ignore_rules_last_match_wins():
+    rules = IgnoreRules(["*.log", "!keep.log", "# comment", "", "keep.log"])
+    assert rules.match("debug.log", False) is True
+    assert rules.match("keep.log", False) is True
+    assert IgnoreRules(["*.log", "!keep.log"]).match("keep.log", False) is False
+
+
+def test_ignore_matcher_precedence(tmp_path):
+    (tmp_path / ".git/info").mkdir(parents=True)
+    (tmp_path / ".git/info/exclude").write_text("*.tmp\nsecret\n")
+    (tmp_path / ".gitignore").write_text("*.log\n!secret\n")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub/.gitignore").write_text("!important.log\n/local\n")
+
+    matcher = IgnoreMatcher(tmp_path)
+    assert matcher.is_ignored(".git", True)
+    assert matcher.is_ignored("x.tmp", False)
+    assert not matcher.is_ignored("secret", False)
+    assert matcher.is_ignored("sub/debug.log", False)
+    assert not matcher.is_ignored("sub/important.log", False)
+    assert matcher.is_ignored("important.log", False)
+    assert matcher.is_ignored("sub/local", True)
+    assert not matcher.is_ignored("local", True)
+    assert matcher.is_path_ignored("sub/local/any.txt")
+
+
+def test_ignore_matcher_reloads_changed_files(tmp_path):
+    (tmp_path / ".gitignore").write_text("a.txt\n")
+    matcher = IgnoreMatcher(tmp_path)
+    assert matcher.is_ignored("a.txt", False)
+
+    (tmp_path / ".gitignore").write_text("b.txt\n")
+    st = os.stat(tmp_path / ".gitignore")
+    os.utime(tmp_path / ".gitignore", ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+    assert matcher.is_ignored("a.txt", False)
+    matcher.refresh()
+    assert not matcher.is_ignored("a.txt", False)
+    assert matcher.is_ignored("b.txt", False)
+
+
+def test_file_tree_prunes_ignored_dirs(tmp_path, monkeypatch):
+    (tmp_path / ".gitignore").write_text("node_modules/\n")
+    (tmp_path / "node_modules/pkg").mkdir(parents=True)
+    (tmp_path / "node_modules/pkg/index.js").write_text("x")
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src/.gitignore").write_text("*.gen.js\n")
+    (tmp_path / "src/app.js").write_text("x")
+    (tmp_path / "src/app.gen.js").write_text("x")
+
+    scanned = []
+    real_scandir = os.scandir
+    monkeypatch.setattr(tree_index.os, "scandir", lambda path: scanned.append(str(path)) or real_scandir(path))
+
+    tools = FileTools(allowed_paths=[str(tmp_path)])
+    index = TreeIndex(tmp_path)
+    text, dirs, files = index.file_tree(tools._get_tracked_files, IgnoreMatcher(tmp_path))
+    assert "node_modules" not in text
+    assert "app.gen.js" not in text
+    assert "app.js" in text
+    assert (dirs, files) == (1, 3)
+    assert not any("node_modules" in path for path in scanned)
+
+    # Editing a nested .gitignore does not change any directory mtime
+    (tmp_path / "src/.gitignore").write_text("app.js\n")
+    text, _, _ = index.file_tree(tools._get_tracked_files, IgnoreMatcher(tmp_path))
+    assert {line.split()[-1] for line in text.splitlines()} == {"src", ".gitignore", "app.gen.js"}
+
+
+def test_ignore_matchers_are_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(ignore, "MAX_IGNORE_MATCHERS", 2)
+    monkeypatch.setattr(ignore, "_matchers", OrderedDict())
+    first = get_ignore_matcher(tmp_path / "a")
+    get_ignore_matcher(tmp_path / "b")
+    get_ignore_matcher(tmp_path / "a")
+    get_ignore_matcher(tmp_path / "c")
+    assert list(ignore._matchers) == [tmp_path / "a", tmp_path / "c"]
+    assert get_ignore_matcher(tmp_path / "a") is first
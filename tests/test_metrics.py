@@ -0,0 +1,91 @@
+import json
+
+import pytest
+from mcp.types import CallToolRequest, CallToolRequestParams
+from mcp_server_code_assist.metrics import ServerMetrics, configure_metrics_snapshots, get_metrics, write_snapshot
+from mcp_server_code_assist.server import create_server
+from mcp_server_code_assist.tools.content_cache import get_content_cache
+
+
+async def call(server, name, arguments):
+    request = CallToolRequest(method="tools/call", params=CallToolRequestParams(name=name, arguments=arguments))
+    result = await server.request_handlers[CallToolRequest](request)
+    return result.root
+
+
+def test_percentiles_within_bucket_error():
+    metrics = ServerMetrics()
+    for ms in range(1, 101):
+        metrics.record("read_file", ms / 1000)
+
+    latency = metrics.snapshot()["tools"]["read_file"]["latency_seconds"]
+
+    assert latency["p50"] == pytest.approx(0.050, rel=0.1)
+    assert latency["p95"] == pytest.approx(0.095, rel=0.1)
+    assert latency["p99"] == pytest.approx(0.099, rel=0.1)
+    assert latency["max"] == 0.1
+
+
+def test_track_counts_errors_and_bytes():
+    metrics = ServerMetrics()
+    with metrics.track("rewrite_file") as record:
+        record.response_bytes = 10
+    with pytest.raises(ValueError), metrics.track("rewrite_file"):
+        raise ValueError("boom")
+
+    stats = metrics.snapshot()["tools"]["rewrite_file"]
+    assert stats["calls"] == 2
+    assert stats["errors"] == 1
+    assert stats["response_bytes"] == {"total": 10, "mean": 5.0, "max": 10}
+
+
+def test_track_attributes_cache_lookups(tmp_path):
+    metrics = ServerMetrics()
+    cache = get_content_cache()
+    path = str(tmp_path / "a.txt")
+    cache.put(path, 1, 7, "content")
+
+    with metrics.track("read_file"):
+        cache.get(path, 1, 7)
+
+    assert metrics.snapshot()["tools"]["read_file"]["cache"]["content"] == {"hits": 1, "misses": 0, "hit_rate": 1.0}
+
+
+def test_write_snapshot_appends_lines(tmp_path):
+    metrics = ServerMetrics()
+    metrics.record("git_status", 0.01)
+    path = tmp_path / "stats" / "snapshots.jsonl"
+
+    write_snapshot(path, metrics)
+    write_snapshot(path, metrics)
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len(lines) == 2
+    assert lines[0]["tools"]["git_status"]["calls"] == 1
+    assert "content" in lines[0]["caches"]
+
+
+def test_snapshot_interval_must_be_positive():
+    with pytest.raises(ValueError):
+        configure_metrics_snapshots(None, 0)
+
+
+@pytest.mark.asyncio
+async def test_server_stats_tool_reports_calls(tmp_path):
+    (tmp_path / "a.txt").write_text("hello")
+    server = create_server(tmp_path)
+    get_metrics().reset()
+
+    await call(server, "read_file", {"path": str(tmp_path / "a.txt")})
+    await call(server, "read_file", {"path": str(tmp_path / "missing.txt")})
+    await call(server, "no_such_tool", {})
+    result = await call(server, "server_stats", {"reset": True})
+
+    stats = json.loads(result.content[0].text)
+    assert stats["tools"]["read_file"]["calls"] == 2
+    assert stats["tools"]["read_file"]["errors"] == 1
+    assert stats["tools"]["read_file"]["response_bytes"]["total"] == 5
+    assert stats["tools"]["<unknown>"]["errors"] == 1
+    assert "no_such_tool" not in stats["tools"]
+    assert set(stats["caches"]) == {"content", "status", "repo_pool", "tool_registry"}
+    assert list(get_metrics().snapshot()["tools"]) == ["server_stats"]
@@ -0,0 +1,55 @@
+import pytest
+from mcp_server_code_assist.tools.file_tools import FileTools
+from mcp_server_code_assist.tools.replace import replace_all
+
+
+def test_replace_all_counts_matches():
+    content, counts = replace_all("a b a c", {"a": "x", "c": "y", "z": "w"})
+    assert content == "x b x y"
+    assert counts == {"a": 2, "c": 1, "z": 0}
+
+
+def test_replace_all_does_not_rescan_replaced_text():
+    content, counts = replace_all("foo bar", {"foo": "bar", "bar": "baz"})
+    assert content == "bar baz"
+    assert counts == {"foo": 1, "bar": 1}
+
+
+def test_replace_all_prefers_longest_pattern():
+    content, counts = replace_all("value = values", {"value": "v", "values": "vs"})
+    assert content == "v = vs"
+    assert counts == {"value": 1, "values": 1}
+
+
+def test_replace_all_escapes_patterns():
+    content, _ = replace_all("x.*y x+y", {".*": "-", "+": "_"})
+    assert content == "x-y x_y"
+
+
+def test_replace_all_strict():
+    assert replace_all("one two", {"one": "1"}, strict=True)[0] == "1 two"
+    with pytest.raises(ValueError, match="not found: 'three'"):
+        replace_all("one two", {"one": "1", "three": "3"}, strict=True)
+    with pytest.raises(ValueError, match="found 2 times: 'o'"):
+        replace_all("one two", {"o": "0"}, strict=True)
+
+
+def test_replace_all_rejects_empty_pattern():
+    with pytest.raises(ValueError, match="must not be empty"):
+        replace_all("text", {"": "x"})
+
+
+@pytest.mark.asyncio
+async def test_modify_file_strict_leaves_file_unchanged(tmp_path):
+    path = tmp_path / "mod.py"
+    path.write_text("x = 1\ny = 1\n")
+    tools = FileTools([str(tmp_path)])
+
+    with pytest.raises(ValueError, match="found 2 times"):
+        await tools.modify_file(str(path), {"= 1": "= 2"}, strict=True)
+    assert path.read_text() == "x = 1\ny = 1\n"
+
+    diff, counts = await tools.modify_file_with_counts(str(path), {"x = 1": "x = 2", "y = 1": "y = 3"}, strict=True)
+    assert counts == {"x = 1": 1, "y = 1": 1}
+    assert "+x = 2" in diff and "+y = 3" in diff
+    assert path.read_text() == "x = 2\ny = 3\n"
@@ -0,0 +1,74 @@
+import time
+
+import pytest
+from git import Repo
+from git.exc import InvalidGitRepositoryError
+from mcp_server_code_assist.tools.git_tools import GitTools
+from mcp_server_code_assist.tools.repo_pool import RepoPool
+
+
+@pytest.fixture
+def repo_path(tmp_path):
+    repo = tmp_path / "test_repo"
+    repo.mkdir()
+    Repo.init(repo)
+    return repo
+
+
+def test_repo_handles_are_reused(repo_path):
+    pool = RepoPool()
+    with pool.repo(repo_path) as first:
+        pass
+    with pool.repo(str(repo_path) + "/") as second:
+        pass
+    assert first is second
+    assert pool.stats() == {"repos": 1, "opened": 1, "reused": 1}
+
+
+def test_invalid_repo_is_not_pooled(tmp_path):
+    pool = RepoPool()
+    with pytest.raises(InvalidGitRepositoryError):
+        pool.validate(tmp_path)
+    assert pool.stats()["repos"] == 0
+
+
+def test_idle_handles_are_closed(repo_path, tmp_path, monkeypatch):
+    other_path = tmp_path / "other_repo"
+    Repo.init(other_path)
+    pool = RepoPool(idle_timeout=60, max_repos=1)
+    closed = []
+
+    with pool.repo(repo_path) as outer:
+        with pool.repo(other_path) as inner:
+            for handle in (outer, inner):
+                monkeypatch.setattr(handle, "close", lambda path=handle.working_dir: closed.append(path))
+            # Handles in use are never evicted, even over max_repos
+            assert pool.evict_idle() == 0
+    assert closed == [str(other_path)]
+
+    with pool.repo(other_path) as repo:
+        last_used = pool._repos[repo.working_dir].last_used
+    assert pool.evict_idle(now=last_used + 61) == 1
+    assert pool.stats()["repos"] == 0
+
+
+def test_idle_handles_are_closed_when_another_is_borrowed(repo_path, tmp_path):
+    other_path = tmp_path / "other_repo"
+    Repo.init(other_path)
+    pool = RepoPool(idle_timeout=0.05)
+    pool.validate(repo_path)
+    assert pool._validated == {str(repo_path)}
+    time.sleep(0.1)
+
+    with pool.repo(other_path):
+        assert list(pool._repos) == [str(other_path)]
+    assert pool._validated == set()
+
+
+@pytest.mark.asyncio
+async def test_git_tools_share_pool(repo_path):
+    pool = RepoPool()
+    git_tools = GitTools([str(repo_path)], repo_pool=pool)
+    await git_tools.status(str(repo_path))
+    await git_tools.diff(str(repo_path))
+    assert pool.stats()["opened"] == 1
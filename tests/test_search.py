@@ -0,0 +1,84 @@
+import time
+
+import pytest
+from git import Repo
+from mcp_server_code_assist.tools import file_reader, search
+from mcp_server_code_assist.tools.file_tools import FileTools
+from mcp_server_code_assist.tools.search import compile_pattern, search_file
+
+
+pytestmark = pytest.mark.usefixtures("no_racy_window")
+
+
+@pytest.mark.parametrize("window_bytes", [search.SEARCH_WINDOW_BYTES, 1])
+@pytest.mark.parametrize("mmap_threshold", [file_reader.MMAP_THRESHOLD, 1])
+def test_search_file_lines_and_context(tmp_path, monkeypatch, mmap_threshold, window_bytes):
+    monkeypatch.setattr(search, "MMAP_THRESHOLD", mmap_threshold)
+    monkeypatch.setattr(search, "SEARCH_WINDOW_BYTES", window_bytes)
+    path = tmp_path / "mod.py"
+    path.write_text("import os\n\ndef foo():\n    return foo_bar()\n\nfoo()\n")
+
+    matches = search_file(path, compile_pattern("foo"), context_lines=1)
+    assert [m["line"] for m in matches] == [3, 4, 6]
+    assert matches[0] == {"line": 3, "text": "def foo():", "before": [""], "after": ["    return foo_bar()"]}
+    assert matches[2]["after"] == []
+
+    assert search_file(path, compile_pattern("FOO_BAR(", literal=True, ignore_case=True)) == [{"line": 4, "text": "    return foo_bar()"}]
+    assert len(search_file(path, compile_pattern("^"), max_matches=2)) == 2
+
+
+def test_search_file_stops_at_deadline(tmp_path, monkeypatch):
+    monkeypatch.setattr(search, "SEARCH_WINDOW_BYTES", 1)
+    path = tmp_path / "slow.txt"
+    # Each line takes the backtracking pattern about 0.1s
+    path.write_text(("a" * 20 + "\n") * 100)
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        search_file(path, compile_pattern("(a+)+b"), deadline=started + 0.2)
+    assert time.monotonic() - started < 2
+
+
+def test_search_file_skips_binary(tmp_path):
+    path = tmp_path / "blob.bin"
+    path.write_bytes(b"match\0binary")
+    assert search_file(path, compile_pattern("match")) is None
+
+
+def test_compile_pattern_rejects_invalid_regex():
+    with pytest.raises(ValueError, match="Invalid search pattern"):
+        compile_pattern("(")
+
+
+@pytest.mark.asyncio
+async def test_search_code_honors_ignore_rules(tmp_path):
+    (tmp_path / ".gitignore").write_text("node_modules/\n")
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "node_modules/lib.js").write_text("needle")
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src/a.py").write_text("x = 1\nneedle = 2\n")
+    (tmp_path / "src/b.txt").write_text("needle\n")
+
+    tools = FileTools(allowed_paths=[str(tmp_path)])
+    result = await tools.search_code(str(tmp_path), "needle")
+    assert [(m["path"], m["line"]) for m in result["matches"]] == [("src/a.py", 2), ("src/b.txt", 1)]
+    assert not result["truncated"] and not result["timed_out"]
+
+    result = await tools.search_code(str(tmp_path), "needle", include="*.py")
+    assert [m["path"] for m in result["matches"]] == ["src/a.py"]
+
+    result = await tools.search_code(str(tmp_path), "needle", max_results=1)
+    assert [m["path"] for m in result["matches"]] == ["src/a.py"]
+    assert result["truncated"]
+
+
+@pytest.mark.asyncio
+async def test_search_code_tracked_files_only(tmp_path):
+    repo = Repo.init(tmp_path)
+    (tmp_path / "tracked.py").write_text("needle\n")
+    (tmp_path / "untracked.py").write_text("needle\n")
+    repo.index.add(["tracked.py"])
+
+    tools = FileTools(allowed_paths=[str(tmp_path)])
+    result = await tools.search_code(str(tmp_path), "needle")
+    assert [m["path"] for m in result["matches"]] == ["tracked.py"]
+    assert result["files_searched"] == 1
@@ -1,6 +1,7 @@
 import pytest
 from git import Repo
-from mcp_server_code_assist.server import process_instruction
+from mcp_server_code_assist.server import TOOL_DEFINITIONS, CodeAssistTools, build_tool_catalog, process_instruction, process_instructions
+from mcp_server_code_assist.tools.models import GitShow
 
 
 @pytest.fixture
@@ -17,3 +18,58 @@ def test_repo(tmp_path):
 async def test_invalid_instruction(test_repo):
     response = await process_instruction({"type": "invalid"}, test_repo)
     assert response["error"] == "Unknown instruction type: invalid"
+
+
+@pytest.mark.asyncio
+async def test_read_multiple_instruction(test_repo):
+    response = await process_instruction({"type": "read_multiple", "paths": [str(test_repo / "test.txt")]}, test_repo)
+    assert response["contents"] == {str(test_repo / "test.txt"): {"content": "test"}}
+
+
+@pytest.mark.asyncio
+async def test_process_instructions_keeps_order_per_path(test_repo):
+    target = str(test_repo / "plan.txt")
+    instructions = [
+        {"type": "create_file", "path": target, "content": "step 0"},
+        {"type": "read_file", "path": str(test_repo / "test.txt")},
+        {"type": "modify_file", "path": target, "replacements": {"step 0": "step 1"}},
+        {"type": "invalid"},
+        {"type": "read_file", "path": target},
+        {"type": "git_status"},
+    ]
+
+    results = await process_instructions(instructions, test_repo)
+
+    assert len(results) == len(instructions)
+    assert "Created file" in results[0]["message"]
+    assert results[1] == {"content": "test"}
+    assert "+step 1" in results[2]["diff"]
+    assert results[3]["error"] == "Unknown instruction type: invalid"
+    assert results[4] == {"content": "step 1"}
+    assert "plan.txt" in results[5]["status"]
+
+
+def test_tool_catalog_matches_definitions():
+    tools = build_tool_catalog()
+    assert [tool.name for tool in tools] == [name for name, _, _ in TOOL_DEFINITIONS]
+    assert set(CodeAssistTools) == {tool.name for tool in tools}
+    file_tree = next(tool for tool in tools if tool.name == CodeAssistTools.FILE_TREE)
+    assert set(file_tree.inputSchema["properties"]) == {"path"}
+
+
+def test_git_show_accepts_commit_or_revision():
+    assert GitShow.model_validate({"repo_path": "/repo", "commit": "HEAD"}).revision == "HEAD"
+    assert GitShow.model_validate({"repo_path": "/repo", "revision": "HEAD~1"}).revision == "HEAD~1"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("instruction", [{"type": "create_file"}, {"type": "modify_file", "path": "x.txt"}, {"type": "rewrite_file", "path": "x.txt"}, {"type": "symbol_outline"}])
+async def test_malformed_instruction_reports_validation_error(test_repo, instruction):
+    response = await process_instruction(instruction, test_repo)
+    assert "validation error" in response["error"]
+
+
+@pytest.mark.asyncio
+async def test_instruction_without_type(test_repo):
+    response = await process_instruction({"path": "x.txt"}, test_repo)
+    assert response["error"] == "Unknown instruction type: None"
@@ -0,0 +1,18 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+# Seconds from importing the package to the first initialize response
+STARTUP_BUDGET = 3.0
+
+SRC = Path(__file__).parent.parent / "src"
+
+
+def test_startup_within_budget(tmp_path):
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(SRC), os.environ.get("PYTHONPATH")]))}
+    result = subprocess.run([sys.executable, "-m", "mcp_server_code_assist", "--import-profile"], cwd=tmp_path, env=env, capture_output=True, text=True, timeout=60, check=True)
+    profile = json.loads(result.stdout)
+    assert profile["lazy_modules_loaded"] == []
+    assert profile["total_seconds"] < STARTUP_BUDGET, profile
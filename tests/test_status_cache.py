@@ -0,0 +1,79 @@
+import json
+
+import pytest
+from git import Repo
+from mcp_server_code_assist.prompts.prompt_manager import handle_prompt
+from mcp_server_code_assist.tools.file_tools import FileTools
+from mcp_server_code_assist.tools.git_tools import GitTools
+from mcp_server_code_assist.tools.status_cache import StatusCache, parse_porcelain_v2
+
+
+@pytest.fixture
+def repo_path(tmp_path):
+    repo = Repo.init(tmp_path / "repo")
+    path = tmp_path / "repo"
+    (path / "tracked.txt").write_text("tracked")
+    repo.index.add(["tracked.txt"])
+    repo.index.commit("initial")
+    return path
+
+
+def test_parse_porcelain_v2():
+    output = "\0".join([
+        "# branch.oid 1234",
+        "# branch.head main",
+        "# branch.upstream origin/main",
+        "# branch.ab +2 -1",
+        "1 .M N... 100644 100644 100644 aaaa bbbb file with space.txt",
+        "2 R. N... 100644 100644 100644 aaaa bbbb R100 new.txt",
+        "old.txt",
+        "? untracked.txt",
+        "",
+    ])
+    status = parse_porcelain_v2(output)
+    assert status["branch"] == {"oid": "1234", "head": "main", "upstream": "origin/main", "ahead": 2, "behind": 1}
+    assert status["entries"] == [
+        {"type": "changed", "xy": ".M", "path": "file with space.txt"},
+        {"type": "renamed", "xy": "R.", "score": "R100", "path": "new.txt", "orig_path": "old.txt"},
+        {"type": "untracked", "path": "untracked.txt"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_status_cached_until_repo_changes(repo_path):
+    cache = StatusCache()
+    git_tools = GitTools([str(repo_path)], status_cache=cache)
+    file_tools = FileTools([str(repo_path)])
+
+    assert "nothing to commit" in await git_tools.status(str(repo_path))
+    assert "nothing to commit" in await git_tools.status(str(repo_path))
+    assert cache.stats()["hits"] == 1
+
+    # Writes through FileTools invalidate the cached status
+    await file_tools.write_file(str(repo_path / "new.txt"), "new")
+    entries = json.loads(await git_tools.status(str(repo_path), structured=True))["entries"]
+    assert entries == [{"type": "untracked", "path": "new.txt"}]
+
+    # So do index changes made outside the server
+    Repo(repo_path).index.add(["new.txt"])
+    entries = (await git_tools.status_entries(str(repo_path)))["entries"]
+    assert entries[0]["type"] == "changed" and entries[0]["xy"] == "A."
+
+
+@pytest.mark.asyncio
+async def test_git_prompt_includes_status(repo_path):
+    result = await handle_prompt("git-advanced", {"operation": "rebase", "repo_path": str(repo_path)})
+    assert "nothing to commit" in result.messages[0].content.text
+
+
+def test_status_put_skipped_after_invalidation(tmp_path):
+    cache = StatusCache()
+    root = str(tmp_path.resolve())
+    generation = cache.generation(root)
+    # A write lands while status is being computed
+    cache.invalidate_path(tmp_path / "a.txt")
+    cache.put(root, ("stamp",), "text", "stale", generation)
+    assert cache.get(root, ("stamp",), "text") is None
+
+    cache.put(root, ("stamp",), "text", "fresh", cache.generation(root))
+    assert cache.get(root, ("stamp",), "text") == "fresh"
@@ -0,0 +1,147 @@
+from collections import OrderedDict
+
+import pytest
+from mcp_server_code_assist.tools import symbols
+from mcp_server_code_assist.tools.file_tools import FileTools
+from mcp_server_code_assist.tools.symbols import SymbolIndex, extract_symbols, get_symbol_index
+
+SOURCE = b"""
+import sys
+
+VERSION = "1.0"
+first, (second, third) = 1, (2, 3)
+count: int = 0
+
+
+class Widget(Base):
+    size = 3
+
+    def render(self):
+        def helper():
+            pass
+
+    class Meta:
+        async def load(self):
+            pass
+
+
+async def main():
+    pass
+
+
+if sys.version_info >= (3, 12):
+    def compat():
+        pass
+"""
+
+
+pytestmark = pytest.mark.usefixtures("no_racy_window")
+
+
+def test_extract_symbols():
+    found = [(s["qualname"], s["kind"], s["line"]) for s in extract_symbols(SOURCE)]
+    assert found == [
+        ("VERSION", "variable", 4),
+        ("first", "variable", 5),
+        ("second", "variable", 5),
+        ("third", "variable", 5),
+        ("count", "variable", 6),
+        ("Widget", "class", 9),
+        ("Widget.render", "method", 12),
+        ("Widget.Meta", "class", 16),
+        ("Widget.Meta.load", "method", 17),
+        ("main", "function", 21),
+        ("compat", "function", 26),
+    ]
+    assert extract_symbols(b"def broken(:\n") == []
+
+
+@pytest.mark.asyncio
+async def test_symbol_index_reparses_changed_files_only(tmp_path, monkeypatch, bump_mtime):
+    (tmp_path / "a.py").write_text("def a():\n    pass\n")
+    (tmp_path / "b.py").write_text("def b():\n    pass\n")
+    (tmp_path / "copy.py").write_text("def a():\n    pass\n")
+
+    parsed = []
+    real_parse = symbols.parse_sources
+    monkeypatch.setattr(symbols, "parse_sources", lambda sources: parsed.extend(sources) or real_parse(sources))
+
+    index = SymbolIndex(tmp_path)
+    result = await index.update(["a.py", "b.py", "copy.py"])
+    assert [s["name"] for s in result["a.py"]] == ["a"]
+    # Files with the same content are parsed once
+    assert len(parsed) == 2
+
+    parsed.clear()
+    assert await index.update(["a.py", "b.py", "copy.py"]) == result
+    assert parsed == []
+
+    (tmp_path / "b.py").write_text("class B:\n    pass\n")
+    bump_mtime(tmp_path / "b.py")
+    result = await index.update(["a.py", "b.py"])
+    assert [s["qualname"] for s in result["b.py"]] == ["B"]
+    assert parsed == [b"class B:\n    pass\n"]
+    assert "copy.py" not in result
+
+
+@pytest.mark.asyncio
+async def test_symbol_index_parses_in_processes(tmp_path, monkeypatch):
+    monkeypatch.setattr(symbols, "INLINE_PARSE_FILES", 0)
+    monkeypatch.setattr(symbols, "PARSE_CHUNK_FILES", 2)
+    files = []
+    for i in range(5):
+        (tmp_path / f"m{i}.py").write_text(f"class C{i}:\n    pass\n")
+        files.append(f"m{i}.py")
+
+    result = await SymbolIndex(tmp_path).update(files)
+    assert [result[f][0]["name"] for f in files] == [f"C{i}" for i in range(5)]
+
+
+@pytest.mark.asyncio
+async def test_find_symbol_and_outline(tmp_path):
+    (tmp_path / ".gitignore").write_text("build/\n")
+    (tmp_path / "build").mkdir()
+    (tmp_path / "build/gen.py").write_bytes(SOURCE)
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg/widgets.py").write_bytes(SOURCE)
+    (tmp_path / "notes.txt").write_text("class Widget")
+
+    tools = FileTools(allowed_paths=[str(tmp_path)])
+    result = await tools.find_symbol(str(tmp_path), "Widget.render")
+    assert result == {"symbols": [{"path": "pkg/widgets.py", "name": "render", "qualname": "Widget.render", "kind": "method", "line": 12, "end_line": 14}], "truncated": False}
+
+    result = await tools.find_symbol(str(tmp_path), "widget", kind="class", exact=False)
+    assert [s["qualname"] for s in result["symbols"]] == ["Widget", "Widget.Meta"]
+
+    outline = await tools.symbol_outline(str(tmp_path))
+    assert list(outline) == ["pkg/widgets.py"]
+    outline = await tools.symbol_outline(str(tmp_path / "pkg/widgets.py"))
+    assert [s["qualname"] for s in outline[str(tmp_path / "pkg/widgets.py")]][:2] == ["VERSION", "first"]
+
+
+@pytest.mark.asyncio
+async def test_file_outline_uses_root_index(tmp_path, monkeypatch):
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg/widgets.py").write_bytes(SOURCE)
+    parsed = []
+    real_parse = symbols.parse_sources
+    monkeypatch.setattr(symbols, "parse_sources", lambda sources: parsed.extend(sources) or real_parse(sources))
+    monkeypatch.setattr(symbols, "_symbol_indexes", OrderedDict())
+
+    tools = FileTools(allowed_paths=[str(tmp_path)])
+    await tools.symbol_outline(str(tmp_path))
+    outline = await tools.symbol_outline(str(tmp_path / "pkg/widgets.py"))
+    assert outline[str(tmp_path / "pkg/widgets.py")][0]["qualname"] == "VERSION"
+    assert len(parsed) == 1
+    assert list(symbols._symbol_indexes) == [tmp_path]
+
+
+def test_symbol_indexes_are_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(symbols, "MAX_SYMBOL_INDEXES", 2)
+    monkeypatch.setattr(symbols, "_symbol_indexes", OrderedDict())
+    first = get_symbol_index(tmp_path / "a")
+    get_symbol_index(tmp_path / "b")
+    get_symbol_index(tmp_path / "a")
+    get_symbol_index(tmp_path / "c")
+    assert list(symbols._symbol_indexes) == [tmp_path / "a", tmp_path / "c"]
+    assert get_symbol_index(tmp_path / "a") is first
@@ -0,0 +1,59 @@
+import pytest
+from git import Repo
+from mcp_server_code_assist.tools.dir_tools import DirTools
+from mcp_server_code_assist.tools.file_tools import FileTools
+from mcp_server_code_assist.tools.git_tools import GitTools
+from mcp_server_code_assist.tools.repo_pool import RepoPool
+from mcp_server_code_assist.tools.tools_manager import ToolRegistry
+
+
+def test_tools_are_reused_per_root_set(tmp_path):
+    first, second = tmp_path / "first", tmp_path / "second"
+    first.mkdir()
+    second.mkdir()
+    registry = ToolRegistry()
+
+    file_tools = registry.get(FileTools, [str(first)])
+    other = registry.get(FileTools, [str(second)])
+    assert other is not file_tools
+    # Switching back reuses the instance, also for another spelling of the same root
+    assert registry.get(FileTools, [str(first) + "/"]) is file_tools
+    assert registry.get(FileTools, [str(first), str(first)]) is file_tools
+    assert registry.stats() == {"root_sets": 2, "built": 2, "reused": 2}
+
+    # Only the requested tool is built
+    assert isinstance(registry.get(DirTools, [str(first)]), DirTools)
+    assert registry.stats()["built"] == 3
+
+
+def test_least_recently_used_root_sets_are_dropped(tmp_path):
+    registry = ToolRegistry(max_root_sets=2)
+    roots = []
+    for name in "abc":
+        (tmp_path / name).mkdir()
+        roots.append([str(tmp_path / name)])
+
+    a = registry.get(DirTools, roots[0])
+    registry.get(DirTools, roots[1])
+    registry.get(DirTools, roots[0])
+    registry.get(DirTools, roots[2])
+    assert registry.stats()["root_sets"] == 2
+    assert registry.get(DirTools, roots[0]) is a
+    assert registry.stats()["built"] == 3
+
+
+def test_invalid_git_roots_are_not_cached(tmp_path):
+    registry = ToolRegistry()
+    with pytest.raises(ValueError, match="Invalid git repository path"):
+        registry.get(GitTools, [str(tmp_path)])
+    Repo.init(tmp_path)
+    assert isinstance(registry.get(GitTools, [str(tmp_path)]), GitTools)
+
+
+def test_repositories_are_validated_once(tmp_path):
+    Repo.init(tmp_path)
+    pool = RepoPool()
+    pool.validate(tmp_path)
+    pool.close_all()
+    pool.validate(str(tmp_path) + "/")
+    assert pool.stats() == {"repos": 0, "opened": 1, "reused": 0}
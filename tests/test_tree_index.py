@@ -0,0 +1,86 @@
+import os
+from collections import OrderedDict
+
+import pytest
+from git import Repo
+from mcp_server_code_assist.tools import tree_index
+from mcp_server_code_assist.tools.file_tools import FileTools
+from mcp_server_code_assist.tools.ignore import IgnoreMatcher
+from mcp_server_code_assist.tools.tree_index import TreeIndex, build_path_trie, get_tree_index
+
+
+pytestmark = pytest.mark.usefixtures("no_racy_window")
+
+
+def test_build_path_trie():
+    trie = build_path_trie(["a/b/c.py", "a/d.py", "e.txt", ""])
+    assert trie == {"a": {"b": {"c.py": None}, "d.py": None}, "e.txt": None}
+
+
+def test_tree_index_revalidates_changed_dirs_only(tmp_path, monkeypatch, bump_mtime):
+    (tmp_path / "a").mkdir()
+    (tmp_path / "a/one.txt").write_text("1")
+    (tmp_path / "b").mkdir()
+    (tmp_path / "b/two.txt").write_text("2")
+
+    scanned = []
+    real_scandir = os.scandir
+    monkeypatch.setattr(tree_index.os, "scandir", lambda path: scanned.append(str(path)) or real_scandir(path))
+
+    tools = FileTools(allowed_paths=[str(tmp_path)])
+    index = TreeIndex(tmp_path)
+
+    def tree():
+        return index.file_tree(tools._get_tracked_files, IgnoreMatcher(tmp_path))
+
+    first = tree()
+    assert first[1:] == (2, 2)
+    assert len(scanned) == 3
+
+    scanned.clear()
+    assert tree() == first
+    assert scanned == []
+
+    (tmp_path / "b/three.txt").write_text("3")
+    bump_mtime(tmp_path / "b")
+    text, dirs, files = tree()
+    assert "three.txt" in text
+    assert (dirs, files) == (2, 3)
+    assert scanned == [str(tmp_path / "b")]
+
+
+def test_tree_index_reloads_tracked_files_on_index_change(tmp_path):
+    repo = Repo.init(tmp_path)
+    (tmp_path / "tracked.txt").write_text("tracked")
+    (tmp_path / "later.txt").write_text("later")
+    repo.index.add(["tracked.txt"])
+
+    loads = []
+    tools = FileTools(allowed_paths=[str(tmp_path)])
+    index = TreeIndex(tmp_path)
+
+    def load_tracked(root):
+        loads.append(root)
+        return tools._get_tracked_files(root)
+
+    def tree():
+        return index.file_tree(load_tracked, IgnoreMatcher(tmp_path))
+
+    assert tree()[0] == "└── tracked.txt"
+    assert tree()[0] == "└── tracked.txt"
+    assert len(loads) == 1
+
+    repo.index.add(["later.txt"])
+    assert tree()[0] == "├── later.txt\n└── tracked.txt"
+    assert len(loads) == 2
+
+
+def test_tree_indexes_are_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(tree_index, "MAX_TREE_INDEXES", 2)
+    monkeypatch.setattr(tree_index, "_tree_indexes", OrderedDict())
+    first = get_tree_index(tmp_path / "a")
+    get_tree_index(tmp_path / "b")
+    get_tree_index(tmp_path / "a")
+    get_tree_index(tmp_path / "c")
+    assert list(tree_index._tree_indexes) == [tmp_path / "a", tmp_path / "c"]
+    assert get_tree_index(tmp_path / "a") is first
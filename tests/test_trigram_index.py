@@ -0,0 +1,183 @@
+import pytest
+from mcp_server_code_assist.tools import trigram_index
+from mcp_server_code_assist.tools.file_tools import FileTools
+from mcp_server_code_assist.tools.trigram_index import TrigramIndex, configure_trigram_index, get_trigram_index, required_literals
+
+
+pytestmark = pytest.mark.usefixtures("no_racy_window")
+
+
+@pytest.mark.parametrize(
+    "pattern, literal, expected",
+    [
+        ("def foo(", True, ["def foo("]),
+        ("ab", True, []),
+        (r"def foo\(", False, ["def foo("]),
+        ("foo.*bar", False, ["foo", "bar"]),
+        ("abcd?ef", False, ["abc"]),
+        ("(abc)?xyz", False, ["xyz"]),
+        (r"\bclass\s+Widget", False, ["class", "Widget"]),
+        ("[abc]defg", False, ["defg"]),
+        ("foo|bar", False, []),
+        ("(?x) f o o", False, []),
+        (r"\x41BCDEF", False, ["BCDEF"]),
+        (r"\101BCDEF", False, ["BCDEF"]),
+        (r"\0BCDEF", False, ["BCDEF"]),
+        (r"\u0041BCDEF", False, ["BCDEF"]),
+        (r"\U00000041BCDEF", False, ["BCDEF"]),
+        (r"\N{LATIN CAPITAL LETTER A}BCDEF", False, ["BCDEF"]),
+        (r"\d{1,3}\.\d{1,3}", False, []),
+        ("[0-9]{2,4}", False, []),
+        ("abc{0,1}", False, []),
+        ("abcd{,2}ef", False, ["abc"]),
+        ("abcd{0}ef", False, ["abc"]),
+        ("abcd{2}ef", False, ["abcd"]),
+        ("abcd{1,}xyz", False, ["abcd", "xyz"]),
+        ("abc{x}def", False, ["abc", "def"]),
+    ],
+)
+def test_required_literals(pattern, literal, expected):
+    assert required_literals(pattern, literal) == expected
+
+
+def test_trigram_index_narrows_and_updates(tmp_path, bump_mtime):
+    root = tmp_path / "root"
+    root.mkdir()
+    (root / "a.py").write_text("class Widget:\n    pass\n")
+    (root / "b.py").write_text("def helper():\n    return 1\n")
+    (root / "notes.txt").write_text("x")
+    files = ["a.py", "b.py", "notes.txt"]
+
+    index = TrigramIndex(root, tmp_path / "index.sqlite3")
+    assert index.candidates(files, ["widget"]) is None
+    index.refresh(files)
+    assert index.candidates(files, ["WIDGET"]) == ["a.py"]
+    assert index.candidates(files, ["ab"]) is None
+    # Files the index has not seen are always searched
+    assert index.candidates([*files, "new.py"], ["widget"]) == ["a.py", "new.py"]
+
+    (root / "b.py").write_text("widget = 1\n")
+    bump_mtime(root / "b.py")
+    index.refresh(files)
+    assert index.candidates(files, ["widget"]) == ["a.py", "b.py"]
+
+    index.mark_dirty("notes.txt")
+    assert index.candidates(files, ["widget"]) == ["a.py", "b.py", "notes.txt"]
+    index.close()
+
+    # The index persists across instances
+    reopened = TrigramIndex(root, tmp_path / "index.sqlite3")
+    reopened.refresh(["a.py"])
+    assert reopened.candidates(["a.py", "b.py"], ["widget"]) == ["a.py", "b.py"]
+    reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_search_code_with_trigram_index(tmp_path):
+    root = tmp_path / "root"
+    root.mkdir()
+    (root / "a.py").write_text("needle = 1\n")
+    (root / "b.py").write_text("haystack = 2\n")
+    configure_trigram_index(tmp_path / "indexes")
+    try:
+        tools = FileTools(allowed_paths=[str(root)])
+        first = await tools.search_code(str(root), "needle")
+        get_trigram_index(root).wait()
+
+        second = await tools.search_code(str(root), "needle")
+        assert second["matches"] == first["matches"] == [{"path": "a.py", "line": 1, "text": "needle = 1"}]
+        assert second["files_searched"] == 1
+
+        await tools.write_file(str(root / "b.py"), "needle = 3\n")
+        third = await tools.search_code(str(root), "needle")
+        assert [m["path"] for m in third["matches"]] == ["a.py", "b.py"]
+    finally:
+        configure_trigram_index(None)
+
+
+@pytest.mark.asyncio
+async def test_search_code_finds_external_edits_after_refresh(tmp_path, bump_mtime, monkeypatch):
+    root = tmp_path / "root"
+    (root / "sub").mkdir(parents=True)
+    (root / "sub" / "a.py").write_text("needle = 1\n")
+    (root / "sub" / "b.py").write_text("haystack = 2\n")
+    configure_trigram_index(tmp_path / "indexes")
+    try:
+        tools = FileTools(allowed_paths=[str(root)])
+        await tools.search_code(str(root / "sub"), "needle")
+        index = get_trigram_index(root)
+        index.wait()
+        assert index.ready
+
+        # Changed by another process; queries trust the index until it is refreshed
+        (root / "sub" / "b.py").write_text("needle = 2\n")
+        bump_mtime(root / "sub" / "b.py")
+        stamped = []
+        real_stamp = trigram_index.file_stamp
+        monkeypatch.setattr(trigram_index, "file_stamp", lambda path: stamped.append(path) or real_stamp(path))
+        stale = await tools.search_code(str(root / "sub"), "needle")
+        assert [m["path"] for m in stale["matches"]] == ["a.py"]
+        assert stamped == []
+
+        monkeypatch.setattr(trigram_index, "REFRESH_INTERVAL", 0.0)
+        await tools.search_code(str(root / "sub"), "needle")
+        index.wait()
+        result = await tools.search_code(str(root / "sub"), "needle")
+        assert [m["path"] for m in result["matches"]] == ["a.py", "b.py"]
+        assert list(trigram_index._indexes) == [root]
+    finally:
+        configure_trigram_index(None)
+
+
+def test_open_indexes_are_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(trigram_index, "MAX_OPEN_INDEXES", 2)
+    configure_trigram_index(tmp_path / "indexes")
+    try:
+        first = get_trigram_index(tmp_path / "a")
+        get_trigram_index(tmp_path / "b")
+        get_trigram_index(tmp_path / "a")
+        get_trigram_index(tmp_path / "c")
+        assert list(trigram_index._indexes) == [tmp_path / "a", tmp_path / "c"]
+        assert get_trigram_index(tmp_path / "a") is first
+    finally:
+        configure_trigram_index(None)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("pattern", [r"\x41BCDEF", r"\101BCDEF", r"(A)\1BCDEF"])
+async def test_search_code_index_keeps_escape_matches(tmp_path, pattern):
+    root = tmp_path / "root"
+    root.mkdir()
+    (root / "a.txt").write_text("ABCDEF AABCDEF\n")
+    (root / "b.txt").write_text("41BCDEF 01BCDEF\n")
+    tools = FileTools(allowed_paths=[str(root)])
+    unindexed = await tools.search_code(str(root), pattern)
+    configure_trigram_index(tmp_path / "indexes")
+    try:
+        await tools.search_code(str(root), pattern)
+        get_trigram_index(root).wait()
+        indexed = await tools.search_code(str(root), pattern)
+    finally:
+        configure_trigram_index(None)
+    assert indexed["matches"] == unindexed["matches"]
+    assert [m["path"] for m in indexed["matches"]] == ["a.txt"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("pattern", [r"\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}", "hosts{0,1}: 10"])
+async def test_search_code_index_keeps_repeat_matches(tmp_path, pattern):
+    root = tmp_path / "root"
+    root.mkdir()
+    (root / "a.txt").write_text("host: 10.0.0.1\n")
+    (root / "b.txt").write_text("no address here\n")
+    tools = FileTools(allowed_paths=[str(root)])
+    unindexed = await tools.search_code(str(root), pattern)
+    configure_trigram_index(tmp_path / "indexes")
+    try:
+        await tools.search_code(str(root), pattern)
+        get_trigram_index(root).wait()
+        indexed = await tools.search_code(str(root), pattern)
+    finally:
+        configure_trigram_index(None)
+    assert indexed["matches"] == unindexed["matches"]
+    assert [m["path"] for m in indexed["matches"]] == ["a.txt"]